@@ -1,5 +1,6 @@
 import os.path
 from logging import getLogger
+from collections import OrderedDict
 
 import pygame
 
@@ -15,6 +16,15 @@ SCREEN_SIZE = (1024, 768)
 SCREEN = None
 OFF_SCREEN_CUTOFF = 200
 MAX_FPS = 60
+# The simulation advances in fixed steps of 1 / SIM_RATE seconds, independent of the frame rate.
+# At most MAX_SIM_STEPS are run per frame; any more time that has passed is dropped
+SIM_RATE = 120
+MAX_SIM_STEPS = 8
+# Draw moving sprites between their positions before and after the last simulation step, in
+# proportion to the time left over until the next step
+INTERPOLATE_RENDERING = True
+# Only redraw and update the parts of the screen that changed each frame, see gui.renderer
+DIRTY_RECT_RENDERING = False
 
 HP_COLOR = (60, 255, 60)
 SHIELD_COLOR = (200, 200, 255)
@@ -24,6 +34,8 @@ HUD = None
 ENEMY_HEALTHBARS = True
 BIG_HEALTHBAR_HEIGHT = 50
 HEALTHBAR_HEIGHT = 10
+# Number of steps between an invisible and a fully opaque shield
+SHIELD_ALPHA_LEVELS = 16
 
 BOUNCINESS_MULT = 5
 COLLISION_DAMAGE_MULT = 1 / 50000
@@ -32,6 +44,27 @@ REACHED_DEST_THRESHOLD = 10
 
 EXPLOSION_SIZE_SCALE = 1
 EXPLOSION_DURATION_SCALE = 1
+# Explosion animations are pre-rendered per bucket of radius (in pixels) and number of frames
+EXPLOSION_RADIUS_STEP = 2
+EXPLOSION_FRAME_RATE = 30
+EXPLOSION_MAX_FRAMES = 60
+
+# Approximate memory budget in bytes for cached images and masks
+IMAGE_CACHE_BUDGET = 64 * 1024 * 1024
+# Whether to keep processed images in the user's cache directory between runs
+DISK_CACHE_ENABLED = True
+# Images with partially transparent pixels are only RLE encoded if they have at least this many
+# pixels; smaller ones blit as fast without it
+RLE_MIN_PIXELS = 256
+
+# 'numpy' to simulate and draw projectiles without move behaviors in arrays, see
+# astro.projectile_batch, or 'python' for every projectile to be a sprite
+PROJECTILE_BACKEND = 'python'
+
+# 'numpy' to keep the positions and velocities of ships in arrays and move them all at once, see
+# astro.kinematics, or 'python' for each ship to move itself. The arrays have a fixed cost per step
+# that pays off from a few dozen ships on screen
+KINEMATICS_BACKEND = 'python'
 
 # Order in which to load configs
 CONFIG_ORDER = ['behaviors',
@@ -109,14 +142,70 @@ COLLIDABLE_PAIRS = [
                     (FRIENDLY_PROJECTILES, OBJECTS, False),
                     (ENEMY_PROJECTILES, OBJECTS, False)]
 
+# Side length in pixels of the grid cells used by the collision broadphase
+COLLISION_CELL_SIZE = 64
+# Pairs of groups are only checked through the broadphase once the harmonic mean of their sizes
+# reaches this; below it, hashing costs more than pygame.sprite.groupcollide testing every pair
+# (see benchmarks/bench_collisions.py, the crossover is at around 60-80 sprites)
+COLLISION_BROADPHASE_MIN_SIZE = 80
+
 # Fonts
 
+# Maximum number of rendered text surfaces to keep
+TEXT_CACHE_SIZE = 256
+
 class Fonts:
+    """Shared registry of loaded fonts and least recently used cache of rendered text.
+
+    Attributes:
+        mono_font (str): Path to the monospace font file, set by init.
+        text_cache_size (int): Maximum number of rendered text surfaces to keep.
+        hits (int): Number of render calls answered from the cache.
+        misses (int): Number of render calls that rendered text.
+    """
     mono_fontnames = ['dejavusansmono', 'ubuntumono', 'liberationmono', 'couriernew']
 
+    def __init__(self, text_cache_size=TEXT_CACHE_SIZE):
+        self.mono_font = None
+        self.text_cache_size = text_cache_size
+        self._fonts = dict()
+        self._text = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
     def init(self):
         self.mono_font = pygame.font.match_font(self.mono_fontnames)
 
+    def get(self, font, size):
+        """Returns the pygame.font.Font for a font file and size, loading it the first time.
+
+        Args:
+            font (str): Path to the font file, or None for pygame's default font.
+            size (int): Font size.
+        """
+        font_ = self._fonts.get((font, size))
+        if font_ is None:
+            font_ = self._fonts[font, size] = pygame.font.Font(font, size)
+        return font_
+
+    def render(self, font, size, text, color, antialias=True):
+        """Returns a surface with text rendered in a font, reusing previously rendered surfaces.
+
+        The returned surface is shared and must not be modified.
+        """
+        key = (font, size, text, tuple(color), bool(antialias))
+        surface = self._text.get(key)
+        if surface is not None:
+            self.hits += 1
+            self._text.move_to_end(key)
+            return surface
+
+        self.misses += 1
+        surface = self._text[key] = self.get(font, size).render(text, antialias, color)
+        if len(self._text) > self.text_cache_size:
+            self._text.popitem(last=False)
+        return surface
+
 FONTS = Fonts()
 
 PLAYER = None
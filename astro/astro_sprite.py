@@ -4,7 +4,7 @@
 import pygame
 
 from astro import OFF_SCREEN_CUTOFF
-from astro.image import load_image
+from astro.image import load_image, image_mask
 from astro.configurable import Configurable, ConfigurableMeta
 from astro.collidable import Collidable, CollidableMeta
 from astro.movable import Movable
@@ -44,6 +44,8 @@ class AstroSprite(Configurable, Movable, Collidable, pygame.sprite.Sprite,
         self.speedy = self.speedy_prev = 0
         self.mask_rect_offsetx = 0
         self.mask_rect_offsety = 0
+        self._mask = None
+        self._mask_image = None
         self.x = 0
         self.y = 0
         self.follow_sprites = set()
@@ -68,17 +70,32 @@ class AstroSprite(Configurable, Movable, Collidable, pygame.sprite.Sprite,
         if self.deferred_image_load:
             self.load_image()
         self.rect.center = self.x ,self.y = round(self.x), round(self.y)
+        self.x_prev, self.y_prev = self.x, self.y
         self.add(*self.groups)
 
     def _load_image(self, *args, **kwargs):
         return load_image(*args, **kwargs)
 
+    @property
+    def mask(self):
+        """The collision mask of the image last assigned along with the mask, built from the image
+           the first time it's used.
+        """
+        if self._mask is None:
+            self._mask = image_mask(self._mask_image)
+        return self._mask
+
+    @mask.setter
+    def mask(self, mask):
+        self._mask = mask
+        self._mask_image = self.image
+
     def load_image(self):
         """Loads the image file for this object and initializes its image and rectangle
             attributes as expected by pygame.sprite.Sprite.
         """
         self.image, self.rect, self.mask, self.mask_rect, self.mask_rect_offsetx, \
-            self.mask_rect_offsety, self.mask_centroid = self._load_image(self.imagepath, self.inverted)
+            self.mask_rect_offsety = self._load_image(self.imagepath, self.inverted)
 
     def destroy(self):
         """Removes this object from the game.
@@ -212,6 +229,9 @@ class FollowSprite(AstroSprite):
         # Don't update velocity, only position
         self.update_position(elapsed)
 
+    def draw_offset(self, alpha):
+        return self.owner.draw_offset(alpha)
+
     def sync_position(self):
         super().sync_position()
         self.owner.sync_position()
@@ -2,10 +2,22 @@ import math
 
 import pygame
 
-from astro import logger, MAX_FPS, BOUNCINESS_MULT, COLLISION_DAMAGE_MULT, COLLIDABLE_PAIRS
-from astro.util import magnitude, angle_distance, binary_search
+from astro import logger, MAX_FPS, BOUNCINESS_MULT, COLLISION_DAMAGE_MULT, COLLIDABLE_PAIRS, \
+    COLLISION_BROADPHASE_MIN_SIZE
+from astro.util import angle_distance
+from astro.spatial_hash import SpatialHash
+
+# Maximum number of mask overlap tests used to find the time of impact of a collision
+TOI_MAX_ITERATIONS = 20
 
 _collidable_class_lookup = dict()
+# Every Collidable class in definition order (names may not be unique, e.g. in tests)
+_collidable_classes = list()
+# Dispatch tables mapping (class of self, class of other) -> (handler function, swapped) or None
+# if neither class defines a handler for the other. If swapped is True, the handler is defined
+# on the other object's class and must be called with the arguments reversed.
+_collide_handlers = dict()
+_stop_colliding_handlers = dict()
 
 class CollidableMeta(type):
     """Metaclass for Collidable and its subclasses that initializes them in the lookup systems.
@@ -14,6 +26,8 @@ class CollidableMeta(type):
         type.__init__(self, *args, **kwargs)
         _collidable_class_lookup[self.__name__] = self
         self.collidable_superclasses = list(self._collidable_superclasses())
+        _collidable_classes.append(self)
+        self._build_handler_tables()
 
     def _collidable_superclasses(self):
         yield self
@@ -22,42 +36,76 @@ class CollidableMeta(type):
                 yield base
                 yield from base._collidable_superclasses()
 
+    def _build_handler_tables(self):
+        """Resolves the collision handlers between this class and every Collidable class defined
+           so far, in both directions.
+        """
+        for other in _collidable_classes:
+            for class1, class2 in ((self, other), (other, self)):
+                _collide_handlers[class1, class2] = \
+                    class1._resolve_handler(class2, 'collide_with')
+                _stop_colliding_handlers[class1, class2] = \
+                    class1._resolve_handler(class2, 'stop_colliding_with')
+
+    def _resolve_handler(self, other, prefix):
+        """Finds the method that handles an interaction between instances of this class and other.
+
+        Methods of this class named after one of other's superclasses take precedence, most
+        specific superclass first; failing that, methods of other named after one of this
+        class's superclasses are used.
+
+        Args:
+            other (CollidableMeta): The class of the other object.
+            prefix (str): Prefix of the handler method names, e.g. "collide_with".
+
+        Returns:
+            A (function, swapped) tuple, or None if there is no handler.
+        """
+        for other_class in other.collidable_superclasses:
+            name = f'{prefix}_{other_class.__name__.lower()}'
+            if hasattr(self, name):
+                return getattr(self, name), False
+        for this_class in self.collidable_superclasses:
+            name = f'{prefix}_{this_class.__name__.lower()}'
+            if hasattr(other, name):
+                return getattr(other, name), True
+        return None
+
+def collision_handler(class1, class2, stop=False):
+    """Returns the precomputed (function, swapped) handler for two Collidable classes, or None.
+    """
+    table = _stop_colliding_handlers if stop else _collide_handlers
+    return table[class1, class2]
+
 class Collidable(metaclass=CollidableMeta):
     def collide_with(self, other, use_mask=False):
         if self is other:
             return
-        this_class = self.class_name.lower()
-        other_class = other.class_name.lower()
         collided = not use_mask or pygame.sprite.collide_mask(self, other)
         if collided:
-            for other_class in other.collidable_superclasses:
-                other_class = other_class.__name__.lower()
-                if hasattr(self, f'collide_with_{other_class}'):
-                    getattr(self, f'collide_with_{other_class}')(other)
-                    return collided
-            for this_class in self.collidable_superclasses:
-                this_class = this_class.__name__.lower()
-                if hasattr(other, f'collide_with_{this_class}'):
-                    getattr(other, f'collide_with_{this_class}')(self)
-                    return collided
-            logger.warning(f'Collisions not defined between {this_class} and {other_class}')
+            handler = _collide_handlers[self.__class__, other.__class__]
+            if handler is None:
+                logger.warning(f'Collisions not defined between {self.class_name.lower()} and '
+                               f'{other.class_name.lower()}')
+            else:
+                function, swapped = handler
+                if swapped:
+                    function(other, self)
+                else:
+                    function(self, other)
         return collided
 
 
     def stop_colliding_with(self, other):
         if self is other:
             return
-        this_class = self.class_name.lower()
-        other_class = other.class_name.lower()
-        for other_class in other.collidable_superclasses:
-            other_class = other_class.__name__.lower()
-            if hasattr(self, f'stop_colliding_with_{other_class}'):
-                return getattr(self, f'stop_colliding_with_{other_class}')(other)
-        for this_class in self.collidable_superclasses:
-            this_class = this_class.__name__.lower()
-            if hasattr(other, f'stop_colliding_with_{this_class}'):
-                return getattr(other, f'stop_colliding_with_{this_class}')(self)
+        handler = _stop_colliding_handlers[self.__class__, other.__class__]
         # Don't log a warning if not found
+        if handler is not None:
+            function, swapped = handler
+            if swapped:
+                return function(other, self)
+            return function(self, other)
 
 
     def collide_with_mass(self, other):
@@ -66,25 +114,27 @@ class Collidable(metaclass=CollidableMeta):
         if not (self.speedx or self.speedy or other.speedx or other.speedy):
             return
 
-        # To compensate for limited frame rate, step back through time to the moment the masks
+        # To compensate for limited frame rate, search back through time for the moment the masks
         # first minimally overlapped
         step = 1 / (MAX_FPS * 4)
         def pos_at_t(t):
             return self.rect.centerx + self.speedx * t, self.rect.centery + self.speedy * t
         def other_pos_at_t(t):
             return other.rect.centerx + other.speedx * t, other.rect.centery + other.speedy * t
-        def get_overlap_at_t(t):
-            # Calculate angle of collision
+        def mask_offset_at_t(t):
             x1, y1 = pos_at_t(t)
             x2, y2 = other_pos_at_t(t)
-            return self.mask.overlap_mask(other.mask, (round(x2 - x1), round(y2 - y1)))
-        T = 0
-        overlap = prev_overlap = get_overlap_at_t(T)
-        while overlap.count():
-            T -= step
-            prev_overlap = overlap
-            overlap = get_overlap_at_t(T)
-        overlap = prev_overlap
+            return round(x2 - x1), round(y2 - y1)
+        def overlaps_at_t(t):
+            return self.mask.overlap(other.mask, mask_offset_at_t(t)) is not None
+        impact = find_time_of_impact(overlaps_at_t, step)
+        if impact is None:
+            # The objects never separate (e.g. they move in lockstep); resolve them where they are
+            T = T_overlap = 0
+        else:
+            T, T_overlap = impact
+        # Calculate angle of collision
+        overlap = self.mask.overlap_mask(other.mask, mask_offset_at_t(T_overlap))
 
         # Invert angle to convert from cartesian to pixel coordinates, and add 90 degrees
         normal_angle = math.radians(90 - overlap.angle())
@@ -111,27 +161,14 @@ class Collidable(metaclass=CollidableMeta):
         #                                   math.atan2(ay, ax), True)))
         # print('ax, ay =', ax, ay)
 
-        # Calculate total kinetic energy
-        tke = self.kinetic_energy + other.kinetic_energy
-
-        # Find the "force" (actually average force times a short time interval) of the collision
-        # using numerical methods, aiming to conserve kinetic energy (for now)
+        # Find the "force" (actually average force times a short time interval) of the collision,
+        # aiming to conserve kinetic energy (for now)
         def v1f(F):
             return self.speedx + F * ax / self.mass, self.speedy + F * ay / self.mass
         def v2f(F):
             return other.speedx - F * ax / other.mass, other.speedy - F * ay / other.mass
-        def d_tke(F):
-            return tke - (0.5 * self.mass * magnitude(*v1f(F)) ** 2 + \
-                          0.5 * other.mass * magnitude(*v2f(F)) ** 2)
-        i = 1
-        while True:
-            val = d_tke(2 << i)
-            if val < 0:
-                # print(i, d_tke(2 << (i - 1)), val)
-                f = binary_search(d_tke, 2 << (i - 1), 2 << i, 1, True)
-                break
-            i += 1
-        # print(f)
+        f = collision_impulse(self.mass, (self.speedx, self.speedy),
+                              other.mass, (other.speedx, other.speedy), ax, ay)
         # print('T =', T)
         # print('Before', self.x, self.y, other.x, other.y, get_overlap_at_t(0).count())
 
@@ -161,25 +198,139 @@ class Collidable(metaclass=CollidableMeta):
         # print(other.speedx, other.speedy)
         # print(self, other)
 
-colliding_pairs = set()
+def collision_impulse(mass1, speed1, mass2, speed2, ax, ay):
+    """Calculates the impulse of an elastic collision between two objects.
+
+    The impulse F is applied to the first object along the unit vector (ax, ay) and to the second
+    object in the opposite direction. Total kinetic energy after the collision is a quadratic in F,
+    which is unchanged at F = 0 and at the single positive root returned here.
+
+    Args:
+        mass1 (float): Mass of the first object.
+        speed1 (tuple): (x, y) velocity of the first object.
+        mass2 (float): Mass of the second object.
+        speed2 (tuple): (x, y) velocity of the second object.
+        ax, ay (float): Unit vector along which the first object is pushed.
+
+    Returns:
+        The magnitude of the impulse, or 0 if the objects are not moving toward each other along
+        (ax, ay).
+    """
+    approach_speed = (speed1[0] - speed2[0]) * ax + (speed1[1] - speed2[1]) * ay
+    if approach_speed >= 0:
+        return 0.0
+    return -2 * approach_speed / (1 / mass1 + 1 / mass2)
+
+def find_time_of_impact(overlaps_at, step, max_iterations=TOI_MAX_ITERATIONS):
+    """Finds the moment two objects that overlap now first came into contact.
+
+    Searches backwards in time with exponentially growing steps until the objects no longer
+    overlap, then bisects between the last clear and first overlapping times.
+
+    Args:
+        overlaps_at (callable): Takes a time offset (<= 0) and returns whether the objects overlap.
+        step (float): Resolution to narrow the time of impact down to.
+        max_iterations (int): Maximum number of calls to overlaps_at, not counting the first.
+
+    Returns:
+        A (clear, overlapping) 2-tuple of the latest time found at which the objects do not
+        overlap and the earliest time found at which they do, or None if no time at which they
+        do not overlap was found.
+    """
+    if not overlaps_at(0):
+        return 0, 0
+
+    t_overlap = 0
+    t_clear = -step
+    iterations = 1
+    while overlaps_at(t_clear):
+        if iterations >= max_iterations:
+            return None
+        iterations += 1
+        t_overlap = t_clear
+        t_clear *= 2
+
+    while t_overlap - t_clear > step and iterations < max_iterations:
+        iterations += 1
+        t_mid = (t_clear + t_overlap) / 2
+        if overlaps_at(t_mid):
+            t_overlap = t_mid
+        else:
+            t_clear = t_mid
+
+    return t_clear, t_overlap
+
+# Pairs of sprites currently colliding, as the keys of a dict so that they are iterated in the
+# order they started colliding rather than in the order of their ids
+colliding_pairs = dict()
+# Mapping of each sprite to the pairs in colliding_pairs it is part of
+pairs_by_sprite = dict()
+# Broadphase shared by all collision checks; rebuilt at the start of each frame and whenever a
+# collision moves sprites
+broadphase = SpatialHash()
+
+def track_collision(pair):
+    if pair not in colliding_pairs:
+        colliding_pairs[pair] = None
+        for sprite in pair:
+            pairs_by_sprite.setdefault(sprite, set()).add(pair)
+
+def untrack_collision(pair):
+    if pair in colliding_pairs:
+        del colliding_pairs[pair]
+        for sprite in pair:
+            pairs = pairs_by_sprite.get(sprite)
+            if pairs is not None:
+                pairs.discard(pair)
+                if not pairs:
+                    del pairs_by_sprite[sprite]
+
+def forget_collisions(sprite):
+    """Stops tracking any ongoing collisions involving sprite, without notifying either object.
+    """
+    for pair in list(pairs_by_sprite.get(sprite, ())):
+        untrack_collision(pair)
+
+def groupcollide(group1, group2):
+    """Equivalent of pygame.sprite.groupcollide(group1, group2, False, False), which only goes
+       through the broadphase if the groups are large enough for it to be faster.
+    """
+    size1, size2 = len(group1), len(group2)
+    if 2 * size1 * size2 < COLLISION_BROADPHASE_MIN_SIZE * (size1 + size2):
+        return pygame.sprite.groupcollide(group1, group2, False, False)
+    # Only the second group is looked up in the hash, and only once per frame unless sprites move
+    if group2 not in broadphase.cells:
+        broadphase.insert_group(group2)
+    return broadphase.groupcollide(group1, group2)
 
 def check_collisions():
     collided_this_frame = set()
 
+    broadphase.clear()
     for group1, group2, use_mask in COLLIDABLE_PAIRS:
-        for sprite, colliders in pygame.sprite.groupcollide(group1, group2, False, False).items():
+        moved = False
+        for sprite, colliders in groupcollide(group1, group2).items():
             for collider in colliders:
+                rect1, rect2 = tuple(sprite.rect), tuple(collider.rect)
                 collided = sprite.collide_with(collider, use_mask)
+                # Sprites destroyed by the collision are out of their groups, even if their rect
+                # changed, e.g. when pooled projectiles are reset
+                if sprite.alive() and tuple(sprite.rect) != rect1 or \
+                        collider.alive() and tuple(collider.rect) != rect2:
+                    moved = True
                 if collided:
                     if sprite.alive() and collider.alive():
                         # Track the collision
                         collided_this_frame.add((sprite, collider))
-                        colliding_pairs.add((sprite, collider))
+                        track_collision((sprite, collider))
                     else:
                         # Stop tracking the collision if at least one object is dead
-                        colliding_pairs.discard((sprite, collider))
+                        untrack_collision((sprite, collider))
+        if moved:
+            # Bounces move sprites, so the remaining pairs must see them in their new cells
+            broadphase.clear()
 
-    no_longer_colliding = colliding_pairs - collided_this_frame
+    no_longer_colliding = [pair for pair in colliding_pairs if pair not in collided_this_frame]
     for sprite, collider in no_longer_colliding:
         sprite.stop_colliding_with(collider)
-        colliding_pairs.discard((sprite, collider))
+        untrack_collision((sprite, collider))
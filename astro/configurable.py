@@ -32,6 +32,7 @@ See the unit test module for usage examples.
 
 import os.path
 import re
+from collections import OrderedDict
 
 from yaml import safe_load
 
@@ -41,6 +42,14 @@ configurable_copy_re = re.compile(r"^(\w+)\((\w*)\)$")
 # Mapping allowign lookup of Configurable subclasses by name
 _configurable_class_lookup = dict()
 _undefined_objects = set()
+# Types whose values can be shared between a Configurable and its copies as-is
+_SHARED_TYPES = frozenset([int, float, bool, type(None), tuple])
+# Cache of the class names strings refer to (or None), from matching the regexes above
+_reference_cache = dict()
+# Placeholder for fields missing from an instance or config
+_MISSING = object()
+# Maximum number of copies with overrides kept as prototypes per Configurable class
+DERIVED_CACHE_SIZE = 64
 
 class ConfigurableMeta(type):
     """Metaclass for Configurable and its subclasses that initializes them in the lookup systems.
@@ -49,6 +58,11 @@ class ConfigurableMeta(type):
         type.__init__(self, *args, **kwargs)
         _configurable_class_lookup[self.__name__] = self
         self._lookup = dict()
+        # Mapping of key -> CopyPlan
+        self._copy_plans = dict()
+        # Least recently used mapping of (key, frozen overrides) -> instance copied with those
+        # overrides, holding at most DERIVED_CACHE_SIZE instances
+        self._derived = OrderedDict()
 
     @property
     def fields(self):
@@ -62,6 +76,56 @@ class ConfigurableMeta(type):
     def fields(self, value):
         self._fields = value
 
+# Kinds of fields in a CopyPlan
+SHARE = 'share'
+CLONE = 'clone'
+CONTAINER = 'container'
+
+class CopyPlan:
+    """Precomputed recipe for copying instances of a Configurable class with a given key.
+
+    Built once from the first instance copied, it records how each field should be copied based
+    on the value that instance had, and which parts of the base config only need loading once.
+
+    Attributes:
+        fields (list): (name, kind, fallback) 3-tuples for each field. kind is SHARE for
+            immutable values that copies can share, CLONE for nested Configurables that must be
+            copied, and CONTAINER for anything else, e.g. lists and dicts. fallback is the raw
+            config value used if an instance lacks the field, or _MISSING.
+        loaded (dict): Already loaded base config and default values not covered by fields.
+        raw (dict): Base config and default values not covered by fields that must be loaded
+            again for each copy, in order of increasing priority.
+    """
+
+    def __init__(self, inst, base_config):
+        fields = inst.fields
+        self.fields = list()
+        for name in fields:
+            fallback = base_config.get(name, inst.defaults.get(name, _MISSING))
+            self.fields.append((name, self._classify(getattr(inst, name, None)), fallback))
+
+        self.loaded = dict()
+        self.raw = dict()
+        others = {k: v for k, v in inst.defaults.items() if k not in base_config}
+        others.update(base_config)
+        for name, value in others.items():
+            if name in fields:
+                continue
+            if type(value) in _SHARED_TYPES or \
+                (isinstance(value, str) and not _refers_to_configurable(value)):
+                self.loaded[name] = value
+            else:
+                self.raw[name] = value
+
+    @staticmethod
+    def _classify(value):
+        if type(value) in _SHARED_TYPES or \
+            (isinstance(value, str) and not _refers_to_configurable(value)):
+            return SHARE
+        elif isinstance(value, Configurable):
+            return CLONE
+        return CONTAINER
+
 class Configurable(metaclass=ConfigurableMeta):
     # Fields that must be specified in the configuration
     required_fields = ()
@@ -91,6 +155,12 @@ class Configurable(metaclass=ConfigurableMeta):
         for k, v in config.items():
             setattr(self, k, load_from_obj(v))
 
+    def _setup_loaded(self, config):
+        """Like _setup, for a complete config whose values have already been loaded.
+        """
+        for k, v in config.items():
+            setattr(self, k, v)
+
     def check_required_fields(self):
         """Checks that this object is "ready for primetime", i.e. that all of its
            required fields have been filled in.
@@ -141,6 +211,32 @@ class Configurable(metaclass=ConfigurableMeta):
         else:
             return value
 
+    def copy_loaded_value(self, value):
+        """Equivalent to load_from_obj(self.copy_value(value)) for a value that has already been
+           loaded, skipping the work for values that loading would leave unchanged.
+        """
+        value_type = type(value)
+        if value_type in _SHARED_TYPES:
+            return value
+        elif value_type is str:
+            return load_from_obj(value) if _refers_to_configurable(value) else value
+        elif isinstance(value, Configurable):
+            return value.copy()
+        elif value_type is list:
+            return [self.copy_loaded_value(v) for v in value]
+        return load_from_obj(self.copy_value(value))
+
+    def _copy_plan(self):
+        plans = self.__class__._copy_plans
+        if self.key in plans:
+            return plans[self.key]
+        if self.key is not None:
+            _, base_config = self._lookup[self.key]
+        else:
+            base_config = dict()
+        plan = plans[self.key] = CopyPlan(self, base_config)
+        return plan
+
     def copy(self, **overrides):
         """Creates and returns a new instance of this instance's class.
 
@@ -153,15 +249,24 @@ class Configurable(metaclass=ConfigurableMeta):
         Returns:
             A new instance of the called instance's class.
         """
-        if self.key is not None:
-            _, base_config = self._lookup[self.key]
-            config = base_config.copy()
-        else:
-            config = dict()
-        config.update({f: self.copy_value(getattr(self, f)) for f in self.fields if hasattr(self, f)})
-        config.update(overrides)
+        plan = self._copy_plan()
+        config = {k: load_from_obj(v) for k, v in plan.raw.items()}
+        config.update(plan.loaded)
+        for name, kind, fallback in plan.fields:
+            value = getattr(self, name, _MISSING)
+            if value is _MISSING:
+                if fallback is not _MISSING:
+                    config[name] = load_from_obj(fallback)
+            elif kind is SHARE and type(value) in _SHARED_TYPES:
+                config[name] = value
+            elif kind is CLONE and isinstance(value, Configurable):
+                config[name] = value.copy()
+            else:
+                config[name] = self.copy_loaded_value(value)
+        for k, v in overrides.items():
+            config[k] = load_from_obj(v)
         copied = self.__class__(self.key)
-        copied._setup(config)
+        copied._setup_loaded(config)
         copied._initialize()
 
         return copied
@@ -217,11 +322,42 @@ class Configurable(metaclass=ConfigurableMeta):
 
         base_instance, _ = cls._lookup[key]
         if copy:
-            inst = base_instance.copy(**overrides)
+            if overrides:
+                inst = cls._derived_instance(key, overrides)
+            else:
+                inst = base_instance.copy()
         else:
             inst = base_instance
         return inst
 
+    @classmethod
+    def _derived_instance(cls, key, overrides):
+        """Returns a copy of the base instance identified by key with overrides applied.
+
+        The first copy made with a given set of overrides is kept as a prototype, so later
+        requests for the same overrides only have to copy it. Only the DERIVED_CACHE_SIZE most
+        recently used prototypes of each class are kept, since overrides such as positions can
+        take any number of values.
+        """
+        base_instance, _ = cls._lookup[key]
+        try:
+            if not all(k in cls.fields for k in overrides):
+                # Copies of the prototype would lose attributes that aren't fields
+                raise TypeError('Overrides are not all fields')
+            cache_key = (key, _freeze(overrides))
+        except TypeError:
+            return base_instance.copy(**overrides)
+
+        derived = cls._derived
+        prototype = derived.get(cache_key)
+        if prototype is None:
+            prototype = derived[cache_key] = base_instance.copy(**overrides)
+            if len(derived) > DERIVED_CACHE_SIZE:
+                derived.popitem(last=False)
+        else:
+            derived.move_to_end(cache_key)
+        return prototype.copy()
+
     @classmethod
     def all_instances(cls, copy=False, **overrides):
         for key in cls._lookup.keys():
@@ -257,6 +393,35 @@ class Configurable(metaclass=ConfigurableMeta):
         else:
             return value
 
+def _refers_to_configurable(s):
+    """Checks if loading a string would produce a Configurable, caching the regex matching.
+    """
+    if s in _reference_cache:
+        name = _reference_cache[s]
+    else:
+        m = configurable_re.match(s) or configurable_copy_re.match(s)
+        name = _reference_cache[s] = m.group(1) if m else None
+    return name is not None and name in _configurable_class_lookup
+
+def _freeze(obj):
+    """Converts a config value that has not been loaded yet to a hashable equivalent.
+
+    Raises:
+        TypeError if the value can't be used to identify a derived instance, e.g. because loading
+        it refers to or defines a specific instance instead of creating new ones.
+    """
+    if isinstance(obj, dict):
+        return (dict,) + tuple((_freeze(k), _freeze(v)) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        return (type(obj),) + tuple(_freeze(v) for v in obj)
+    elif isinstance(obj, str):
+        if configurable_re.match(obj):
+            raise TypeError(f'{obj} refers to a specific instance')
+        return obj
+    elif obj is None or type(obj) in (int, float, bool):
+        return (type(obj), obj)
+    raise TypeError(f'Cannot freeze {obj!r}')
+
 def _check_for_configurable(s):
     """Checks if a string identifies an instance of a Configurable.
 
@@ -0,0 +1,194 @@
+"""Persistent on-disk cache of processed images.
+
+Decoding, flipping and rotating sprite images and finding their bounding rects is repeated on
+every start of the game. This cache stores the processed pixels along with their rect and mask
+bounding rect under the user's cache directory, keyed by a hash of the source file's contents, so
+warm starts only have to read back raw pixel buffers. How each image was converted to the display
+format, see astro.image.convert_for_display, is stored with it so that it can be converted the same
+way again without inspecting its pixels.
+
+Masks aren't stored; like any other image's, they are built from the pixels when first needed.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import tempfile
+
+import pygame
+
+from astro import logger, DISK_CACHE_ENABLED
+
+# Bump to invalidate all existing cache entries when the stored format or processing changes
+FORMAT_VERSION = 4
+
+def user_cache_dir(app_name='astro2'):
+    """Returns the platform's per-user cache directory for the game.
+
+    Can be overridden with the ASTRO_CACHE_DIR environment variable.
+    """
+    if 'ASTRO_CACHE_DIR' in os.environ:
+        return os.environ['ASTRO_CACHE_DIR']
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA', os.path.expanduser(os.path.join('~', 'AppData', 'Local')))
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser(os.path.join('~', 'Library', 'Caches'))
+    else:
+        base = os.environ.get('XDG_CACHE_HOME', os.path.expanduser(os.path.join('~', '.cache')))
+    return os.path.join(base, app_name)
+
+class DiskCache:
+    """Stores processed images on disk, keyed by the content hash of their source file.
+
+    Source files are only re-hashed when their modification time or size changes; any change to
+    their contents results in a new hash and so new cache entries.
+
+    Attributes:
+        directory (str): Directory the cache files are stored in.
+        enabled (bool): Whether the cache is used at all. It disables itself if it can't write.
+        hits (int): Number of images read from the cache.
+        misses (int): Number of images that were not in the cache.
+        writes (int): Number of images written to the cache.
+    """
+
+    def __init__(self, directory=None, enabled=DISK_CACHE_ENABLED):
+        self.directory = directory if directory is not None else user_cache_dir()
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._index = None
+        self._pruned = False
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, 'index.json')
+
+    def _load_index(self):
+        if self._index is None:
+            try:
+                with open(self.index_path, 'r') as fobj:
+                    self._index = json.load(fobj)
+            except (OSError, ValueError):
+                self._index = dict()
+        return self._index
+
+    def _write(self, path, data):
+        """Atomically writes bytes to a file in the cache directory.
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, 'wb') as fobj:
+                fobj.write(data)
+            os.replace(tmp_path, path)
+        except OSError:
+            os.unlink(tmp_path)
+            raise
+
+    def _disable(self, error):
+        logger.warning(f'Disabling image disk cache in {self.directory}: {error}')
+        self.enabled = False
+
+    def content_hash(self, full_path):
+        """Returns the hex SHA-1 digest of a file's contents, reusing the indexed one if the file's
+           modification time and size haven't changed.
+        """
+        stat = os.stat(full_path)
+        index = self._load_index()
+        entry = index.get(full_path)
+        if entry is not None and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            return entry[2]
+
+        with open(full_path, 'rb') as fobj:
+            digest = hashlib.sha1(fobj.read()).hexdigest()
+        index[full_path] = [stat.st_mtime_ns, stat.st_size, digest]
+        try:
+            self._write(self.index_path, json.dumps(index).encode())
+        except OSError as e:
+            self._disable(e)
+        return digest
+
+    def prune(self):
+        """Deletes the entries written with another FORMAT_VERSION, which can never be read again.
+        """
+        suffix = f'-v{FORMAT_VERSION}.bin'
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return
+        for name in names:
+            if name.endswith('.bin') and not name.endswith(suffix):
+                try:
+                    os.unlink(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def entry_path(self, full_path, variant):
+        return os.path.join(self.directory,
+                            f'{self.content_hash(full_path)}-{variant}-v{FORMAT_VERSION}.bin')
+
+    def load(self, full_path, variant):
+        """Reads a processed version of an image from the cache.
+
+        Args:
+            full_path (str): Path to the source image file.
+            variant (str): Identifies how the source image was processed.
+
+        Returns:
+            A ((image, rect, mask, mask_rect, mask_rect_offsetx, mask_rect_offsety), conversion)
+            2-tuple, or None if the image is not cached. The image is not converted to the
+            display format and mask is None. conversion is the (conversion path, colorkey) the
+            image was stored with, or None if it wasn't converted.
+        """
+        if not self.enabled:
+            return None
+        try:
+            with open(self.entry_path(full_path, variant), 'rb') as fobj:
+                header, pixels = fobj.read().split(b'\n', 1)
+            meta = json.loads(header)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        image = pygame.image.fromstring(pixels, tuple(meta['size']), meta['format'])
+        conversion = None
+        if meta['conversion'] is not None:
+            colorkey = meta['colorkey']
+            conversion = (meta['conversion'], tuple(colorkey) if colorkey is not None else None)
+        self.hits += 1
+        return ((image, image.get_rect(), None, pygame.Rect(meta['mask_rect']),
+                 meta['mask_rect_offsetx'], meta['mask_rect_offsety']), conversion)
+
+    def store(self, full_path, variant, cached, conversion=None):
+        """Writes a processed image and its rect/mask metadata to the cache.
+
+        Args:
+            conversion (str): The path the image was converted to the display format with, or None
+                if it wasn't converted. Images without per-pixel alpha are stored without it,
+                along with their colorkey.
+        """
+        if not self.enabled:
+            return
+        if not self._pruned:
+            self._pruned = True
+            self.prune()
+        image, rect, mask, mask_rect, mask_rect_offsetx, mask_rect_offsety = cached
+        opaque = conversion in ('opaque', 'colorkey')
+        colorkey = image.get_colorkey()
+        meta = {'size': image.get_size(),
+                'format': 'RGB' if opaque else 'RGBA',
+                'conversion': conversion,
+                'colorkey': tuple(colorkey) if colorkey is not None else None,
+                'mask_rect': tuple(mask_rect),
+                'mask_rect_offsetx': mask_rect_offsetx,
+                'mask_rect_offsety': mask_rect_offsety}
+        data = json.dumps(meta).encode() + b'\n' + pygame.image.tostring(image, meta['format'])
+        try:
+            self._write(self.entry_path(full_path, variant), data)
+            self.writes += 1
+        except OSError as e:
+            self._disable(e)
+
+DISK_CACHE = DiskCache()
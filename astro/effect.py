@@ -1,7 +1,11 @@
-import time
 import heapq
+import itertools
 
 from astro.configurable import Configurable
+from astro.sim_clock import SIM_CLOCK
+
+# Breaks ties between effects ending at the same time by the order they were applied in
+_application_order = itertools.count()
 
 class Effect(Configurable):
     def apply(self, ship):
@@ -14,7 +18,8 @@ class TimedEffect(Effect):
     required_fields = ('duration',)
 
     def apply(self, ship):
-        heapq.heappush(ship.timed_effects, (time.time() + self.duration, id(self), self))
+        heapq.heappush(ship.timed_effects,
+                       (SIM_CLOCK.now + self.duration, next(_application_order), self))
 
 class AddVFX(TimedEffect):
     required_fields = TimedEffect.required_fields + ('vfx',)
@@ -1,30 +1,78 @@
-import time
 import math
 
 import pygame
 
-from astro import EXPLOSIONS, EXPLOSION_SIZE_SCALE, EXPLOSION_DURATION_SCALE
-from astro.image import generate_rect_and_mask
-from astro.astro_sprite import AstroSprite
+from astro import EXPLOSIONS, EXPLOSION_SIZE_SCALE, EXPLOSION_DURATION_SCALE, \
+    EXPLOSION_RADIUS_STEP, EXPLOSION_FRAME_RATE, EXPLOSION_MAX_FRAMES
+from astro.image import convert_for_display, IMAGE_CACHE, CachedImage, generate_rect_and_mask
+from astro.sim_clock import SIM_CLOCK
+from astro.visual_sprite import VisualSprite
 
-class Explosion(AstroSprite):
+# Mapping of (radius, frame count) -> ExplosionFrames
+EXPLOSION_FRAMES = dict()
+
+def render_explosion_frame(radius, age_proportion):
+    """Draws an explosion of the given maximum radius at the given proportion of its lifetime.
+    """
+    image = pygame.Surface((2 * radius, 2 * radius), flags=pygame.SRCALPHA)
+    alpha = 255 * (1 - age_proportion)
+    color = (255, 255 * (1 - age_proportion), 0, alpha)
+    pygame.draw.circle(image, color, (radius, radius), radius * age_proportion)
+    return convert_for_display(image)
+
+class ExplosionFrames:
+    """The animation frames shared by explosions in a (radius, frame count) bucket.
+
+    Frame i shows the explosion at i / frame_count of its lifetime. The frames are kept in
+    IMAGE_CACHE, so they count towards its budget. Each is only rendered the first time it's
+    needed, and again if it was evicted.
+    """
+
+    def __init__(self, radius, frame_count):
+        self.radius = radius
+        self.frame_count = frame_count
+
+    def __len__(self):
+        return self.frame_count
+
+    def __getitem__(self, i):
+        key = ('explosion', self.radius, self.frame_count, i)
+        cached = IMAGE_CACHE.get(key)
+        if cached is None:
+            image = render_explosion_frame(self.radius, i / self.frame_count)
+            cached = IMAGE_CACHE[key] = CachedImage(image, *generate_rect_and_mask(image))
+        return cached.image
+
+def explosion_frames(radius, frame_count):
+    """Returns the ExplosionFrames shared by explosions in a (radius, frame count) bucket.
+    """
+    frames = EXPLOSION_FRAMES.get((radius, frame_count))
+    if frames is None:
+        frames = EXPLOSION_FRAMES[radius, frame_count] = ExplosionFrames(radius, frame_count)
+    return frames
+
+class Explosion(VisualSprite):
     groups = [EXPLOSIONS]
 
     def __init__(self, exploding_object):
-        super().__init__(None)
+        super().__init__()
 
         self.exploding_object = exploding_object
-        self.start_time = time.time()
+        self.start_time = SIM_CLOCK.now
         self.max_age = math.sqrt(self.exploding_object.mass) * EXPLOSION_DURATION_SCALE / 25
         self.max_radius = math.pow(self.exploding_object.mass, 0.33) * EXPLOSION_SIZE_SCALE * 7.5
 
         self.init_sprite()
 
     def init_sprite(self):
-        self.image = pygame.Surface((2 * self.max_radius, 2 * self.max_radius)).convert_alpha()
-        self.update_sprite(time.time())
-        self.rect, self.mask, self.mask_rect, self.mask_rect_offsetx, \
-            self.mask_rect_offsety, self.mask_centroid = generate_rect_and_mask(self.image)
+        self.radius = max(round(self.max_radius / EXPLOSION_RADIUS_STEP), 1) * EXPLOSION_RADIUS_STEP
+        frame_count = min(max(math.ceil(self.max_age * EXPLOSION_FRAME_RATE), 1),
+                          EXPLOSION_MAX_FRAMES)
+        self.frames = explosion_frames(self.radius, frame_count)
+        self.frame_index = None
+        self.image = self.frames[0]
+        self.rect = self.image.get_rect()
+        self.update_sprite(SIM_CLOCK.now)
 
     def tick(self, now, elapsed):
         self.update_sprite(now)
@@ -34,9 +82,7 @@ class Explosion(AstroSprite):
         if age_proportion > 1:
             self.destroy()
         else:
-            self.image.fill((0, 0, 0, 0))
-            radius = self.max_radius * age_proportion
-            alpha = 255 * (1 - age_proportion)
-            color = (255, 255 * (1 - age_proportion), 0, alpha)
-            pygame.draw.circle(self.image, color, (self.max_radius, self.max_radius), radius)
-
+            i = min(int(age_proportion * len(self.frames)), len(self.frames) - 1)
+            if i != self.frame_index:
+                self.frame_index = i
+                self.image = self.frames[i]
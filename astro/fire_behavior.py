@@ -21,8 +21,7 @@ class FireBehavior(Configurable):
         """
 
         for projectile in Weapon.projectiles:
-            projectile = projectile.copy()
-            projectile.place(self.ship.screen, firer=Weapon.owner, friendly=Weapon.owner.inverted)
+            projectile.fire(self.ship.screen, firer=Weapon.owner, friendly=Weapon.owner.inverted)
 
 class FireNever(FireBehavior):
     """Causes the ship to fire as never as possible.
@@ -64,7 +63,6 @@ class FireAtPlayer(FireConstantly):
             else:
                 angle = 0
 
-            projectile = projectile.copy()
             angle = math.degrees(angle)
-            projectile.place(self.ship.screen, firer=weapon.owner, friendly=friendly, angle=angle,
+            projectile.fire(self.ship.screen, firer=weapon.owner, friendly=friendly, angle=angle,
                 offset=offset)
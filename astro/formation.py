@@ -6,10 +6,10 @@ Override update_velocity for complex coordinated movements like moving in a circ
 import operator
 import random
 import collections
-import time
 
 from astro.configurable import Configurable
 from astro.movable import Movable
+from astro.sim_clock import SIM_CLOCK
 from astro.util import magnitude
 from astro.move_behavior import MoveBehavior
 
@@ -47,14 +47,14 @@ class Formation(Configurable, Movable):
         # Will be a deque of (offset, ship) 2-tuples in increasing offset order
         self.spawn_offsets = collections.deque(sorted(spawn_offsets, key=operator.itemgetter(0)))
 
-    def deploy(self, screen):
+    def deploy(self, screen, clock=SIM_CLOCK):
         """Like place, for formations.
 
         Spawns all ships in the formation and starts moving them according to configuration.
         """
         self.place(screen, self.center_x, self.height // -2, 0, 0)
         self.move_behavior.init_ship(self)
-        self.deployed = time.time()
+        self.deployed = clock.now
         self.calculate_spawn_offsets()
 
     def place(self, *args, **kwargs):
@@ -122,6 +122,8 @@ class Formation(Configurable, Movable):
                 for i, ship in enumerate(self.more_ships):
                     ship.move_behavior.formation = None
                     ship.move_behavior.formation_i = None
+                    if ship.kinematics is not None:
+                        ship.move_behavior.steer()
             if self._reached_dest:
                 self.accelerate_toward(elapsed, 0, 0)
 
@@ -129,6 +131,10 @@ class Formation(Configurable, Movable):
         # Keep ship in sync with formation
         ship.accelerate_toward(elapsed, self.speedx, self.speedy)
 
+    def steer_ship(self, ship, i):
+        # Equivalent of update_ship_velocity for ships moved by astro.kinematics
+        ship.kinematics.follow(ship, self)
+
 class Grid(Formation):
     required_fields = Formation.required_fields + ('rows', 'columns',)
 
@@ -1,7 +1,7 @@
 import pygame
 
 from astro import HEALTHBARS, HP_COLOR, SHIELD_COLOR, EMPTY_COLOR, HEALTHBAR_HEIGHT
-from astro.timekeeper import Timekeeper
+from astro.visual_sprite import VisualSprite
 
 def _draw_bar(surface, rect, fill_pct, fillcolor):
     pygame.draw.rect(surface, EMPTY_COLOR, rect)
@@ -16,33 +16,49 @@ def draw_healthbar(surface, rect, hp_pct, shield_pct=None):
         shield_rect = rect.copy()
         shield_rect.height = rect.height // 2
         _draw_bar(surface, shield_rect, shield_pct, SHIELD_COLOR)
-        hp_pct = rect.copy()
-        hp_pct.height = rect.height // 2
-        hp_pct.top = shield_rect.bottom
+        hp_rect = rect.copy()
+        hp_rect.height = rect.height // 2
+        hp_rect.top = shield_rect.bottom
         _draw_bar(surface, hp_rect, hp_pct, HP_COLOR)
 
+def healthbar_state(ship):
+    """Returns the (hp proportion, shield proportion or None) shown by a ship's healthbar.
+    """
+    if ship.shield is None:
+        return ship.integrity_proportion, None
+    return ship.integrity_proportion, ship.shield.integrity_proportion
+
 def draw_healthbar_for_ship(surface, rect, ship):
-    kwargs = {}
-    if ship.shield is not None:
-        kwargs['shield_pct'] = ship.shield.integrity_proportion
-    return draw_healthbar(surface, rect, ship.integrity_proportion, **kwargs)
+    return draw_healthbar(surface, rect, *healthbar_state(ship))
+
+class Healthbar(VisualSprite):
+    """Small healthbar shown below an enemy ship.
+
+    The bar is only redrawn when the proportions it shows change.
+
+    Attributes:
+        owner (Ship): The ship whose health is shown.
+        state (tuple): The healthbar_state the image was last drawn with.
+    """
 
-class Healthbar(Timekeeper, pygame.sprite.Sprite):
     def __init__(self, owner):
-        pygame.sprite.Sprite.__init__(self)
-        Timekeeper.__init__(self)
+        super().__init__()
         self.owner = owner
         HEALTHBARS.add(self)
-        self.image = pygame.Surface((self.owner.rect.width, HEALTHBAR_HEIGHT))
+        self.image = pygame.Surface((self.owner.rect.width, HEALTHBAR_HEIGHT)).convert()
         self.rect = self.image.get_rect()
         self.static_rect = self.image.get_rect()
-
-    def destroy(self):
-        self.kill()
+        self.state = None
+        self.update_image()
 
     def tick(self, now, elapsed):
+        self.update_image()
+
+    def update_image(self):
         # Keep in sync with owner
         self.rect.midtop = self.owner.rect.midbottom
 
-        # Update image
-        draw_healthbar_for_ship(self.image, self.static_rect, self.owner)
+        state = healthbar_state(self.owner)
+        if state != self.state:
+            self.state = state
+            draw_healthbar(self.image, self.static_rect, *state)
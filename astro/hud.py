@@ -1,7 +1,4 @@
-import pygame
-import pygame.font
-
-from astro import HP_COLOR, SHIELD_COLOR, EMPTY_COLOR, BIG_HEALTHBAR_HEIGHT
+from astro import FONTS, HP_COLOR, SHIELD_COLOR, EMPTY_COLOR, BIG_HEALTHBAR_HEIGHT
 from astro.healthbar import draw_healthbar_for_ship
 
 class HUD:
@@ -9,29 +6,36 @@ class HUD:
         self.screen = screen
         self.screen_size = self.screen.screen_size
         self.player_ship = player_ship
-        self.hp_font = pygame.font.Font(None, 36)
         self.big_health_bar_rect = self.screen.proportional_rect((1/4, 0), (1/2, BIG_HEALTHBAR_HEIGHT))
         self.big_health_bar_ship = None
 
     def draw(self):
+        """Draws the HUD onto the screen.
+
+        Returns:
+            A list of the rects drawn over.
+        """
+        rects = []
         if self.player_ship.shield is not None:
-            self.draw_shield_counter()
-        self.draw_hp_counter()
+            rects.append(self.draw_shield_counter())
+        rects.append(self.draw_hp_counter())
         if self.big_health_bar_ship is not None:
-            self.draw_big_health_bar()
+            rects.append(self.draw_big_health_bar())
+        return rects
 
     def draw_big_health_bar(self):
-        draw_healthbar_for_ship(self.screen, self.big_health_bar_rect,
+        draw_healthbar_for_ship(self.screen.screen, self.big_health_bar_rect,
             self.big_health_bar_ship)
+        return self.big_health_bar_rect
 
     def draw_shield_counter(self):
         s = f'{round(self.player_ship.shield.integrity)}/{self.player_ship.shield.capacity}'
-        text = self.hp_font.render(s, True, SHIELD_COLOR)
+        text = FONTS.render(None, 36, s, SHIELD_COLOR)
         textpos = text.get_rect(topright=(self.screen_size[0], 0))
-        self.screen.screen.blit(text, textpos)
+        return self.screen.screen.blit(text, textpos)
 
     def draw_hp_counter(self):
         s = f'{round(self.player_ship.hp)}/{self.player_ship.max_hp}'
-        text = self.hp_font.render(s, True, HP_COLOR)
+        text = FONTS.render(None, 36, s, HP_COLOR)
         textpos = text.get_rect(topright=(self.screen_size[0], text.get_height()))
-        self.screen.screen.blit(text, textpos)
+        return self.screen.screen.blit(text, textpos)
@@ -1,10 +1,13 @@
 import os.path
-from collections import namedtuple
+import math
+import weakref
+from collections import namedtuple, OrderedDict
+from contextlib import contextmanager
 
 import pygame
 
-from astro import ASSET_DIR
-from astro.util import frange
+from astro import ASSET_DIR, IMAGE_CACHE_BUDGET, RLE_MIN_PIXELS, logger
+from astro.disk_cache import DISK_CACHE
 
 CachedImage = namedtuple('CachedImage',
     ['image',
@@ -12,59 +15,391 @@ CachedImage = namedtuple('CachedImage',
      'mask',
      'mask_rect',
      'mask_rect_offsetx',
-     'mask_rect_offsety',
-     'mask_centroid'])
+     'mask_rect_offsety'])
 
-IMAGE_CACHE = dict()
+def cached_image_bytes(cached):
+    """Estimates the memory used by a CachedImage's surface and its mask, if one is built.
+    """
+    width, height = cached.image.get_size()
+    return cached.image.get_pitch() * height + (width + 7) // 8 * height
 
-ALLOWED_DIRECTIONS = {None, 4, 8}
+class ImageCache:
+    """Least recently used cache of CachedImages that stays within a memory budget.
+
+    Entries can be pinned to exempt them from eviction, e.g. assets needed by the current level.
+    Evicted images are only freed once no sprite uses them any more.
+
+    Attributes:
+        budget (int): Approximate maximum number of bytes of images and masks to keep.
+        hits (int): Number of lookups that found an entry.
+        misses (int): Number of lookups that didn't.
+        evictions (int): Number of entries evicted to stay within the budget.
+        resident_bytes (int): Estimated number of bytes used by the cached entries.
+    """
+
+    def __init__(self, budget=IMAGE_CACHE_BUDGET):
+        self.budget = budget
+        self._entries = OrderedDict()
+        self._sizes = dict()
+        self.pinned = set()
+        self._pin_new = False
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.resident_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key, default=None):
+        """Returns the entry for key, marking it as recently used, or default if not cached.
+        """
+        if key in self._entries:
+            self.hits += 1
+            self._entries.move_to_end(key)
+            if self._pin_new:
+                self.pinned.add(key)
+            return self._entries[key]
+        self.misses += 1
+        return default
+
+    def __getitem__(self, key):
+        cached = self.get(key)
+        if cached is None:
+            raise KeyError(key)
+        return cached
+
+    def __setitem__(self, key, cached):
+        if key in self._entries:
+            self.resident_bytes -= self._sizes[key]
+        self._entries[key] = cached
+        self._entries.move_to_end(key)
+        self._sizes[key] = cached_image_bytes(cached)
+        self.resident_bytes += self._sizes[key]
+        if self._pin_new:
+            self.pinned.add(key)
+        self._evict(key)
+
+    def _evict(self, keep):
+        if self.resident_bytes <= self.budget:
+            return
+        for key in list(self._entries):
+            if self.resident_bytes <= self.budget:
+                break
+            if key != keep and key not in self.pinned:
+                del self._entries[key]
+                self.resident_bytes -= self._sizes.pop(key)
+                self.evictions += 1
+
+    def pin(self, key):
+        self.pinned.add(key)
+
+    def unpin_all(self):
+        self.pinned.clear()
+        self._evict(None)
+
+    @contextmanager
+    def pinning(self):
+        """Pins every entry that is looked up or added within the context.
+        """
+        self._pin_new = True
+        try:
+            yield self
+        finally:
+            self._pin_new = False
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+        self.pinned.clear()
+        self.resident_bytes = 0
+
+    def stats(self):
+        return {'entries': len(self._entries),
+                'pinned': len(self.pinned),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'resident_bytes': self.resident_bytes,
+                'budget': self.budget}
+
+IMAGE_CACHE = ImageCache()
+# Mapping of (path, flip, directions) -> DirectionTable, which only refers to images in IMAGE_CACHE
+DIRECTION_TABLES = dict()
+# Mapping of image -> {number of levels: list of copies of the image with surface alpha applied}
+ALPHA_FRAMES = weakref.WeakKeyDictionary()
+# Mapping of image -> collision mask, kept for as long as the image is
+MASKS = weakref.WeakKeyDictionary()
+
+ALLOWED_DIRECTIONS = {None, 4, 8, 16, 32, 64}
+
+# Mapping of image name -> how it was converted to the display format, see convert_for_display
+CONVERSIONS = dict()
+# Colors tried in order as the colorkey of images whose pixels are either opaque or transparent
+COLORKEYS = [(255, 0, 255), (0, 255, 255), (1, 254, 1)]
+
+def convert_for_display(image, name=None):
+    """Returns a copy of an image in the display's pixel format that is fastest to blit.
+
+    The pixels' alpha values decide how it's converted:
+        'opaque': No transparent pixels, so no alpha channel is needed at all.
+        'colorkey': Every pixel is either opaque or transparent, so transparent pixels are replaced
+            with an unused colorkey and the image is RLE encoded.
+        'alpha-rle': Some pixels are partially transparent, so per-pixel alpha is kept, and the
+            image is big enough to benefit from RLE encoding.
+        'alpha': As above, but too small to benefit from RLE encoding.
+
+    The image is returned unchanged if there's no display to convert to yet.
+
+    Args:
+        image (pygame.Surface): The image to convert.
+        name: Name to record the conversion under in CONVERSIONS, or None not to record it.
+    """
+    if pygame.display.get_surface() is None:
+        return image
+    width, height = image.get_size()
+    visible = pygame.mask.from_surface(image, 0).count()
+    opaque = pygame.mask.from_surface(image, 254).count()
+
+    converted = None
+    if opaque == width * height:
+        path, converted = 'opaque', image.convert()
+    elif visible == opaque:
+        path, converted = 'colorkey', _colorkey_image(image, width * height - opaque)
+    if converted is None:
+        converted = image.convert_alpha()
+        if width * height >= RLE_MIN_PIXELS:
+            path = 'alpha-rle'
+            converted.set_alpha(255, pygame.RLEACCEL)
+        else:
+            path = 'alpha'
+
+    if name is not None:
+        CONVERSIONS[name] = path
+        logger.debug(f'Converted image {name} for display: {path}')
+    return converted
+
+def restore_conversion(image, path, colorkey, name=None):
+    """Converts an image to the display format the way convert_for_display did before, e.g. for
+       an image read back from the disk cache, without inspecting its pixels again.
+
+    Args:
+        image (pygame.Surface): The image's pixels, with per-pixel alpha unless path is 'opaque' or
+            'colorkey'.
+        path (str): The conversion path convert_for_display took.
+        colorkey (tuple): The colorkey of a 'colorkey' image.
+        name: Name to record the conversion under in CONVERSIONS, or None not to record it.
+    """
+    if pygame.display.get_surface() is None:
+        return image
+    if path in ('opaque', 'colorkey'):
+        converted = image.convert()
+        if path == 'colorkey':
+            converted.set_colorkey(colorkey, pygame.RLEACCEL)
+    else:
+        converted = image.convert_alpha()
+        if path == 'alpha-rle':
+            converted.set_alpha(255, pygame.RLEACCEL)
+
+    if name is not None:
+        CONVERSIONS[name] = path
+    return converted
+
+def _colorkey_image(image, transparent):
+    """Returns an RLE encoded colorkey version of an image, or None if it uses all COLORKEYS.
+
+    Args:
+        transparent (int): Number of transparent pixels in the image.
+    """
+    for colorkey in COLORKEYS:
+        converted = pygame.Surface(image.get_size()).convert()
+        converted.fill(colorkey)
+        converted.blit(image, (0, 0))
+        # The colorkey is only usable if no opaque pixel already has its color
+        if pygame.mask.from_threshold(converted, colorkey, (1, 1, 1, 255)).count() == transparent:
+            converted.set_colorkey(colorkey, pygame.RLEACCEL)
+            return converted
+    return None
+
+def conversion_report():
+    """Returns a mapping of each display conversion path to the names of images that took it.
+    """
+    report = dict()
+    for name, path in CONVERSIONS.items():
+        report.setdefault(path, []).append(name)
+    return report
+
+class DirectionTable:
+    """Rotated variants of an image for a fixed number of facing directions.
+
+    Variants are indexed by direction, starting from the unrotated image (facing down) and going
+    counterclockwise. Each variant is only rotated the first time it is requested. The variants
+    are kept in IMAGE_CACHE, as is the unrotated image of a table loaded from a file.
+
+    Attributes:
+        image (pygame.Surface): The unrotated image, or None if it is loaded from source.
+        directions (int): The number of directions.
+        source (tuple): (path relative to ASSET_DIR, flip) of the image file the image is loaded
+            from, also used to keep the variants in the disk cache. None if the image didn't come
+            from a file.
+    """
+
+    def __init__(self, image, directions, key=None, source=None):
+        self.image = image
+        self.key = key if key is not None else id(self)
+        self.source = source
+        self.directions = directions
+        self.step = 360 / directions
+        # Converts an angle in radians, measured clockwise from facing right, to a fractional index
+        self._index_scale = -directions / (2 * math.pi)
+        self._index_offset = directions / 4
+
+    def index(self, speedx, speedy):
+        """Returns the index of the variant facing closest to the direction of a velocity.
+        """
+        return round(math.atan2(speedy, speedx) * self._index_scale + self._index_offset) % \
+            self.directions
+
+    def variant(self, i):
+        """Returns the CachedImage for the variant with index i, rotating it if necessary.
+        """
+        key = (self.key, i)
+        cached = IMAGE_CACHE.get(key)
+        if cached is None:
+            if self.source is None:
+                cached = _cache_image(key, self._rotate(i))
+            else:
+                rel_path, flip = self.source
+                variant = f'{"flipped" if flip else "base"}-{i}of{self.directions}'
+                cached = _cache_processed(key, os.path.join(ASSET_DIR, rel_path), variant,
+                                          lambda: self._rotate(i))
+        return cached
+
+    def _rotate(self, i):
+        image = self.image if self.source is None else load_image(*self.source)[0]
+        if i:
+            return pygame.transform.rotate(image, i * self.step)
+        return image.copy()
 
 def _cache_image(key, image):
-    rect, mask, mask_rect, mask_rect_offsetx, mask_rect_offsety, centroid = \
-        generate_rect_and_mask(image)
-    t = IMAGE_CACHE[key] = CachedImage(image, rect, mask, mask_rect,
-                                       mask_rect_offsetx, mask_rect_offsety, centroid)
+    image = convert_for_display(image, key)
+    t = IMAGE_CACHE[key] = CachedImage(image, *generate_rect_and_mask(image))
     return t
 
+def _cache_processed(key, full_path, variant, process):
+    """Caches a processed version of an image file, reading it from the disk cache if possible.
+
+    Args:
+        key: Key to cache the image under in IMAGE_CACHE.
+        full_path (str): Path to the source image file.
+        variant (str): Identifies the processing in the disk cache.
+        process (callable): Returns the processed image if it isn't in the disk cache.
+    """
+    loaded = DISK_CACHE.load(full_path, variant)
+    if loaded is None:
+        cached = _cache_image(key, process())
+        converted = pygame.display.get_surface() is not None
+        DISK_CACHE.store(full_path, variant, cached, CONVERSIONS[key] if converted else None)
+        return cached
+    (image, *rects), conversion = loaded
+    if conversion is None:
+        image = convert_for_display(image, key)
+    else:
+        image = restore_conversion(image, *conversion, key)
+    cached = IMAGE_CACHE[key] = CachedImage(image, *rects)
+    return cached
+
+def _load_file(full_path, flip):
+    image = pygame.image.load(full_path).convert_alpha()
+    if flip:
+        image = pygame.transform.flip(image, False, True)
+    return image
+
 def load_image(rel_path, flip=False, directions=None):
     if directions not in ALLOWED_DIRECTIONS:
         raise ValueError(f'Invalid number of directions: {directions}')
     key = rel_path + ('flipped' if flip else '')
 
-    if key not in IMAGE_CACHE:
+    image_tuple = IMAGE_CACHE.get(key)
+    if image_tuple is None:
         full_path = os.path.join(ASSET_DIR, rel_path)
         if not os.path.isfile(full_path):
             raise FileNotFoundError(f'Image not found: {full_path}')
 
-        image = pygame.image.load(full_path).convert_alpha()
-        if flip:
-            image = pygame.transform.flip(image, False, True)
-        image_tuple = _cache_image(key, image)
-
-        if directions is not None:
-            for angle in frange(0, 360, 360 / directions):
-                key = rel_path + str(round(angle))
-                if angle != 0:
-                    rotated_image = pygame.transform.rotate(image, angle)
-                else:
-                    rotated_image = image.copy()
-                _cache_image(key, rotated_image)
-    else:
-        image_tuple = IMAGE_CACHE[key]
+        image_tuple = _cache_processed(key, full_path, 'flipped' if flip else 'base',
+                                       lambda: _load_file(full_path, flip))
+
+    if directions is not None and (rel_path, flip, directions) not in DIRECTION_TABLES:
+        DIRECTION_TABLES[rel_path, flip, directions] = \
+            DirectionTable(None, directions, (rel_path, flip, directions), (rel_path, flip))
+
+    return _unpack(image_tuple)
+
+def _unpack(cached):
+    image, rect, mask, mask_rect, mask_rect_offsetx, mask_rect_offsety = cached
+    return image, rect.copy(), mask, mask_rect.copy(), mask_rect_offsetx, mask_rect_offsety
+
+def load_ellipse(size, color):
+    """Returns the image and rects for a filled ellipse, drawing it the first time.
 
-    image, rect, mask, mask_rect, mask_rect_offsetx, mask_rect_offsety, centroid = image_tuple
-    return image, rect.copy(), mask, mask_rect.copy(), mask_rect_offsetx, mask_rect_offsety, centroid
+    Args:
+        size (tuple): Width and height of the ellipse.
+        color (tuple): RGBA color of the ellipse.
+    """
+    key = ('ellipse', tuple(size), tuple(color))
+    cached = IMAGE_CACHE.get(key)
+    if cached is None:
+        image = pygame.Surface(size, flags=pygame.SRCALPHA)
+        pygame.draw.ellipse(image, color, image.get_rect())
+        cached = _cache_image(key, image)
+    return _unpack(cached)
+
+def alpha_frames(image, levels):
+    """Returns copies of an image with their surface alpha set to levels + 1 evenly spaced values.
+
+    Frame i has alpha 255 * i / levels. The frames are shared by all callers and kept for as long
+    as the image is.
+    """
+    frames_by_levels = ALPHA_FRAMES.setdefault(image, dict())
+    frames = frames_by_levels.get(levels)
+    if frames is None:
+        frames = frames_by_levels[levels] = list()
+        for i in range(levels + 1):
+            frame = image.copy()
+            frame.set_alpha(round(255 * i / levels), pygame.RLEACCEL)
+            frames.append(frame)
+    return frames
+
+def load_direction_table(rel_path, directions, flip=False):
+    """Returns the DirectionTable for an image, loading the image if necessary.
+    """
+    if (rel_path, flip, directions) not in DIRECTION_TABLES:
+        load_image(rel_path, flip, directions)
+    return DIRECTION_TABLES[rel_path, flip, directions]
+
+def image_mask(image):
+    """Returns the collision mask of an image, building it the first time it's needed.
+    """
+    mask = MASKS.get(image)
+    if mask is None:
+        mask = MASKS[image] = pygame.mask.from_surface(image)
+    return mask
 
 def generate_rect_and_mask(image):
+    """Returns the rect of an image and the bounding rect of the pixels its mask would contain.
+
+    The mask itself is left as None, since most images never collide using their mask; sprites
+    build it with image_mask when it's first used.
+    """
     rect = image.get_rect()
-    mask = pygame.mask.from_surface(image)
-    bounding_rects = mask.get_bounding_rects()
-    if bounding_rects:
-        mask_rect = mask.get_bounding_rects()[0]
-    else:
+    # Matches the default threshold of pygame.mask.from_surface, i.e. alpha > 127
+    mask_rect = image.get_bounding_rect(min_alpha=128)
+    if not mask_rect.width or not mask_rect.height:
         mask_rect = pygame.Rect(rect.centerx, rect.centery, 0, 0)
     mask_rect_offsetx = mask_rect.centerx - rect.centerx
     mask_rect_offsety = mask_rect.centery - rect.centery
-    mask_centroid = mask.centroid()
 
-    return rect, mask, mask_rect, mask_rect_offsetx, mask_rect_offsety, mask_centroid
+    return rect, None, mask_rect, mask_rect_offsetx, mask_rect_offsety
@@ -5,6 +5,7 @@ import pygame
 from pygame.locals import *
 
 import astro
+from astro.sim_clock import SIM_CLOCK
 
 # TODO: Make this user-configurable
 
@@ -13,7 +14,8 @@ DOWN_ACTIONS = {
                 K_RIGHT: lambda: astro.PLAYER.ship.accel_right(),
                 K_UP: lambda: astro.PLAYER.ship.accel_up(),
                 K_DOWN: lambda: astro.PLAYER.ship.accel_down(),
-                K_SPACE: lambda: astro.PLAYER.ship.start_firing()
+                K_SPACE: lambda: astro.PLAYER.ship.start_firing(),
+                K_p: SIM_CLOCK.toggle_pause
                }
 
 UP_ACTIONS = {
@@ -0,0 +1,419 @@
+"""Optional NumPy backend that owns the positions and velocities of ships in arrays and moves them
+in vectorized passes instead of one ship at a time.
+
+Ships are added to SHIP_KINEMATICS when they are placed, and while they are, their x, y, speedx,
+speedy and _prev values are views into its arrays. These are ArrayAttributes of the ship's class,
+which fall back to ordinary attributes for ships that aren't added; a class only gets them once one
+of its ships is added, so that ships moving themselves don't pay for them. Each step steers, clamps,
+integrates and confines every ship at once, then copies the rounded positions to the ships' rects.
+
+Move behaviors steer ships by giving the kinematics a standing command when their destination
+changes rather than accelerating them each tick: match a velocity (Idle), head for a point
+(Patrol and entry destinations), or match a leader's velocity (ships in a formation). Arriving at a
+point calls back MoveBehavior.arrived, e.g. for a patrol to move on to its next destination. Ships
+whose steering can't be expressed as a command, such as the player ship, have custom steering:
+their update_velocity is called each pass and their calls to Movable.accelerate_toward and
+accelerate_toward_point set that pass's command.
+
+Requires NumPy; SHIP_KINEMATICS is None and ships move themselves if it isn't installed or
+KINEMATICS_BACKEND isn't 'numpy'.
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from astro import KINEMATICS_BACKEND, SCREEN_SIZE, OFF_SCREEN_CUTOFF, REACHED_DEST_THRESHOLD, \
+    logger
+from astro.timekeeper import Timekeeper
+from astro.sim_clock import SIM_CLOCK
+
+# Steering commands
+COAST = 0
+VELOCITY = 1
+POINT = 2
+POINT_NO_DECELERATION = 3
+FOLLOW = 4
+
+# Attributes of a ship that are views into the arrays while it is added to a ShipKinematics
+ATTRIBUTES = ('x', 'y', 'x_prev', 'y_prev', 'speedx', 'speedy', 'speedx_prev', 'speedy_prev')
+
+# Arrays holding one value per ship, with their dtypes
+FIELDS = dict({name: float for name in ATTRIBUTES},
+              max_speed=float,
+              acceleration=float,
+              stopping_distance=float,
+              steering=numpy.int8 if numpy is not None else None,
+              # Target velocity for VELOCITY and point for POINT and POINT_NO_DECELERATION
+              targetx=float,
+              targety=float,
+              # Index into ShipKinematics.leaders for FOLLOW
+              leader=numpy.intp if numpy is not None else None,
+              # Time left to spend at the target point before arriving, or NaN to never arrive
+              arrival_timer=float,
+              custom=bool,
+              confined=bool,
+              mask_offsetx=int,
+              mask_offsety=int,
+              mask_width=int,
+              mask_height=int,
+              used=bool,
+              # Whether the ship moves in the next step; ships start moving the step after they're
+              # added, as they would on their first tick
+              active=bool)
+
+class ArrayAttribute:
+    """Data descriptor for a kinematic attribute that is a view into the arrays of the
+       ShipKinematics an object is added to, and an ordinary instance attribute otherwise.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        kinematics = obj.kinematics
+        if kinematics is None:
+            return obj.__dict__[self.name]
+        return getattr(kinematics, self.name)[obj.kinematics_slot].item()
+
+    def __set__(self, obj, value):
+        kinematics = obj.kinematics
+        if kinematics is None:
+            obj.__dict__[self.name] = value
+        else:
+            getattr(kinematics, self.name)[obj.kinematics_slot] = value
+
+def add_views(cls):
+    """Makes the ATTRIBUTES of cls ArrayAttributes, if they aren't already.
+    """
+    for name in ATTRIBUTES:
+        if not isinstance(getattr(cls, name, None), ArrayAttribute):
+            attribute = ArrayAttribute()
+            attribute.__set_name__(cls, name)
+            setattr(cls, name, attribute)
+
+class ShipKinematics(Timekeeper):
+    """Positions, velocities and steering commands of ships in arrays, one slot per ship.
+
+    The arithmetic is the same as Movable's, in the same order, and it is updated with the clock
+    like the ships would be, so ships follow the same paths as they do when moving themselves.
+
+    Attributes:
+        movables (list): The ship in each slot, None for free slots.
+        leaders (list): Objects ships follow the velocity of, e.g. formations.
+        size (int): Number of slots that have been used, so that slots past it are all free.
+        added (int): Total number of movables added.
+    """
+
+    def __init__(self, capacity=64):
+        super().__init__()
+        for name, dtype in FIELDS.items():
+            setattr(self, name, numpy.zeros(capacity, dtype=dtype))
+        self.movables = [None] * capacity
+        # Free slots, lowest last
+        self._free = list(range(capacity - 1, -1, -1))
+        self.size = 0
+        self.leaders = []
+        self._leader_indexes = dict()
+        self.screen_size = SCREEN_SIZE
+        self.added = 0
+
+    def __len__(self):
+        return len(self.movables) - len(self._free)
+
+    def _grow(self):
+        capacity = len(self.movables)
+        for name in FIELDS:
+            array = getattr(self, name)
+            setattr(self, name, numpy.concatenate((array, numpy.zeros_like(array))))
+        self.movables.extend([None] * capacity)
+        self._free[:0] = range(2 * capacity - 1, capacity - 1, -1)
+
+    def add(self, movable):
+        """Moves movable's position and velocity into the arrays, where they stay until it is
+           removed, and reads its movement parameters and collision mask.
+
+        Its steering is custom until a command is given. Adding a movable that is already added
+        only rereads its parameters.
+        """
+        if movable.kinematics is self:
+            slot = movable.kinematics_slot
+        else:
+            if not self._free:
+                self._grow()
+            add_views(type(movable))
+            slot = self._free.pop()
+            self.size = max(self.size, slot + 1)
+            self.movables[slot] = movable
+            self.used[slot] = True
+            for name in ATTRIBUTES:
+                getattr(self, name)[slot] = movable.__dict__[name]
+            movable.kinematics = self
+            movable.kinematics_slot = slot
+            self.added += 1
+        self.max_speed[slot] = movable.max_speed
+        self.acceleration[slot] = movable.acceleration
+        self.stopping_distance[slot] = movable.stopping_distance
+        self.confined[slot] = movable.confined
+        self.mask_offsetx[slot] = movable.mask_rect_offsetx
+        self.mask_offsety[slot] = movable.mask_rect_offsety
+        self.mask_width[slot], self.mask_height[slot] = movable.mask_rect.size
+        self.active[slot] = False
+        self.screen_size = movable.screen_size
+        self.steer_custom(movable)
+
+    def remove(self, movable):
+        """Moves movable's position and velocity back into its own attributes and frees its slot.
+        """
+        slot = movable.kinematics_slot
+        values = {name: getattr(self, name)[slot].item() for name in ATTRIBUTES}
+        movable.kinematics = None
+        movable.kinematics_slot = None
+        movable.__dict__.update(values)
+        self.movables[slot] = None
+        self.used[slot] = self.active[slot] = False
+        self.steering[slot] = COAST
+        self._free.append(slot)
+
+    def clear(self):
+        for movable in self.movables[:self.size]:
+            if movable is not None:
+                self.remove(movable)
+        self._free = list(range(len(self.movables) - 1, -1, -1))
+        self.size = 0
+        self.leaders = []
+        self._leader_indexes = dict()
+        self._last_updated = None
+
+    def _command(self, movable, steering, targetx, targety):
+        slot = movable.kinematics_slot
+        self.steering[slot] = steering
+        self.targetx[slot] = targetx
+        self.targety[slot] = targety
+        return slot
+
+    def steer_velocity(self, movable, targetx, targety):
+        """Accelerates movable toward a velocity from now on.
+        """
+        slot = self._command(movable, VELOCITY, targetx, targety)
+        self.arrival_timer[slot] = numpy.nan
+        self.custom[slot] = False
+
+    def steer_point(self, movable, targetx, targety, decelerate=True, arrival_time=None):
+        """Moves movable toward a point from now on.
+
+        Args:
+            decelerate (bool): Whether to slow down approaching the point, as
+                Movable.accelerate_toward_point.
+            arrival_time (float): If given, movable's MoveBehavior.arrived is called once it has
+                been within REACHED_DEST_THRESHOLD of the point for this many seconds.
+        """
+        slot = self._command(movable, POINT if decelerate else POINT_NO_DECELERATION,
+                             targetx, targety)
+        self.arrival_timer[slot] = numpy.nan if arrival_time is None else arrival_time
+        self.custom[slot] = False
+
+    def follow(self, movable, leader):
+        """Accelerates movable toward the velocity of leader from now on.
+        """
+        index = self._leader_indexes.get(id(leader))
+        if index is None:
+            index = self._leader_indexes[id(leader)] = len(self.leaders)
+            self.leaders.append(leader)
+        slot = self._command(movable, FOLLOW, 0, 0)
+        self.leader[slot] = index
+        self.arrival_timer[slot] = numpy.nan
+        self.custom[slot] = False
+
+    def steer_custom(self, movable):
+        """Calls movable's update_velocity each pass to steer it from now on.
+        """
+        slot = self._command(movable, COAST, 0, 0)
+        self.arrival_timer[slot] = numpy.nan
+        self.custom[slot] = True
+
+    def accelerate_toward(self, movable, targetx, targety):
+        """Accelerates a movable with custom steering toward a velocity in the current pass.
+        """
+        self._command(movable, VELOCITY, targetx, targety)
+
+    def accelerate_toward_point(self, movable, targetx, targety, decelerate=True):
+        """Moves a movable with custom steering toward a point in the current pass.
+        """
+        self._command(movable, POINT if decelerate else POINT_NO_DECELERATION, targetx, targety)
+
+    def update(self, clock=SIM_CLOCK):
+        if self._last_updated is None:
+            # The first update only starts the movables moving, as it is their first tick too
+            self.active[:self.size] = self.used[:self.size]
+        super().update(clock)
+
+    def tick(self, now, elapsed):
+        self.step(elapsed)
+
+    def step(self, elapsed):
+        """Moves every active movable by elapsed seconds.
+        """
+        size = self.size
+        slots = numpy.flatnonzero(self.active[:size])
+        if len(slots):
+            # Ships steer once before and once after their previous position and velocity are
+            # saved, as Ship.tick and Movable.tick each update their velocity
+            with numpy.errstate(divide='ignore', invalid='ignore'):
+                self._steer(slots, elapsed)
+                for name in ('x', 'y', 'speedx', 'speedy'):
+                    array = getattr(self, name)
+                    getattr(self, name + '_prev')[slots] = array[slots]
+                self._steer(slots, elapsed)
+            # Movables removed by callbacks while steering don't move
+            slots = slots[self.used[slots]]
+            self._clamp_speed(slots)
+            self._integrate(slots, elapsed)
+            self._sync_positions(slots)
+        self.active[:size] = self.used[:size]
+
+    def _steer(self, slots, elapsed):
+        # Arrive at points, which may give new commands
+        timed = slots[~numpy.isnan(self.arrival_timer[slots])]
+        if len(timed):
+            dx = self.x[timed] - self.targetx[timed]
+            dy = self.y[timed] - self.targety[timed]
+            timed = timed[numpy.sqrt(dx ** 2 + dy ** 2) < REACHED_DEST_THRESHOLD]
+            self.arrival_timer[timed] -= elapsed
+            arrived = timed[self.arrival_timer[timed] <= 0]
+            self.arrival_timer[arrived] = numpy.nan
+            for slot in arrived.tolist():
+                movable = self.movables[slot]
+                if movable is not None:
+                    movable.move_behavior.arrived()
+
+        custom = slots[self.custom[slots]]
+        if len(custom):
+            self.steering[custom] = COAST
+            for slot in custom.tolist():
+                movable = self.movables[slot]
+                if movable is not None:
+                    movable.update_velocity(elapsed)
+
+        slots = slots[self.steering[slots] != COAST]
+        if not len(slots):
+            return
+        steering = self.steering[slots]
+        targetx = self.targetx[slots]
+        targety = self.targety[slots]
+        steer = numpy.ones(len(slots), dtype=bool)
+
+        following = steering == FOLLOW
+        if following.any():
+            speeds = numpy.array([(leader.speedx, leader.speedy) for leader in self.leaders],
+                                 dtype=float)
+            leaders = self.leader[slots[following]]
+            targetx[following] = speeds[leaders, 0]
+            targety[following] = speeds[leaders, 1]
+
+        pointing = (steering == POINT) | (steering == POINT_NO_DECELERATION)
+        if pointing.any():
+            points = slots[pointing]
+            dx = targetx[pointing] - self.x[points]
+            dy = targety[pointing] - self.y[points]
+            distance = numpy.sqrt(dx ** 2 + dy ** 2)
+            target_speed = self.max_speed[points]
+            decelerate = steering[pointing] == POINT
+            target_speed[decelerate] *= numpy.minimum(
+                1.0, distance[decelerate] / self.stopping_distance[points[decelerate]])
+            targetx[pointing] = dx * target_speed / distance
+            targety[pointing] = dy * target_speed / distance
+            # Already at the point
+            steer[pointing] = distance != 0
+
+        slots = slots[steer]
+        targetx = targetx[steer]
+        targety = targety[steer]
+        speedx = self.speedx[slots]
+        speedy = self.speedy[slots]
+        dx = targetx - speedx
+        dy = targety - speedy
+        dv = numpy.sqrt(dx ** 2 + dy ** 2)
+        max_accel = self.acceleration[slots] * elapsed
+        self.speedx[slots] = numpy.where(dv < max_accel, targetx,
+                                         numpy.where(dv != 0, speedx + dx * max_accel / dv, speedx))
+        self.speedy[slots] = numpy.where(dv < max_accel, targety,
+                                         numpy.where(dv != 0, speedy + dy * max_accel / dv, speedy))
+
+    def _clamp_speed(self, slots):
+        speedx = self.speedx[slots]
+        speedy = self.speedy[slots]
+        speed = numpy.sqrt(speedx ** 2 + speedy ** 2)
+        max_speed = self.max_speed[slots]
+        over = speed > max_speed
+        fast = slots[over]
+        self.speedx[fast] = speedx[over] * max_speed[over] / speed[over]
+        self.speedy[fast] = speedy[over] * max_speed[over] / speed[over]
+
+    def _integrate(self, slots, elapsed):
+        self.x[slots] += elapsed * (self.speedx[slots] + self.speedx_prev[slots]) / 2
+        self.y[slots] += elapsed * (self.speedy[slots] + self.speedy_prev[slots]) / 2
+
+    def _sync_positions(self, slots):
+        """Sets the movables' rects and mask rects to their rounded positions and confines or
+           destroys them at the screen edges, as AstroSprite.sync_position and check_bounds.
+        """
+        centerx = numpy.round(self.x[slots]).astype(int)
+        centery = numpy.round(self.y[slots]).astype(int)
+        offsetx = self.mask_offsetx[slots]
+        offsety = self.mask_offsety[slots]
+        mask_centerx = centerx + offsetx
+        mask_centery = centery + offsety
+        width, height = self.screen_size
+
+        confined = self.confined[slots]
+        if confined.any():
+            moved = numpy.zeros(len(slots), dtype=bool)
+            for mask_center, size, speed, bound in (
+                    (mask_centerx, self.mask_width[slots], self.speedx, width),
+                    (mask_centery, self.mask_height[slots], self.speedy, height)):
+                # Same integer arithmetic as pygame's Rect
+                low = mask_center - size // 2
+                under = confined & (low < 0)
+                over = confined & ~under & (low + size > bound)
+                mask_center[under] = size[under] // 2
+                mask_center[over] = bound - size[over] + size[over] // 2
+                speed[slots[under & (speed[slots] < 0)]] = 0
+                speed[slots[over & (speed[slots] > 0)]] = 0
+                moved |= under | over
+            if moved.any():
+                # Move the positions to the confined mask rects, as AstroSprite.update_mask_pos
+                centerx[moved] = mask_centerx[moved] - offsetx[moved]
+                centery[moved] = mask_centery[moved] - offsety[moved]
+                self.x[slots[moved]] = centerx[moved]
+                self.y[slots[moved]] = centery[moved]
+
+        offscreen = ~confined & ((mask_centerx < -OFF_SCREEN_CUTOFF) |
+                                 (mask_centerx > width + OFF_SCREEN_CUTOFF) |
+                                 (mask_centery < -OFF_SCREEN_CUTOFF) |
+                                 (mask_centery > height + OFF_SCREEN_CUTOFF))
+
+        movables = self.movables
+        for slot, x, y, mask_x, mask_y in zip(slots.tolist(), centerx.tolist(), centery.tolist(),
+                                              mask_centerx.tolist(), mask_centery.tolist()):
+            movable = movables[slot]
+            movable.rect.center = x, y
+            movable.mask_rect.center = mask_x, mask_y
+        for slot in slots[offscreen].tolist():
+            movable = movables[slot]
+            if movable is not None:
+                movable.destroy()
+
+def create_ship_kinematics(backend=KINEMATICS_BACKEND):
+    """Returns the ShipKinematics to add ships to, or None for ships to move themselves.
+    """
+    if backend == 'numpy':
+        if numpy is not None:
+            return ShipKinematics()
+        logger.warning('NumPy is not installed, using the python kinematics backend instead')
+    return None
+
+SHIP_KINEMATICS = create_ship_kinematics()
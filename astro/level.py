@@ -1,5 +1,6 @@
 from astro.configurable import Configurable
 from astro.timekeeper import Timekeeper
+from astro.sim_clock import SIM_CLOCK
 
 class Level(Configurable, Timekeeper):
     required_fields = ('name', 'waves', 'shop_items')
@@ -9,6 +10,8 @@ class Level(Configurable, Timekeeper):
         Timekeeper.__init__(self)
         self.wave_i = 0
         self.complete = False
+        # The clock the level was last updated with, which its formations are updated with too
+        self.clock = SIM_CLOCK
 
     def initialize(self):
         super().initialize()
@@ -16,10 +19,9 @@ class Level(Configurable, Timekeeper):
         self.current_formations = list()
 
     def deploy_wave(self):
-        wave_info = self.waves[self.wave_i]
-        for formation in wave_info['formations']:
+        for formation in self.wave_formations[self.wave_i]:
             self.current_formations.append(formation)
-            formation.deploy(self.screen)
+            formation.deploy(self.screen, self.clock)
             formation.wave_i = self.wave_i
 
         self.wave_i += 1
@@ -41,14 +43,22 @@ class Level(Configurable, Timekeeper):
     def reset(self):
         self.wave_i = 0
         self.complete = False
+        self.current_formations = list()
+        self._last_updated = None
+        # Deploying and moving formations changes them, so each play gets copies of the
+        # configured ones
+        self.wave_formations = list()
         for wave_info in self.waves:
             wave_info['condition'].reset()
-            for formation in wave_info['formations']:
-                formation.initialize()
+            self.wave_formations.append([formation.copy() for formation in wave_info['formations']])
 
     def start(self):
         pass
 
+    def update(self, clock=SIM_CLOCK):
+        self.clock = clock
+        super().update(clock)
+
     def tick(self, now, elapsed):
         if self.done():
             self.complete_level()
@@ -58,7 +68,7 @@ class Level(Configurable, Timekeeper):
 
         delete_indices = list()
         for i, formation in enumerate(self.current_formations):
-            formation.update()
+            formation.update(self.clock)
             if formation.ships_remaining == 0:
                 delete_indices.append(i)
 
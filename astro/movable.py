@@ -7,10 +7,13 @@ from astro.timekeeper import Timekeeper
 from astro.util import magnitude
 
 class Movable(Timekeeper):
+    # The astro.kinematics.ShipKinematics that owns the position and velocity, None if self does
+    kinematics = None
+
     def __init__(self):
         super().__init__()
-        self.x = 0
-        self.y = 0
+        self.x = self.x_prev = 0
+        self.y = self.y_prev = 0
         self.speedx = self.speedx_prev = 0
         self.speedy = self.speedy_prev = 0
 
@@ -41,6 +44,8 @@ class Movable(Timekeeper):
             self.y = starty
         self.speedx = speedx
         self.speedy = speedy
+        self.x_prev = self.x
+        self.y_prev = self.y
 
     def tick(self, now, elapsed):
         """Main function called by self.update() to update the sprite for each "tick" of the
@@ -78,7 +83,16 @@ class Movable(Timekeeper):
         self.x += elapsed * (self.speedx + self.speedx_prev) / 2
         self.y += elapsed * (self.speedy + self.speedy_prev) / 2
 
+    def draw_offset(self, alpha):
+        """Returns the (x, y) offset from the object's position to where to draw it to show it
+           at proportion alpha of the way from its position before the last tick to its current one.
+        """
+        lag = 1 - alpha
+        return round((self.x_prev - self.x) * lag), round((self.y_prev - self.y) * lag)
+
     def _update_velocity(self, elapsed):
+        self.x_prev = self.x
+        self.y_prev = self.y
         self.speedx_prev = self.speedx
         self.speedy_prev = self.speedy
         self.update_velocity(elapsed)
@@ -105,6 +119,8 @@ class Movable(Timekeeper):
     def accelerate_toward(self, elapsed, targetx, targety):
         # Accelerate towards the target velocity
         # Requires self.acceleration and self.max_speed to be defined
+        if self.kinematics is not None:
+            return self.kinematics.accelerate_toward(self, targetx, targety)
         dx = targetx - self.speedx
         dy = targety - self.speedy
         dv = magnitude(dx, dy)
@@ -119,6 +135,8 @@ class Movable(Timekeeper):
     def accelerate_toward_point(self, elapsed, targetx, targety, decelerate=True):
         # Move towards the target point
         # Requires self.acceleration and self.max_speed to be defined
+        if self.kinematics is not None:
+            return self.kinematics.accelerate_toward_point(self, targetx, targety, decelerate)
         dx = targetx - self.x
         dy = targety - self.y
 
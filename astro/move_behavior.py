@@ -54,10 +54,43 @@ class MoveBehavior(Configurable):
     def _update_velocity(self, elapsed):
         pass
 
+    def steer(self):
+        """Gives the parent ship's ShipKinematics the command to steer it by, the equivalent of
+           update_velocity for ships moved by astro.kinematics.
+        """
+
+        if self.formation:
+            self.formation.steer_ship(self.ship, self.formation_i)
+        elif self.pre_dest:
+            self.ship.kinematics.steer_point(self.ship, *self.pre_dest, arrival_time=0)
+        else:
+            self._steer()
+
+    def _steer(self):
+        # Behaviors without a command of their own have update_velocity called each tick
+        self.ship.kinematics.steer_custom(self.ship)
+
+    def arrived(self):
+        """Called by the parent ship's ShipKinematics when it arrives at the point it was steered
+           toward.
+        """
+
+        if self.pre_dest:
+            self.pre_dest = None
+            self._steer()
+        else:
+            self._arrived()
+
+    def _arrived(self):
+        pass
+
 class Idle(MoveBehavior):
     def _update_velocity(self, elapsed):
         self.ship.accelerate_toward(elapsed, 0, 0)
 
+    def _steer(self):
+        self.ship.kinematics.steer_velocity(self.ship, 0, 0)
+
 class Patrol(MoveBehavior):
     """Causes the ship to move between a series of destinations.
     """
@@ -88,6 +121,19 @@ class Patrol(MoveBehavior):
 
         self.ship.accelerate_toward_point(elapsed, *self.cur_dest)
 
+    def _steer(self):
+        if self.cur_dest is None:
+            self.cur_dest = self.next_destination()
+
+        # The kinematics keep the pause timer
+        self.ship.kinematics.steer_point(self.ship, *self.cur_dest,
+                                         arrival_time=self.pause_time or 0)
+
+    def _arrived(self):
+        # Cycle to next destination
+        self.cur_dest = self.next_destination()
+        self._steer()
+
     def next_destination(self):
         """Chooses and returns the next destination.
         """
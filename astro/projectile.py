@@ -3,13 +3,76 @@
 
 import math
 import random
+import weakref
 
 import pygame
 
 from astro.astro_sprite import AstroSprite
-from astro.image import load_image
+from astro.image import load_image, load_direction_table
+from astro.collidable import forget_collisions
 from astro import FRIENDLY_PROJECTILES, ENEMY_PROJECTILES
-from astro.util import frange, angle_distance
+from astro import projectile_batch
+
+# Maximum number of idle projectiles kept for reuse per prototype
+PROJECTILE_POOL_SIZE = 256
+
+class ProjectilePool:
+    """Recycles destroyed projectiles so firing doesn't have to copy a prototype for every shot.
+
+    Idle copies are kept in a WeakKeyDictionary keyed by the prototype they were copied from, so
+    they are garbage collected along with it (e.g. when the ship whose weapons own it is). Copies
+    only refer to their prototype weakly for the same reason.
+
+    Attributes:
+        hits (int): Number of projectiles acquired by reusing an idle copy.
+        misses (int): Number of projectiles acquired by copying the prototype.
+        max_size (int): Maximum number of idle copies kept per prototype.
+    """
+
+    def __init__(self, max_size=PROJECTILE_POOL_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        # Mapping of prototype -> list of idle copies
+        self._idle = weakref.WeakKeyDictionary()
+
+    def acquire(self, prototype):
+        """Returns a copy of prototype ready to be placed.
+        """
+        idle = self._idle.get(prototype)
+        if idle:
+            self.hits += 1
+            projectile = idle.pop()
+        else:
+            self.misses += 1
+            projectile = prototype.copy()
+            projectile.prototype = prototype
+        projectile.pooled = False
+        return projectile
+
+    def release(self, projectile):
+        """Resets a destroyed projectile and makes it available for reuse.
+        """
+        prototype = projectile.prototype
+        if prototype is None or projectile.pooled:
+            return
+        projectile.pooled = True
+        forget_collisions(projectile)
+        projectile.reset()
+        idle = self._idle.setdefault(prototype, list())
+        if len(idle) < self.max_size:
+            idle.append(projectile)
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def reset_counters(self):
+        self.hits = 0
+        self.misses = 0
+
+PROJECTILE_POOL = ProjectilePool()
 
 class Projectile(AstroSprite):
     """A projectile fired by a weapon.
@@ -19,7 +82,10 @@ class Projectile(AstroSprite):
     defaults = {"angle": 0, 'relative_to_firer_velocity': True, 'fuel_duration': None,
         "piercing": 1, 'angle_jitter': None, 'move_behavior': None, 'effects': None}
 
+    # Number of directions the sprite can face; one of astro.image.ALLOWED_DIRECTIONS
     FACING_DIRECTIONS = 8
+    direction_table = None
+    _prototype_ref = None
 
     def initialize(self):
         super().initialize()
@@ -32,19 +98,65 @@ class Projectile(AstroSprite):
             self.move_behavior = self.move_behavior.copy()
             self.move_behavior.init_ship(self)
 
+    @property
+    def prototype(self):
+        """The projectile this one was copied from by the projectile pool, or None if it wasn't
+           or the prototype no longer exists.
+        """
+        ref = self._prototype_ref
+        return ref() if ref is not None else None
+
+    @prototype.setter
+    def prototype(self, prototype):
+        self._prototype_ref = weakref.ref(prototype) if prototype is not None else None
+
+    def acquire(self):
+        """Returns a copy of this projectile to be fired, reusing a destroyed one if possible.
+        """
+        return PROJECTILE_POOL.acquire(self)
+
+    def reset(self):
+        """Restores the state a projectile changes during its flight to that of its prototype.
+        """
+        self.piercing = self.prototype.piercing
+        self.fuel_duration = self.prototype.fuel_duration
+        self.colliding_with = None
+        self.speedx_prev = self.speedy_prev = 0
+        if self.move_behavior is not None:
+            self.move_behavior.initialize()
+            self.move_behavior.init_ship(self)
+        self.load_image()
+
+    def kill(self):
+        super().kill()
+        PROJECTILE_POOL.release(self)
+
     def load_image(self):
         """Loads the image file for this object and initializes its image and rectangle
             attributes as expected by pygame.sprite.Sprite.
         """
         self.image, self.rect, self.mask, self.mask_rect, self.mask_rect_offsetx, \
-            self.mask_rect_offsety, self.mask_centroid = \
-            self._load_image(self.imagepath, directions=self.FACING_DIRECTIONS)
+            self.mask_rect_offsety = self._load_image(self.imagepath, directions=self.FACING_DIRECTIONS)
+        self.direction_table = load_direction_table(self.imagepath, self.FACING_DIRECTIONS)
+        self.facing_index = 0
 
 
-    def place(self, screen, firer, friendly, angle=None, offset=None):
-        self.firer = firer
-        # Also firing from hardpoint positions and not the center of the firer
-        self.groups = [FRIENDLY_PROJECTILES] if friendly else [ENEMY_PROJECTILES]
+    def fire(self, screen, firer, friendly, angle=None, offset=None):
+        """Fires a copy of this projectile from firer.
+
+        The copy is emitted into the projectile batch of its side if there is one that can hold it,
+        otherwise it is acquired from the projectile pool and placed as a sprite.
+        """
+        batch = projectile_batch.PROJECTILE_BATCHES.get(
+            FRIENDLY_PROJECTILES if friendly else ENEMY_PROJECTILES)
+        if batch is not None and batch.accepts(self):
+            batch.emit(self, screen, firer, angle, offset)
+        else:
+            self.acquire().place(screen, firer, friendly, angle, offset)
+
+    def launch(self, firer, friendly, angle=None, offset=None):
+        """Returns the (x, y, speedx, speedy) this projectile starts with when fired from firer.
+        """
         if angle is None:
             angle = self.angle + (180 if friendly else 0)
         if self.angle_jitter is not None:
@@ -55,11 +167,18 @@ class Projectile(AstroSprite):
         if self.relative_to_firer_velocity:
             speedx += firer.speedx
             speedy += firer.speedy
+        # Also firing from hardpoint positions and not the center of the firer
         x = firer.rect.centerx
         y = firer.rect.centery
         if offset:
             x += offset[0]
             y += offset[1]
+        return x, y, speedx, speedy
+
+    def place(self, screen, firer, friendly, angle=None, offset=None):
+        self.firer = firer
+        self.groups = [FRIENDLY_PROJECTILES] if friendly else [ENEMY_PROJECTILES]
+        x, y, speedx, speedy = self.launch(firer, friendly, angle, offset)
         super().place(screen, x, y, speedx=speedx, speedy=speedy)
 
     def collide_with_ship(self, ship):
@@ -88,28 +207,18 @@ class Projectile(AstroSprite):
         self.update_facing_direction()
 
     def update_facing_direction(self):
-        direction = math.degrees(math.atan2(self.speedy, self.speedx))
-        # Transform angle so 0 = facing down instead of right,
-        # and positive angle increasesgo counterclockwise instead of clockwise
-        direction = (90 - direction) % 360
-        angles = [(-90 + a) % 360 for a in frange(0, 360, 360 / self.FACING_DIRECTIONS)]
-        min_i, min_distance = 0, 360
-        for i, angle in enumerate(angles):
-            distance = angle_distance(direction, angle)
-            if distance < min_distance:
-                min_i, min_distance = i, distance
-        angle = angles[min_i]
-        key = self.imagepath + str(round(angle))
-
-        image, rect, mask, mask_rect, mask_rect_offsetx, mask_rect_offsety, mask_centroid = \
-            self._load_image(key)
-
-        if image is not self.image:
+        if self.direction_table is None:
+            return
+        i = self.direction_table.index(self.speedx, self.speedy)
+        if i != self.facing_index:
             # Switch images
+            self.facing_index = i
+            image, rect, mask, mask_rect, mask_rect_offsetx, mask_rect_offsety = \
+                self.direction_table.variant(i)
             center = self.rect.center
             self.image, self.rect, self.mask, self.mask_rect, self.mask_rect_offsetx, \
-                self.mask_rect_offsety, self.mask_centroid = image, rect, mask, mask_rect, mask_rect_offsetx, \
-                mask_rect_offsety, mask_centroid
+                self.mask_rect_offsety = image, rect.copy(), mask, mask_rect.copy(), \
+                mask_rect_offsetx, mask_rect_offsety
             self.rect.center = center
             self.update_mask_pos()
 
@@ -0,0 +1,372 @@
+"""Optional NumPy backend that simulates and draws dumbfire projectiles in arrays instead of as
+sprites.
+
+Projectiles without a move behavior never change velocity, facing direction or image after they
+are fired, so all they need per shot is their position, velocity and the few values that change
+when they hit something. A ProjectileBatch stores those in arrays and integrates, culls and tests
+them for collisions in vectorized passes, and the renderer draws them right above the sprites of
+their side's projectile group from the shared rotated images of their prototypes' DirectionTables.
+There is one batch per side, so that each is stepped and drawn along with its group.
+
+Hits are handled by the same collision handlers as sprite projectiles, e.g.
+Projectile.collide_with_ship, which are passed a BatchedProjectile standing in for the shot.
+
+Requires NumPy; PROJECTILE_BATCHES is empty and every projectile is a sprite if it isn't installed
+or PROJECTILE_BACKEND isn't 'numpy'.
+"""
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from astro import PROJECTILE_BACKEND, SCREEN_SIZE, OFF_SCREEN_CUTOFF, COLLIDABLE_PAIRS, \
+    FRIENDLY_PROJECTILES, ENEMY_PROJECTILES, logger
+from astro.collidable import collision_handler
+from astro.image import image_mask
+
+# Arrays holding one value per projectile, with their dtypes
+FIELDS = {'x': float,
+          'y': float,
+          'x_prev': float,
+          'y_prev': float,
+          'speedx': float,
+          'speedy': float,
+          'damage': float,
+          'piercing': float,
+          'prototype': numpy.intp if numpy is not None else None,
+          'variant': numpy.intp if numpy is not None else None,
+          'alive': bool,
+          # The object the projectile is passing through, see Projectile.collide_with_ship
+          'colliding_with': object,
+          # Tuple of the objects the projectile overlapped in the last collision check
+          'touching': object}
+
+def _target_groups(projectile_group):
+    """Returns the (group, use_mask) pairs of groups projectiles in projectile_group collide with,
+       in the order their collisions are checked.
+    """
+    targets = []
+    for group1, group2, use_mask in COLLIDABLE_PAIRS:
+        if group2 is projectile_group:
+            targets.append((group1, use_mask))
+        elif group1 is projectile_group:
+            targets.append((group2, use_mask))
+    return targets
+
+class BatchedProjectile:
+    """Stands in for a projectile of a ProjectileBatch when it is passed to collision handlers,
+       reading and writing its values in the batch's arrays.
+
+    Unlike a sprite projectile, which applies the same effect instances to every ship it hits, each
+    access of effects returns new copies of the prototype's effects. Effects such as AddVFX keep
+    state about the ship they were applied to, and the batch has nowhere to keep instances per shot.
+    """
+    __slots__ = ('batch', 'i')
+    move_behavior = None
+
+    def __init__(self, batch, i):
+        self.batch = batch
+        self.i = i
+
+    @property
+    def prototype(self):
+        return self.batch.prototypes[self.batch.prototype[self.i]]
+
+    @property
+    def damage(self):
+        return self.batch.damage[self.i].item()
+
+    @property
+    def piercing(self):
+        return self.batch.piercing[self.i].item()
+
+    @piercing.setter
+    def piercing(self, value):
+        self.batch.piercing[self.i] = value
+
+    @property
+    def colliding_with(self):
+        return self.batch.colliding_with[self.i]
+
+    @colliding_with.setter
+    def colliding_with(self, value):
+        self.batch.colliding_with[self.i] = value
+
+    @property
+    def effects(self):
+        return [effect.copy() for effect in self.prototype.effects]
+
+    def alive(self):
+        return bool(self.batch.alive[self.i])
+
+    def destroy(self):
+        self.batch.alive[self.i] = False
+
+class ProjectileBatch:
+    """Simulates the projectiles of one side that have no move behaviors as rows of NumPy arrays.
+
+    The values of the n live projectiles are stored in the first n entries of the arrays named in
+    FIELDS, which are compacted after each step to drop destroyed projectiles. Each projectile
+    refers to its prototype by index into prototypes and to the rotated image it's drawn with by
+    index into the batch's variants.
+
+    Attributes:
+        friendly (bool): Whether the projectiles were fired by the player's side.
+        group (pygame.sprite.Group): The projectile group of that side, whose collisions the
+            projectiles share and which they are drawn above.
+        prototypes (list of Projectile): Prototypes of the projectiles fired into the batch.
+        screen_size (tuple): (width, height) of the screen, beyond which projectiles are culled.
+        emitted (int): Total number of projectiles fired into the batch.
+        culled (int): Total number of projectiles dropped for going too far off screen.
+    """
+
+    def __init__(self, friendly, capacity=1024, screen_size=SCREEN_SIZE):
+        if numpy is None:
+            raise ImportError('The projectile batch requires NumPy')
+        self.friendly = friendly
+        self.group = FRIENDLY_PROJECTILES if friendly else ENEMY_PROJECTILES
+        self.screen_size = screen_size
+        self.n = 0
+        self.emitted = 0
+        self.culled = 0
+        for name, dtype in FIELDS.items():
+            setattr(self, name, numpy.zeros(capacity, dtype=dtype))
+        self.prototypes = []
+        self._prototype_index = dict()
+        # Surfaces, (width, height) and lazily built masks of the rotated images, by variant index
+        self._variant_index = dict()
+        self._images = []
+        self._masks = []
+        self._sizes = numpy.zeros((0, 2), dtype=int)
+        self._targets = _target_groups(self.group)
+
+    def __len__(self):
+        return self.n
+
+    def clear(self):
+        """Drops all projectiles, prototypes and images.
+        """
+        self.n = 0
+        self.colliding_with[:] = None
+        self.touching[:] = None
+        self.prototypes = []
+        self._prototype_index.clear()
+        self._variant_index.clear()
+        self._images = []
+        self._masks = []
+        self._sizes = numpy.zeros((0, 2), dtype=int)
+
+    def accepts(self, prototype):
+        """Returns whether projectiles of a prototype can be fired into the batch, i.e. whether
+           they fly straight.
+        """
+        return prototype.move_behavior is None
+
+    def _grow(self):
+        for name in FIELDS:
+            array = getattr(self, name)
+            setattr(self, name, numpy.concatenate([array, numpy.zeros_like(array)]))
+
+    def _prototype_i(self, prototype):
+        i = self._prototype_index.get(id(prototype))
+        if i is None:
+            i = self._prototype_index[id(prototype)] = len(self.prototypes)
+            self.prototypes.append(prototype)
+        return i
+
+    def _variant_i(self, prototype, speedx, speedy):
+        """Returns the index of the image a projectile of prototype is drawn with when flying at a
+           velocity, adding it to the variants the first time.
+        """
+        table = prototype.direction_table
+        if table is None:
+            key = (id(prototype), 0)
+        else:
+            key = (table.key, table.index(speedx, speedy))
+        i = self._variant_index.get(key)
+        if i is None:
+            if table is None:
+                image = prototype.image
+            else:
+                image = table.variant(key[1]).image
+            i = self._variant_index[key] = len(self._images)
+            self._images.append(image)
+            self._masks.append(None)
+            self._sizes = numpy.concatenate([self._sizes, [image.get_size()]])
+        return i
+
+    def emit(self, prototype, screen, firer, angle=None, offset=None):
+        """Fires a projectile of prototype from firer into the batch, see Projectile.place.
+        """
+        x, y, speedx, speedy = prototype.launch(firer, self.friendly, angle, offset)
+        x, y = round(x), round(y)
+        if self.n == len(self.x):
+            self._grow()
+        i = self.n
+        self.n += 1
+        self.emitted += 1
+        self.screen_size = screen.screen_size
+        self.x[i] = self.x_prev[i] = x
+        self.y[i] = self.y_prev[i] = y
+        self.speedx[i] = speedx
+        self.speedy[i] = speedy
+        self.damage[i] = prototype.damage
+        self.piercing[i] = prototype.piercing
+        self.prototype[i] = self._prototype_i(prototype)
+        self.variant[i] = self._variant_i(prototype, speedx, speedy)
+        self.alive[i] = True
+        self.colliding_with[i] = None
+        self.touching[i] = None
+
+    def _rects(self, n, x, y):
+        """Returns the left, top, right and bottom arrays of the rects of the first n projectiles
+           centered at x and y, rounded like AstroSprite.sync_position.
+        """
+        sizes = self._sizes[self.variant[:n]]
+        width, height = sizes[:, 0], sizes[:, 1]
+        left = numpy.round(x) - width // 2
+        top = numpy.round(y) - height // 2
+        return left, top, left + width, top + height
+
+    def step(self, elapsed):
+        """Moves every projectile by its velocity and drops those that went too far off screen or
+           were destroyed.
+        """
+        n = self.n
+        if not n:
+            return
+        x, y = self.x[:n], self.y[:n]
+        self.x_prev[:n] = x
+        self.y_prev[:n] = y
+        x += elapsed * self.speedx[:n]
+        y += elapsed * self.speedy[:n]
+
+        width, height = self.screen_size
+        off_screen = (x < -OFF_SCREEN_CUTOFF) | (x > width + OFF_SCREEN_CUTOFF) | \
+            (y < -OFF_SCREEN_CUTOFF) | (y > height + OFF_SCREEN_CUTOFF)
+        alive = self.alive[:n]
+        self.culled += numpy.count_nonzero(alive & off_screen)
+        alive &= ~off_screen
+        self._compact()
+
+    def _compact(self):
+        n = self.n
+        keep = numpy.flatnonzero(self.alive[:n])
+        if len(keep) == n:
+            return
+        for name in FIELDS:
+            array = getattr(self, name)
+            array[:len(keep)] = array[keep]
+        # Don't keep objects referenced from the unused entries alive
+        self.colliding_with[len(keep):n] = None
+        self.touching[len(keep):n] = None
+        self.n = len(keep)
+
+    def _mask(self, variant):
+        mask = self._masks[variant]
+        if mask is None:
+            mask = self._masks[variant] = image_mask(self._images[variant])
+        return mask
+
+    def collide(self):
+        """Tests every projectile against the groups the batch's projectile group collides with,
+           handling hits like check_collisions does for sprite projectiles.
+
+        Candidates are found by testing the rects of all projectiles against each target at once;
+        only those are then tested with masks, if the groups collide using masks, and handled one
+        by one in Python.
+        """
+        n = self.n
+        if not n:
+            return
+        left, top, right, bottom = self._rects(n, self.x[:n], self.y[:n])
+        touching = dict()
+        for group, use_mask in self._targets:
+            for target in group.sprites():
+                rect = target.rect
+                hits = numpy.flatnonzero((left < rect.right) & (right > rect.left) &
+                                         (top < rect.bottom) & (bottom > rect.top))
+                if len(hits):
+                    self._hit(target, hits, left, top, use_mask, touching)
+
+        self._stop_touching(touching)
+        self._compact()
+
+    def _hit(self, target, hits, left, top, use_mask, touching):
+        prototypes = self.prototypes
+        prototype_indices = self.prototype[hits].tolist()
+        for i, prototype_i in zip(hits.tolist(), prototype_indices):
+            if not self.alive[i] or not target.alive():
+                continue
+            if use_mask:
+                offset = (int(left[i]) - target.rect.x, int(top[i]) - target.rect.y)
+                if target.mask.overlap(self._mask(self.variant[i]), offset) is None:
+                    continue
+            touching.setdefault(i, []).append(target)
+            handler = collision_handler(target.__class__, prototypes[prototype_i].__class__)
+            if handler is not None:
+                function, swapped = handler
+                if swapped:
+                    function(BatchedProjectile(self, i), target)
+                else:
+                    function(target, BatchedProjectile(self, i))
+
+    def _stop_touching(self, touching):
+        """Notifies the objects live projectiles no longer overlap, like check_collisions does.
+        """
+        previous = self.touching[:self.n]
+        for i in numpy.flatnonzero(previous != None).tolist(): # pylint:disable=singleton-comparison
+            now = touching.get(i, ())
+            for target in previous[i]:
+                if target not in now and self.alive[i]:
+                    handler = collision_handler(target.__class__,
+                                                self.prototypes[self.prototype[i]].__class__, True)
+                    if handler is not None:
+                        function, swapped = handler
+                        if swapped:
+                            function(BatchedProjectile(self, i), target)
+                        else:
+                            function(target, BatchedProjectile(self, i))
+        previous[:] = None
+        for i, targets in touching.items():
+            previous[i] = tuple(targets)
+
+    def blit_sequence(self, surface_rect, interpolation=None):
+        """Returns the (image, position) pairs to draw the projectiles on a surface with, skipping
+           those outside surface_rect.
+
+        Args:
+            surface_rect (pygame.Rect): Rect of the surface to draw onto.
+            interpolation (float): Proportion of the way from the projectiles' previous positions
+                to their current ones to draw them at, see Movable.draw_offset, or None to draw
+                them at their current positions.
+        """
+        n = self.n
+        if not n:
+            return []
+        x, y = self.x[:n], self.y[:n]
+        left, top, right, bottom = self._rects(n, x, y)
+        if interpolation is not None:
+            lag = 1 - interpolation
+            dx = numpy.round((self.x_prev[:n] - x) * lag)
+            dy = numpy.round((self.y_prev[:n] - y) * lag)
+            left, top, right, bottom = left + dx, top + dy, right + dx, bottom + dy
+        visible = numpy.flatnonzero((left < surface_rect.right) & (right > surface_rect.left) &
+                                    (top < surface_rect.bottom) & (bottom > surface_rect.top))
+        images = self._images
+        return list(zip([images[i] for i in self.variant[visible].tolist()],
+                        zip(left[visible].astype(int).tolist(), top[visible].astype(int).tolist())))
+
+def create_projectile_batches(backend=PROJECTILE_BACKEND):
+    """Returns a mapping of each projectile group to the batch for its side, empty for all
+       projectiles to be sprites.
+    """
+    if backend == 'numpy':
+        if numpy is not None:
+            return {FRIENDLY_PROJECTILES: ProjectileBatch(True),
+                    ENEMY_PROJECTILES: ProjectileBatch(False)}
+        logger.warning('NumPy is not installed, using the python projectile backend instead')
+    return dict()
+
+PROJECTILE_BATCHES = create_projectile_batches()
@@ -1,13 +1,11 @@
 """Implements a class for shields.
 """
-import time
 
-import pygame
-
-from astro import FRIENDLY_SHIELDS, ENEMY_SHIELDS, FRIENDLY_SHIPS
+from astro import FRIENDLY_SHIELDS, ENEMY_SHIELDS, FRIENDLY_SHIPS, SHIELD_ALPHA_LEVELS
 from astro.astro_sprite import FollowSprite
 from astro.item import TimekeeperItem
-from astro.image import generate_rect_and_mask
+from astro.image import load_ellipse, alpha_frames
+from astro.sim_clock import SIM_CLOCK
 
 class Shield(FollowSprite, TimekeeperItem):
     """A ship-mounted weapon.
@@ -46,28 +44,41 @@ class Shield(FollowSprite, TimekeeperItem):
         Returns the amount of damage absorbed.
         """
 
+        self.integrity = max(0, self.integrity - damage_amount)
+
         if damage_amount > 0:
-            self.last_damaged = time.time()
+            self.last_damaged = SIM_CLOCK.now
             self.is_recharging = False
-
-        self.integrity = max(0, self.integrity - damage_amount)
+            self.owner.damaged()
 
     def _load_image(self, *args, **kwargs):
         if self.imagepath is not None:
             return super()._load_image(*args, **kwargs)
         else:
             sizex, sizey = self.owner.rect.size
-            sizex += self.size_delta
-            sizey += self.size_delta
-            image = pygame.Surface((sizex, sizey), flags=pygame.SRCALPHA)
-            color = tuple(self.color) + (self.max_alpha,)
-            pygame.draw.ellipse(image, color, image.get_rect())
-            return (image,) + generate_rect_and_mask(image)
+            return load_ellipse((sizex + self.size_delta, sizey + self.size_delta),
+                                tuple(self.color) + (self.max_alpha,))
+
+    def load_image(self):
+        super().load_image()
+        # Shared copies of the image at each alpha level, as the image itself may be shared
+        self.alpha_frames = alpha_frames(self.image, SHIELD_ALPHA_LEVELS)
+        self.alpha_level = None
+        self.update_alpha()
+
+    def update_alpha(self):
+        """Sets the image's alpha proportional to integrity, rounded to one of
+           SHIELD_ALPHA_LEVELS levels.
+        """
+        level = round(self.integrity_proportion * SHIELD_ALPHA_LEVELS)
+        if level != self.alpha_level:
+            self.alpha_level = level
+            self.image = self.alpha_frames[level]
 
     def initialize(self):
         # super().initialize()
         self.integrity = self.capacity
-        self.last_damaged = time.time()
+        self.last_damaged = SIM_CLOCK.now
 
     def place(self, screen, owner):
         self.integrity = self.capacity
@@ -97,6 +108,5 @@ class Shield(FollowSprite, TimekeeperItem):
             if self.integrity == self.capacity:
                 self.is_recharging = False
 
-        # Set alpha proportional to integrity
-        self.image.set_alpha(int(255 * self.integrity_proportion))
+        self.update_alpha()
         super().tick(now, elapsed)
\ No newline at end of file
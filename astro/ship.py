@@ -3,18 +3,23 @@
 
 import math
 import heapq
+import weakref
 
 import pygame
 
 import astro
-from astro import FRIENDLY_SHIPS, ENEMY_SHIPS, ENEMY_HEALTHBARS
-from astro.image import load_image
+from astro import FRIENDLY_SHIPS, ENEMY_SHIPS, ENEMY_HEALTHBARS, kinematics
+from astro.image import load_image, convert_for_display, IMAGE_CACHE, CachedImage, \
+    generate_rect_and_mask
 from astro.astro_sprite import AstroSprite
 from astro.healthbar import Healthbar
 from astro.explosion import Explosion
 from astro.weapon import Weapon
 from astro.shield import Shield
 
+# Mapping of image -> number of pixels in its collision mask, kept for as long as the image is
+SHIP_MASSES = weakref.WeakKeyDictionary()
+
 class Ship(AstroSprite):
     required_fields = ('imagepath', 'acceleration', 'max_speed', 'weapons', 'max_hp')
     defaults = AstroSprite.defaults.copy()
@@ -30,15 +35,23 @@ class Ship(AstroSprite):
         self.timed_effects = list()
 
     def calculate_mass(self):
-        return self.mask.count()
+        mass = SHIP_MASSES.get(self._mask_image)
+        if mass is None:
+            mass = SHIP_MASSES[self._mask_image] = self.mask.count()
+        return mass
 
     def destroy(self):
         super().destroy()
         self.explode()
 
+    def kill(self):
+        super().kill()
+        if self.kinematics is not None:
+            self.kinematics.remove(self)
+
     def explode(self):
         explosion = Explosion(self)
-        explosion.place(self.screen, self.rect.centerx, self.rect.centery, self.speedx, self.speedy)
+        explosion.place(self.screen, self.rect.centerx, self.rect.centery)
 
     def initialize(self):
         super().initialize()
@@ -55,14 +68,24 @@ class Ship(AstroSprite):
     def load_image(self):
         super().load_image()
 
-        # Optionally, load the engine glow image
+        # Optionally, composite the engine glow image. The result is shared by all ships using the
+        # same images through the image cache, and composited again if it was evicted.
         if self.engine_glow_imagepath is not None:
-            self.static_image = self.image
-            engine_glow = load_image(self.engine_glow_imagepath)[0]
-            if self.inverted:
-                engine_glow = pygame.transform.flip(engine_glow, False, True)
-            self.moving_image = self.image.copy()
-            self.moving_image.blit(engine_glow, (0, 0))
+            key = ('moving', self.imagepath, self.engine_glow_imagepath, self.inverted)
+            cached = IMAGE_CACHE.get(key)
+            if cached is None:
+                # RLE encoded alpha images only blend correctly onto opaque surfaces, so use an
+                # unencoded copy of the glow
+                engine_glow = load_image(self.engine_glow_imagepath, self.inverted)[0].copy()
+                engine_glow.set_alpha(None)
+                # Composite onto a transparent surface, since the static image may use a colorkey
+                moving_image = pygame.Surface(self.image.get_size(), flags=pygame.SRCALPHA)
+                moving_image.blit(self.image, (0, 0))
+                moving_image.blit(engine_glow, (0, 0))
+                moving_image = convert_for_display(moving_image, key)
+                cached = IMAGE_CACHE[key] = CachedImage(moving_image,
+                                                        *generate_rect_and_mask(moving_image))
+            self.static_image, self.moving_image = self.image, cached.image
         else:
             self.moving_image, self.static_image = None, None
 
@@ -80,10 +103,15 @@ class Ship(AstroSprite):
         if self.mass is None:
             self.mass = self.calculate_mass()
 
+        if kinematics.SHIP_KINEMATICS is not None:
+            kinematics.SHIP_KINEMATICS.add(self)
+
     def tick(self, now, elapsed):
-        self.update_velocity(elapsed)
+        # Ships added to a ShipKinematics are moved by its step instead
+        if self.kinematics is None:
+            self.update_velocity(elapsed)
 
-        super().tick(now, elapsed)
+            super().tick(now, elapsed)
 
         # Check timed effects
         while self.timed_effects and self.timed_effects[0][0] < now:
@@ -103,6 +131,13 @@ class Ship(AstroSprite):
             self.hp -= damage_amount
             if self.hp <= 0:
                 self.destroy()
+            elif damage_amount > 0:
+                self.damaged()
+
+    def damaged(self):
+        """Called when the ship or its shield takes damage without being destroyed.
+        """
+        pass
 
     def collide_with_ship(self, other):
         return self.collide_with_mass(other)
@@ -205,8 +240,9 @@ class EnemyShip(Ship):
         super().destroy()
         if self.big_health_bar:
             astro.HUD.big_health_bar_ship = None
-        if ENEMY_HEALTHBARS and self.enable_small_health_bar:
+        if self.healthbar is not None:
             self.healthbar.destroy()
+            self.healthbar = None
 
     def initialize(self):
         super().initialize()
@@ -217,10 +253,16 @@ class EnemyShip(Ship):
     def place(self, *args, **kwargs):
         super().place(*args, **kwargs)
         self.move_behavior.init_ship(self)
+        if self.kinematics is not None:
+            self.move_behavior.steer()
         self.fire_behavior.init_ship(self)
         if self.big_health_bar:
             astro.HUD.big_health_bar_ship = self
-        if ENEMY_HEALTHBARS and self.enable_small_health_bar:
+        # The small healthbar is only shown once the ship takes damage
+        self.healthbar = None
+
+    def damaged(self):
+        if self.healthbar is None and ENEMY_HEALTHBARS and self.enable_small_health_bar:
             self.healthbar = Healthbar(self)
 
     def become_friendly(self):
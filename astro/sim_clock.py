@@ -0,0 +1,117 @@
+"""Defines the clock that simulation time is read from.
+
+The clock is advanced by the game screen and passed to the update of every Timekeeper, so
+everything updated in the same simulation step sees the same time. Simulation time can be paused
+and run faster or slower than real time.
+
+The game runs the simulation in fixed steps: real time is accumulated each frame and spent on as
+many whole steps as fit, so the cost and behaviour of the simulation don't depend on the frame rate.
+"""
+
+from astro import SIM_RATE, MAX_SIM_STEPS
+
+class SimClock:
+    """Simulation time, advanced in steps of real elapsed time.
+
+    Attributes:
+        now (float): The current simulation time in seconds.
+        elapsed (float): The simulation time in seconds that the last step advanced the clock by.
+        time_scale (float): Simulation seconds that pass per real second.
+        paused (bool): Whether simulation time is stopped.
+        frame (int): The number of steps that advanced the clock.
+        step_size (float): Simulation seconds per fixed step.
+        max_steps (int): Maximum number of fixed steps to run for one frame.
+        accumulator (float): Simulation seconds accumulated but not yet spent on fixed steps.
+        dropped (float): Total simulation seconds dropped because a frame needed more than
+            max_steps steps.
+    """
+
+    def __init__(self, start=0.0, time_scale=1.0, step_size=1 / SIM_RATE, max_steps=MAX_SIM_STEPS):
+        self.now = start
+        self.elapsed = 0.0
+        self.time_scale = time_scale
+        self.paused = False
+        self.frame = 0
+        self.step_size = step_size
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+        self.dropped = 0.0
+
+    def advance(self, real_elapsed):
+        """Advances the clock by an amount of real time, scaled by time_scale.
+
+        Args:
+            real_elapsed (float): Real time in seconds since the clock was last advanced.
+
+        Returns:
+            The simulation time in seconds the clock was advanced by, 0 if it is paused.
+        """
+        if self.paused:
+            self.elapsed = 0.0
+        else:
+            self.elapsed = real_elapsed * self.time_scale
+            self.now += self.elapsed
+            self.frame += 1
+        return self.elapsed
+
+    def accumulate(self, real_elapsed):
+        """Adds an amount of real time, scaled by time_scale, to the accumulator.
+
+        If more than max_steps steps are due, the excess time is dropped, so that a slow frame
+        can't cause ever more steps to be run the following frames.
+
+        Args:
+            real_elapsed (float): Real time in seconds since time was last accumulated.
+
+        Returns:
+            The number of fixed steps to run now, each preceded by a call to step().
+        """
+        if self.paused:
+            return 0
+        self.accumulator += real_elapsed * self.time_scale
+        steps = int(self.accumulator / self.step_size)
+        if steps > self.max_steps:
+            self.dropped += self.accumulator - self.max_steps * self.step_size
+            self.accumulator = self.max_steps * self.step_size
+            steps = self.max_steps
+        return steps
+
+    def step(self):
+        """Advances the clock by one fixed step out of the accumulator.
+        """
+        self.accumulator = max(self.accumulator - self.step_size, 0.0)
+        self.elapsed = self.step_size
+        self.now += self.step_size
+        self.frame += 1
+
+    @property
+    def interpolation(self):
+        """The proportion of the next fixed step that has accumulated, between 0 and 1.
+        """
+        return min(self.accumulator / self.step_size, 1.0)
+
+    def discard_accumulated(self):
+        """Drops real time accumulated but not yet spent on steps, e.g. before a new game screen
+           starts running the simulation.
+        """
+        self.accumulator = 0.0
+
+    def reset(self, start=0.0):
+        """Sets the clock back to a start time, forgetting its steps and accumulated time.
+        """
+        self.now = start
+        self.elapsed = 0.0
+        self.frame = 0
+        self.accumulator = 0.0
+        self.dropped = 0.0
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+
+    def toggle_pause(self):
+        self.paused = not self.paused
+
+SIM_CLOCK = SimClock()
@@ -0,0 +1,94 @@
+"""Uniform-grid spatial hash used as a broadphase for sprite collision checks.
+
+Each sprite group is bucketed into square cells of a fixed size once per frame, so that collision
+queries between two groups only have to test sprites that share at least one cell instead of
+testing every possible pair.
+"""
+
+from astro import COLLISION_CELL_SIZE
+
+class SpatialHash:
+    """Buckets the sprites of one or more groups into grid cells by their rects.
+
+    Attributes:
+        cell_size (int): Width and height in pixels of each grid cell.
+    """
+
+    def __init__(self, cell_size=COLLISION_CELL_SIZE):
+        self.cell_size = cell_size
+        # Mapping of group -> {(cell x, cell y): [sprites]}
+        self.cells = dict()
+        # Mapping of group -> {sprite: index in group iteration order}
+        self.order = dict()
+
+    def clear(self):
+        self.cells.clear()
+        self.order.clear()
+
+    def _cell_range(self, rect):
+        size = self.cell_size
+        left = rect.left // size
+        top = rect.top // size
+        # Zero-size rects still occupy the cell containing their top left corner
+        right = max(rect.right - 1, rect.left) // size
+        bottom = max(rect.bottom - 1, rect.top) // size
+        return range(left, right + 1), range(top, bottom + 1)
+
+    def rebuild(self, groups):
+        """Rebuilds the hash from scratch from the current positions of sprites in groups.
+        """
+        self.clear()
+        for group in groups:
+            self.insert_group(group)
+
+    def insert_group(self, group):
+        cells = self.cells[group] = dict()
+        order = self.order[group] = dict()
+        size = self.cell_size
+        for i, sprite in enumerate(group):
+            order[sprite] = i
+            rect = sprite.rect
+            left = rect.left // size
+            top = rect.top // size
+            right = max(rect.right - 1, rect.left) // size
+            bottom = max(rect.bottom - 1, rect.top) // size
+            if left == right and top == bottom:
+                # Fast path for sprites that fit inside a single cell
+                cells.setdefault((left, top), []).append(sprite)
+            else:
+                for cx in range(left, right + 1):
+                    for cy in range(top, bottom + 1):
+                        cells.setdefault((cx, cy), []).append(sprite)
+
+    def spritecollide(self, sprite, group):
+        """Equivalent of pygame.sprite.spritecollide(sprite, group, False) using the hash.
+
+        Colliding sprites are returned in the same order as they appear in group.
+        """
+        cells = self.cells[group]
+        if not cells:
+            return []
+        xs, ys = self._cell_range(sprite.rect)
+        colliderect = sprite.rect.colliderect
+        found = dict()
+        for cx in xs:
+            for cy in ys:
+                for other in cells.get((cx, cy), ()):
+                    if other not in found:
+                        found[other] = colliderect(other.rect) and other in group
+        crashed = [other for other, collided in found.items() if collided]
+        if len(crashed) > 1:
+            crashed.sort(key=self.order[group].__getitem__)
+        return crashed
+
+    def groupcollide(self, group1, group2):
+        """Equivalent of pygame.sprite.groupcollide(group1, group2, False, False) using the hash.
+        """
+        crashed = dict()
+        if not self.cells[group2]:
+            return crashed
+        for sprite in group1:
+            collision = self.spritecollide(sprite, group2)
+            if collision:
+                crashed[sprite] = collision
+        return crashed
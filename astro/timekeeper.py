@@ -2,14 +2,14 @@
    since their last update.
 """
 
-import time
+from astro.sim_clock import SIM_CLOCK
 
 class Timekeeper:
     def __init__(self):
         self._last_updated = None
 
-    def _tick(self):
-        now = time.time()
+    def _tick(self, clock=SIM_CLOCK):
+        now = clock.now
         if self._last_updated is not None:
             elapsed = now - self._last_updated
             self.tick(now, elapsed)
@@ -19,12 +19,12 @@ class Timekeeper:
         """Overridable method to be called once each "tick" of the game simulation.
 
         Args:
-            now (float): The current timestamp
+            now (float): The current simulation time
             elapsed (float): The time in fractional seconds since the object was last updated.
         """
         raise NotImplementedError
 
-    def update(self):
-        """Called by pygame.sprite.Group.update.
+    def update(self, clock=SIM_CLOCK):
+        """Called by pygame.sprite.Group.update, which passes on the SimClock it is called with.
         """
-        self._tick()
+        self._tick(clock)
@@ -1,15 +1,29 @@
-import pygame
-
 from astro import FRONT_VFX, BACK_VFX
-from astro.astro_sprite import FollowSprite
-from astro.image import generate_rect_and_mask
+from astro.configurable import Configurable
+from astro.visual_sprite import VisualSprite
+from astro.image import load_image, load_ellipse
+
+class VFX(Configurable, VisualSprite):
+    """Visual effect drawn over or under a ship.
+
+    Attributes:
+        above (bool): Whether to draw the effect above ships rather than below them.
+        imagepath (str): Path to the effect's image file, within the assets directory.
+    """
+    required_fields = ('imagepath', 'above')
 
-class VFX(FollowSprite):
-    required_fields = FollowSprite.required_fields + ('above',)
+    def __init__(self, key):
+        Configurable.__init__(self, key)
+        VisualSprite.__init__(self)
 
     def place(self, screen, owner):
         self.groups = [FRONT_VFX] if self.above else [BACK_VFX]
-        super().place(screen, owner)
+        self.image = self._load_image(owner)
+        self.rect = self.image.get_rect()
+        self.follow(screen, owner)
+
+    def _load_image(self, owner):
+        return load_image(self.imagepath)[0]
 
 class CircleVFX(VFX):
     defaults = VFX.defaults.copy()
@@ -18,13 +32,7 @@ class CircleVFX(VFX):
                      'imagepath': None,
                      'size_delta': 0})
 
-    deferred_image_load = True
-
-    def _load_image(self, *args, **kwargs):
-        sizex, sizey = self.owner.rect.size
-        sizex += self.size_delta
-        sizey += self.size_delta
-        image = pygame.Surface((sizex, sizey), flags=pygame.SRCALPHA)
-        color = tuple(self.color) + (self.alpha,)
-        pygame.draw.ellipse(image, color, image.get_rect())
-        return (image,) + generate_rect_and_mask(image)
\ No newline at end of file
+    def _load_image(self, owner):
+        sizex, sizey = owner.rect.size
+        return load_ellipse((sizex + self.size_delta, sizey + self.size_delta),
+                            tuple(self.color) + (self.alpha,))[0]
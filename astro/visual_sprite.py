@@ -0,0 +1,57 @@
+"""Defines a lightweight superclass for purely cosmetic sprites, e.g. explosions and visual effects.
+"""
+
+import pygame
+
+from astro.timekeeper import Timekeeper
+
+class VisualSprite(Timekeeper, pygame.sprite.Sprite):
+    """Sprite that is only drawn: it doesn't collide, move by itself or check the screen bounds.
+
+    It can optionally follow another sprite, staying centered on it and being destroyed with it.
+
+    Attributes:
+        groups (list of pygame.sprite.Group): Sprite groups to add this sprite to when placed.
+        image (pygame.Surface): The sprite's image.
+        rect (pygame.Rect): Where the image is drawn.
+        owner (AstroSprite): The sprite being followed, or None.
+    """
+    groups = []
+
+    def __init__(self):
+        pygame.sprite.Sprite.__init__(self)
+        Timekeeper.__init__(self)
+        self.owner = None
+
+    def place(self, screen, x, y):
+        """Adds this sprite to its groups with its image centered on (x, y).
+        """
+        self._last_updated = None
+        self.screen = screen
+        self.rect.center = round(x), round(y)
+        self.add(*self.groups)
+
+    def follow(self, screen, owner):
+        """Places this sprite centered on owner, keeping it there until either is destroyed.
+        """
+        self.owner = owner
+        owner.follow_sprites.add(self)
+        # Subclasses that follow another sprite tend to take the owner in place()
+        VisualSprite.place(self, screen, *owner.rect.center)
+
+    def destroy(self):
+        self.kill()
+        if self.owner is not None:
+            self.owner.follow_sprites.discard(self)
+            self.owner = None
+
+    def tick(self, now, elapsed):
+        if self.owner is not None:
+            self.rect.center = self.owner.rect.center
+
+    def draw_offset(self, alpha):
+        """Returns the offset to draw the sprite at between ticks, that of the owner if any.
+        """
+        if self.owner is not None:
+            return self.owner.draw_offset(alpha)
+        return 0, 0
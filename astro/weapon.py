@@ -37,7 +37,7 @@ class Weapon(TimekeeperItem):
     def fire(self, now):
         """Fires the weapon.
 
-        Creates a new instance of the weapon's projectile
+        Fires a copy of each of the weapon's projectiles, see Projectile.fire.
         """
 
         if self.FireBehavior is not None:
@@ -45,9 +45,8 @@ class Weapon(TimekeeperItem):
         else:
             friendly = self.owner in FRIENDLY_SHIPS
             for i, projectile in enumerate(self.projectiles):
-                projectile = projectile.copy()
                 offset = self.determine_projectile_offset(i)
-                projectile.place(self.owner.screen, firer=self.owner, friendly=friendly,
+                projectile.fire(self.owner.screen, firer=self.owner, friendly=friendly,
                     offset=offset)
         self.last_fired = now
 
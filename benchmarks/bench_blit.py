@@ -0,0 +1,62 @@
+"""Reports how each image asset was converted for display and compares its blit time with that of
+a plain convert_alpha copy.
+
+Usage: python benchmarks/bench_blit.py [blits]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+# Keep processed images out of the user's own disk cache
+os.environ.setdefault('ASTRO_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'astro2-benchmarks'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from astro import SCREEN_SIZE, ASSET_DIR
+from astro.image import CONVERSIONS, load_image, conversion_report
+
+def time_blits(screen, image, blits):
+    width, height = SCREEN_SIZE
+    best = None
+    for attempt in range(5):
+        start = time.perf_counter()
+        for i in range(blits):
+            screen.blit(image, (i * 7 % width, i * 13 % height))
+        elapsed = (time.perf_counter() - start) / blits
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    blits = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+
+    rel_paths = []
+    for dirpath, dirnames, filenames in os.walk(ASSET_DIR):
+        for filename in sorted(filenames):
+            if filename.endswith('.png'):
+                rel_paths.append(os.path.relpath(os.path.join(dirpath, filename), ASSET_DIR))
+    rel_paths.sort()
+
+    total_before = total_after = 0
+    for rel_path in rel_paths:
+        image = load_image(rel_path)[0]
+        plain = pygame.image.load(os.path.join(ASSET_DIR, rel_path)).convert_alpha()
+        before = time_blits(screen, plain, blits)
+        after = time_blits(screen, image, blits)
+        total_before += before
+        total_after += after
+        print(f'{rel_path:<36} {CONVERSIONS[rel_path]:<10} convert_alpha: {before * 1e6:6.2f} us  '
+              f'converted: {after * 1e6:6.2f} us  ({before / after:.2f}x)')
+    print(f'{"all":<36} {"":<10} convert_alpha: {total_before * 1e6:6.2f} us  '
+          f'converted: {total_after * 1e6:6.2f} us  ({total_before / total_after:.2f}x)')
+
+    for path, names in sorted(conversion_report().items()):
+        print(f'{path}: {len(names)} images')
+
+if __name__ == '__main__':
+    main()
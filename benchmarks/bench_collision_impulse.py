@@ -0,0 +1,60 @@
+"""Compares the closed-form collision impulse against the previous numerical solver.
+
+Usage: python benchmarks/bench_collision_impulse.py
+"""
+
+import os
+import sys
+import math
+import random
+import timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from astro.util import magnitude, binary_search
+from astro.collidable import collision_impulse
+
+def numerical_impulse(mass1, speed1, mass2, speed2, ax, ay):
+    """The doubling + binary search solver previously used by Collidable.collide_with_mass.
+    """
+    tke = 0.5 * mass1 * magnitude(*speed1) ** 2 + 0.5 * mass2 * magnitude(*speed2) ** 2
+    def v1f(F):
+        return speed1[0] + F * ax / mass1, speed1[1] + F * ay / mass1
+    def v2f(F):
+        return speed2[0] - F * ax / mass2, speed2[1] - F * ay / mass2
+    def d_tke(F):
+        return tke - (0.5 * mass1 * magnitude(*v1f(F)) ** 2 + \
+                      0.5 * mass2 * magnitude(*v2f(F)) ** 2)
+    i = 1
+    while True:
+        if d_tke(2 << i) < 0:
+            return binary_search(d_tke, 2 << (i - 1), 2 << i, 1, True)
+        i += 1
+
+def random_collisions(n, rng):
+    collisions = list()
+    while len(collisions) < n:
+        angle = rng.uniform(0, 2 * math.pi)
+        args = (rng.uniform(500, 5000), (rng.uniform(-400, 400), rng.uniform(-400, 400)),
+                rng.uniform(500, 5000), (rng.uniform(-400, 400), rng.uniform(-400, 400)),
+                math.cos(angle), math.sin(angle))
+        # Only keep collisions that push the objects apart, as collide_with_mass ensures
+        if collision_impulse(*args) > 100:
+            collisions.append(args)
+    return collisions
+
+def main():
+    collisions = random_collisions(1000, random.Random(0))
+
+    max_error = max(abs(numerical_impulse(*args) - collision_impulse(*args)) /
+                    collision_impulse(*args) for args in collisions)
+    print(f'Max relative difference: {max_error:.2e}')
+
+    for name, func in [('numerical', numerical_impulse), ('closed form', collision_impulse)]:
+        elapsed = min(timeit.repeat(lambda: [func(*args) for args in collisions],
+                                    number=1, repeat=5))
+        print(f'{name:>12}: {elapsed / len(collisions) * 1e6:8.2f} us per collision')
+
+if __name__ == '__main__':
+    main()
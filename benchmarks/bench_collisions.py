@@ -0,0 +1,63 @@
+"""Compares the spatial hash collision broadphase against pygame.sprite.groupcollide, and the
+choice between them that check_collisions makes, see COLLISION_BROADPHASE_MIN_SIZE.
+
+Usage: python benchmarks/bench_collisions.py [cell size]
+"""
+
+import os
+import sys
+import random
+import timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from astro import SCREEN_SIZE, COLLISION_CELL_SIZE
+from astro import collidable
+from astro.spatial_hash import SpatialHash
+
+SPRITE_COUNTS = [10, 100, 200, 500, 700, 1000, 2000, 5000]
+
+def make_group(n, rng, size):
+    group = pygame.sprite.Group()
+    for i in range(n):
+        sprite = pygame.sprite.Sprite()
+        sprite.rect = pygame.Rect(rng.randint(0, SCREEN_SIZE[0]), rng.randint(0, SCREEN_SIZE[1]),
+                                  size, size)
+        group.add(sprite)
+    return group
+
+def main():
+    cell_size = int(sys.argv[1]) if len(sys.argv) > 1 else COLLISION_CELL_SIZE
+    print(f'Cell size: {cell_size}')
+    print(f'{"sprites":>8} {"groupcollide (ms)":>18} {"spatial hash (ms)":>18} {"speedup":>8} '
+          f'{"chosen (ms)":>12}')
+    for count in SPRITE_COUNTS:
+        rng = random.Random(count)
+        # Mostly projectiles, a few ships
+        ships = make_group(max(1, count // 10), rng, 50)
+        projectiles = make_group(count - len(ships), rng, 10)
+        broadphase = SpatialHash(cell_size)
+
+        def naive():
+            pygame.sprite.groupcollide(ships, projectiles, False, False)
+
+        def hashed():
+            broadphase.rebuild([ships, projectiles])
+            broadphase.groupcollide(ships, projectiles)
+
+        def chosen():
+            collidable.broadphase.clear()
+            collidable.groupcollide(ships, projectiles)
+
+        number = max(1, 2000 // count)
+        naive_time = min(timeit.repeat(naive, number=number, repeat=3)) / number * 1000
+        hashed_time = min(timeit.repeat(hashed, number=number, repeat=3)) / number * 1000
+        chosen_time = min(timeit.repeat(chosen, number=number, repeat=3)) / number * 1000
+        print(f'{count:>8} {naive_time:>18.3f} {hashed_time:>18.3f} {naive_time / hashed_time:>7.1f}x '
+              f'{chosen_time:>12.3f}')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+"""Times Configurable.copy for the ships and projectiles defined in the game's configs.
+
+Usage: python benchmarks/bench_configurable_copy.py
+"""
+
+import os
+import sys
+import tempfile
+import timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+# Keep processed images out of the user's own disk cache
+os.environ.setdefault('ASTRO_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'astro2-benchmarks'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import astro
+from astro import SCREEN_SIZE, load_all
+import run_game # pylint:disable=unused-import
+from astro.ship import Ship, EnemyShip
+from astro.projectile import Projectile
+from astro.move_behavior import MoveBehavior
+
+def main():
+    pygame.init()
+    astro.SCREEN = pygame.display.set_mode(SCREEN_SIZE)
+    load_all()
+
+    cases = [(f'{cls.__name__}[{key}].copy()', inst.copy)
+             for cls in (EnemyShip, Ship, Projectile)
+             for key, inst in cls.all_instances()]
+    cases.append(("MoveBehavior.instance('move_on_screen', True, initial_dest=...)",
+                  lambda: MoveBehavior.instance('move_on_screen', True, initial_dest=(0.5, 100))))
+
+    for name, func in cases:
+        number = 200
+        elapsed = min(timeit.repeat(func, number=number, repeat=5)) / number
+        print(f'{name:<70} {elapsed * 1e6:10.1f} us')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Times drawing a frame of sprites spread over the game's sprite groups with per-group Group.draw
+calls, and with the renderer's Surface.blits call per group, both with the rects returned that the
+dirty rect renderer needs and with doreturn=False as the full redraw renderer calls it.
+
+Sprites share a handful of images, as the ships of a formation do.
+
+Usage: python benchmarks/bench_draw.py [frames]
+"""
+
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from astro import SCREEN_SIZE, GROUPS, clear_all_groups
+from gui.renderer import Renderer
+
+def make_sprites(count, rng):
+    images = []
+    for i in range(8):
+        image = pygame.Surface((24, 24), flags=pygame.SRCALPHA).convert_alpha()
+        pygame.draw.circle(image, (255, 32 * i, 0, 255), (12, 12), 11)
+        images.append(image)
+    for i in range(count):
+        # Consecutive sprites in a group share an image, like a formation's ships
+        group = GROUPS[i * len(GROUPS) // count]
+        sprite = pygame.sprite.Sprite(group)
+        sprite.image = images[i * len(images) // count]
+        sprite.rect = sprite.image.get_rect(center=(rng.randrange(SCREEN_SIZE[0]),
+                                                    rng.randrange(SCREEN_SIZE[1])))
+
+def time_frames(draw, frames):
+    start = time.perf_counter()
+    for frame in range(frames):
+        draw()
+    return (time.perf_counter() - start) / frames
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    pygame.init()
+    screen = pygame.display.set_mode(SCREEN_SIZE)
+    background = pygame.Surface(SCREEN_SIZE).convert()
+    renderer = Renderer(screen, background, GROUPS)
+    tracking_renderer = Renderer(screen, background, GROUPS)
+    tracking_renderer.track_rects = True
+
+    def group_draw():
+        screen.blit(background, (0, 0))
+        for group in GROUPS:
+            group.draw(screen)
+
+    for count in (100, 1000, 5000):
+        clear_all_groups()
+        make_sprites(count, random.Random(0))
+        per_group = time_frames(group_draw, frames)
+        tracking = time_frames(tracking_renderer.draw, frames)
+        batched = time_frames(renderer.draw, frames)
+        print(f'{count:>5} sprites  Group.draw: {per_group * 1000:7.3f} ms/frame  '
+              f'blits: {tracking * 1000:7.3f} ms/frame ({per_group / tracking:4.2f}x)  '
+              f'blits without rects: {batched * 1000:7.3f} ms/frame ({per_group / batched:4.2f}x)')
+
+if __name__ == '__main__':
+    main()
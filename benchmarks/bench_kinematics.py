@@ -0,0 +1,83 @@
+"""Compares the time per simulation step spent moving patrolling enemy ships when each ship moves
+itself with that of the NumPy ship kinematics, for increasing numbers of ships.
+
+Only movement is timed: steering, integrating, clamping, confining and syncing the ships' rects,
+the part of Ship.tick that the kinematics take over. The ships' weapons and fire behaviors cost
+the same either way.
+
+Usage: python benchmarks/bench_kinematics.py [steps]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+# Keep processed images out of the user's own disk cache
+os.environ.setdefault('ASTRO_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'astro2-benchmarks'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import astro
+from astro import SCREEN_SIZE, load_all, clear_all_groups, kinematics
+from astro.kinematics import ShipKinematics, numpy
+from astro.movable import Movable
+from astro.ship import EnemyShip
+from astro.sim_clock import SimClock
+from gui import Screen
+import run_game # pylint:disable=unused-import
+
+def place_ships(count, screen, rng):
+    ships = []
+    for i in range(count):
+        ship = EnemyShip.instance('invader_green', copy=True)
+        ship.place(screen, rng.randrange(SCREEN_SIZE[0]), rng.randrange(SCREEN_SIZE[1] // 2))
+        ships.append(ship)
+    return ships
+
+def run(count, steps, ship_kinematics):
+    rng = random.Random(0)
+    screen = Screen(pygame.display.get_surface())
+    clear_all_groups()
+    kinematics.SHIP_KINEMATICS = ship_kinematics
+    ships = place_ships(count, screen, rng)
+    kinematics.SHIP_KINEMATICS = None
+    clock = SimClock()
+    clock.advance(1 / 120)
+    if ship_kinematics is not None:
+        ship_kinematics.update(clock)
+
+    start = time.perf_counter()
+    for step in range(steps):
+        clock.advance(1 / 120)
+        if ship_kinematics is None:
+            for ship in ships:
+                ship.update_velocity(clock.elapsed)
+                Movable.tick(ship, clock.now, clock.elapsed)
+        else:
+            ship_kinematics.update(clock)
+    elapsed = (time.perf_counter() - start) / steps
+    if ship_kinematics is not None:
+        ship_kinematics.clear()
+    return elapsed
+
+def main():
+    if numpy is None:
+        print('NumPy is not installed')
+        return
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    pygame.init()
+    astro.SCREEN = pygame.display.set_mode(SCREEN_SIZE)
+    load_all()
+    for count in [10, 100, 500, 1000, 2000]:
+        ships = run(count, steps, None)
+        arrays = run(count, steps, ShipKinematics())
+        print(f'{count:>5} ships  python: {ships * 1000:7.3f} ms/step  '
+              f'numpy: {arrays * 1000:7.3f} ms/step  ({ships / arrays:.2f}x)  '
+              f'per ship: {ships / count * 1e6:5.2f} / {arrays / count * 1e6:5.2f} us')
+
+if __name__ == '__main__':
+    main()
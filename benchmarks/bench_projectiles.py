@@ -0,0 +1,99 @@
+"""Compares the time per simulation step and frame of projectiles as sprites with that of the NumPy
+projectile batch, for increasing numbers of projectiles flying past a few enemy ships.
+
+Each step tests collisions, moves the projectiles, fires new ones to replace those that hit a ship
+or left the screen, and draws a frame.
+
+Usage: python benchmarks/bench_projectiles.py [steps]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+# Keep processed images out of the user's own disk cache
+os.environ.setdefault('ASTRO_CACHE_DIR', os.path.join(tempfile.gettempdir(), 'astro2-benchmarks'))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+import astro
+from astro import SCREEN_SIZE, GROUPS, FRIENDLY_PROJECTILES, load_all, clear_all_groups
+from astro.collidable import check_collisions
+from astro.projectile import Projectile
+from astro.projectile_batch import ProjectileBatch, numpy
+from astro.ship import EnemyShip
+from astro.sim_clock import SimClock
+from gui import Screen
+from gui.renderer import Renderer
+import run_game # pylint:disable=unused-import
+
+class Firer:
+    """Fires from a random point along the bottom half of the screen.
+    """
+    speedx = speedy = 0
+
+    def __init__(self, rng):
+        self.rng = rng
+        self.rect = pygame.Rect(0, 0, 1, 1)
+
+    def move(self):
+        self.rect.center = (self.rng.randrange(SCREEN_SIZE[0]),
+                            self.rng.randrange(SCREEN_SIZE[1] // 2, SCREEN_SIZE[1]))
+
+def place_targets(screen, rng):
+    for i in range(20):
+        ship = EnemyShip.instance('invader_green', copy=True)
+        ship.place(screen, rng.randrange(SCREEN_SIZE[0]), rng.randrange(SCREEN_SIZE[1] // 2))
+        ship.hp = ship.max_hp = float('inf')
+
+def run(count, steps, batch):
+    rng = random.Random(0)
+    screen = Screen(pygame.display.get_surface())
+    clear_all_groups()
+    place_targets(screen, rng)
+    prototype = Projectile.instance('blueproj')
+    firer = Firer(rng)
+    background = pygame.Surface(SCREEN_SIZE).convert()
+    groups = [group for group in GROUPS if group]
+    renderer = Renderer(screen.screen, background, groups,
+                        {FRIENDLY_PROJECTILES: [batch]} if batch is not None else None)
+    clock = SimClock()
+
+    start = time.perf_counter()
+    for step in range(steps):
+        clock.advance(1 / 60)
+        check_collisions()
+        if batch is None:
+            FRIENDLY_PROJECTILES.update(clock)
+            while len(FRIENDLY_PROJECTILES) < count:
+                firer.move()
+                prototype.acquire().place(screen, firer, True)
+        else:
+            batch.collide()
+            batch.step(clock.elapsed)
+            while len(batch) < count:
+                firer.move()
+                batch.emit(prototype, screen, firer)
+        renderer.draw()
+    return (time.perf_counter() - start) / steps
+
+def main():
+    if numpy is None:
+        print('NumPy is not installed')
+        return
+    steps = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    pygame.init()
+    astro.SCREEN = pygame.display.set_mode(SCREEN_SIZE)
+    load_all()
+    for count in [100, 1000, 5000, 10000]:
+        sprites = run(count, steps, None)
+        batch = run(count, steps, ProjectileBatch(True))
+        print(f'{count:>6} projectiles  sprites: {sprites * 1000:8.3f} ms/step  '
+              f'batch: {batch * 1000:8.3f} ms/step  ({sprites / batch:.2f}x)')
+
+if __name__ == '__main__':
+    main()
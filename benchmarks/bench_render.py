@@ -0,0 +1,57 @@
+"""Times drawing and presenting frames with the full and dirty rect renderers.
+
+Usage: python benchmarks/bench_render.py [frames]
+"""
+
+import os
+import sys
+import time
+import random
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pygame
+
+from astro import SCREEN_SIZE
+from gui.renderer import Renderer, DirtyRectRenderer
+
+def make_groups(count, rng):
+    groups = [pygame.sprite.RenderPlain() for i in range(3)]
+    for i in range(count):
+        sprite = pygame.sprite.Sprite(groups[i % len(groups)])
+        sprite.image = pygame.Surface((32, 32), flags=pygame.SRCALPHA)
+        pygame.draw.circle(sprite.image, (255, 200, 0, 255), (16, 16), 15)
+        sprite.rect = sprite.image.get_rect(center=(rng.randrange(SCREEN_SIZE[0]),
+                                                    rng.randrange(SCREEN_SIZE[1])))
+        sprite.velocity = (rng.randint(-4, 4), rng.randint(-4, 4))
+    return groups
+
+def run(renderer_class, count, frames):
+    screen = pygame.display.get_surface()
+    background = pygame.Surface(SCREEN_SIZE).convert()
+    background.fill((0, 0, 0))
+    groups = make_groups(count, random.Random(0))
+    renderer = renderer_class(screen, background, groups)
+
+    start = time.perf_counter()
+    for frame in range(frames):
+        for group in groups:
+            for sprite in group:
+                sprite.rect.move_ip(sprite.velocity)
+        renderer.draw()
+        renderer.present()
+    return (time.perf_counter() - start) / frames
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    pygame.init()
+    pygame.display.set_mode(SCREEN_SIZE)
+    for count in (10, 50, 200, 1000):
+        full = run(Renderer, count, frames)
+        dirty = run(DirtyRectRenderer, count, frames)
+        print(f'{count:>5} sprites  full: {full * 1000:7.3f} ms/frame  '
+              f'dirty rects: {dirty * 1000:7.3f} ms/frame  ({full / dirty:5.1f}x)')
+
+if __name__ == '__main__':
+    main()
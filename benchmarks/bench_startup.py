@@ -0,0 +1,59 @@
+"""Compares the time to load all configs and their images with a cold and a warm disk cache.
+
+Besides load_all, it times generating every rotated variant of the loaded direction tables, which
+otherwise happens the first time each projectile faces a new direction.
+
+Each run is a separate process using a fresh cache directory, so the first run starts cold and the
+following ones read the images written by it.
+
+Usage: python benchmarks/bench_startup.py [warm runs]
+"""
+
+import os
+import sys
+import time
+import tempfile
+import subprocess
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+def load():
+    import pygame
+
+    import astro
+    from astro import SCREEN_SIZE, load_all
+    import run_game # pylint:disable=unused-import
+    from astro.disk_cache import DISK_CACHE
+    from astro.image import DIRECTION_TABLES
+
+    pygame.init()
+    astro.SCREEN = pygame.display.set_mode(SCREEN_SIZE)
+    start = time.perf_counter()
+    load_all()
+    elapsed = time.perf_counter() - start
+    start = time.perf_counter()
+    for table in DIRECTION_TABLES.values():
+        for i in range(table.directions):
+            table.variant(i)
+    variants_elapsed = time.perf_counter() - start
+    print(f'{elapsed * 1000:.1f} {variants_elapsed * 1000:.1f} {DISK_CACHE.hits} {DISK_CACHE.misses}')
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+    with tempfile.TemporaryDirectory() as cache_dir:
+        env = dict(os.environ, ASTRO_CACHE_DIR=cache_dir)
+        for run in range(runs + 1):
+            output = subprocess.run([sys.executable, __file__, '--load'], env=env, cwd=ROOT,
+                                    capture_output=True, text=True, check=True).stdout
+            elapsed, variants_elapsed, hits, misses = output.split()[-4:]
+            label = 'cold' if run == 0 else f'warm {run}'
+            print(f'{label:<8} load_all: {elapsed:>7} ms  variants: {variants_elapsed:>7} ms  '
+                  f'disk cache hits: {hits:>4}  misses: {misses:>4}')
+
+if __name__ == '__main__':
+    if '--load' in sys.argv:
+        load()
+    else:
+        main()
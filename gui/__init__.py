@@ -117,8 +117,7 @@ class MenuScreen(Screen):
     def create_text(self, s, font_size, pos=(0, 0), color=(255, 255, 255), font=None, **rectkwargs):
         if font is None:
             font = FONTS.mono_font
-        font_ = pygame.font.Font(font, font_size)
-        surface = font_.render(s, 1, color)
+        surface = FONTS.render(font, font_size, s, color)
         if not rectkwargs:
             rectkwargs['topleft'] = pos
         rect = surface.get_rect(**self.convert_rect_kwargs(**rectkwargs))
@@ -5,13 +5,18 @@ import pygame
 from pygame.locals import KEYDOWN, KEYUP
 
 from gui import NEXT_ACTION, Action, Screen
+from gui.renderer import Renderer, DirtyRectRenderer
 import astro
 import astro.keys
-from astro import MAX_FPS, FONTS, GROUPS, clear_all_groups
+from astro import MAX_FPS, FONTS, GROUPS, DIRTY_RECT_RENDERING, INTERPOLATE_RENDERING, \
+    clear_all_groups
+from astro import projectile_batch, kinematics
 from astro.ship import PlayerShip
 from astro.hud import HUD
 from astro.level import Level
 from astro.collidable import check_collisions
+from astro.image import IMAGE_CACHE
+from astro.sim_clock import SIM_CLOCK
 from astro.player import active_player
 
 class GameScreen(Screen):
@@ -26,6 +31,9 @@ class GameScreen(Screen):
         self.background = pygame.Surface(self.screen.get_size()).convert()
         self.background.fill((0, 0, 0))
         self.quit = False
+        renderer_class = DirtyRectRenderer if DIRTY_RECT_RENDERING and self.top_level else Renderer
+        batches = {group: [batch] for group, batch in projectile_batch.PROJECTILE_BATCHES.items()}
+        self.renderer = renderer_class(self.screen, self.background, GROUPS, batches)
 
     def done(self):
         if self.level.complete:
@@ -49,33 +57,56 @@ class GameScreen(Screen):
 
     def setup(self):
         pygame.mouse.set_visible(self.mouse_visible)
+        SIM_CLOCK.resume()
+        SIM_CLOCK.discard_accumulated()
 
         self.set_player_ship()
         self.player_ship.place(self)
 
     def teardown(self):
         clear_all_groups()
+        for batch in projectile_batch.PROJECTILE_BATCHES.values():
+            batch.clear()
+        if kinematics.SHIP_KINEMATICS is not None:
+            kinematics.SHIP_KINEMATICS.clear()
 
     def update_display(self, elapsed):
-        self.screen.blit(self.background, (0, 0))
-        for group in GROUPS:
-            group.draw(self.screen)
+        if INTERPOLATE_RENDERING:
+            self.renderer.interpolation = SIM_CLOCK.interpolation
+        self.renderer.draw()
 
-        if hasattr(self, 'hud'):
-            self.hud.draw()
-        super().update_display(elapsed)
+        hud_rects = self.hud.draw() if hasattr(self, 'hud') else []
+        if self.top_level:
+            self.renderer.present(hud_rects)
 
     def update(self, elapsed=None):
         elapsed = super().update(elapsed)
 
         self.handle_ingame_events()
 
+        for step in range(SIM_CLOCK.accumulate(elapsed / 1000)):
+            SIM_CLOCK.step()
+            self.simulate(SIM_CLOCK)
+
+        return elapsed
+
+    def simulate(self, clock):
+        """Advances the game by one fixed step of the simulation clock.
+        """
         check_collisions()
+        batches = projectile_batch.PROJECTILE_BATCHES
+        for batch in batches.values():
+            batch.collide()
 
-        for group in GROUPS:
-            group.update()
+        # Move the ships before their weapons and the projectiles homing in on them update
+        if kinematics.SHIP_KINEMATICS is not None:
+            kinematics.SHIP_KINEMATICS.update(clock)
 
-        return elapsed
+        for group in GROUPS:
+            group.update(clock)
+            batch = batches.get(group)
+            if batch is not None:
+                batch.step(clock.elapsed)
 
     def handle_ingame_events(self):
         for event in pygame.event.get():
@@ -93,7 +124,10 @@ class MainGameScreen(GameScreen):
     def __init__(self, screen):
         super().__init__(screen)
         self.level = self.campaign.current_level()
-        self.level.reset()
+        # Keep the images of the ships and projectiles in this level cached while it is played
+        IMAGE_CACHE.unpin_all()
+        with IMAGE_CACHE.pinning():
+            self.level.reset()
         self.level.screen = self
 
     def setup(self):
@@ -104,21 +138,19 @@ class MainGameScreen(GameScreen):
         self.counting_down = True
         self.countdown_remaining = 3.0
 
-        deploying_font = pygame.font.Font(FONTS.mono_font, 48)
-        self.deploying_msg = deploying_font.render("Deploying", 1, (255, 255, 255))
+        self.deploying_msg = FONTS.render(FONTS.mono_font, 48, "Deploying", (255, 255, 255))
         self.deploying_pos = self.deploying_msg.get_rect(midbottom=
             (self.screen_size[0] / 2, self.screen_size[1] / 2))
 
-        self.number_font = pygame.font.Font(FONTS.mono_font, 36)
-
     def update_display(self, elapsed):
         if self.counting_down:
             self.screen.blit(self.background, (0, 0))
             self.screen.blit(self.deploying_msg, self.deploying_pos)
             countdown_num = str(int(math.ceil(self.countdown_remaining)))
-            number_msg = self.number_font.render(f"{countdown_num}...", 1, (255, 255, 255))
+            number_msg = FONTS.render(FONTS.mono_font, 36, f"{countdown_num}...", (255, 255, 255))
             number_pos = number_msg.get_rect(midtop=(self.screen_size[0] / 2, self.screen_size[1] / 2 + 10))
             self.screen.blit(number_msg, number_pos)
+            self.renderer.invalidate()
             super(GameScreen, self).update_display(elapsed)
         else:
             super().update_display(elapsed)
@@ -132,11 +164,14 @@ class MainGameScreen(GameScreen):
                 self.counting_down = False
 
         if not self.counting_down:
-            self.level.update()
             elapsed = super().update(elapsed)
 
         return elapsed
 
+    def simulate(self, clock):
+        self.level.update(clock)
+        super().simulate(clock)
+
 class WeaponPreviewScreen(GameScreen):
     mouse_visible = True
 
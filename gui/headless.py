@@ -0,0 +1,110 @@
+"""Runs levels without drawing anything or waiting for the frame rate, e.g. for balance testing and
+measuring the performance of the simulation.
+
+The game still needs a display surface to convert images to, so run with the SDL dummy video
+driver to avoid opening a window, as run_headless.py does.
+"""
+
+import time
+import random
+from collections import namedtuple
+
+import astro
+from astro import GROUPS, FRIENDLY_SHIPS, ENEMY_SHIPS, FRIENDLY_PROJECTILES, ENEMY_PROJECTILES
+from astro.player import Player, set_active_player
+from astro import projectile_batch
+from astro.sim_clock import SIM_CLOCK
+from gui.game import MainGameScreen
+
+LevelRun = namedtuple('LevelRun',
+    ['campaign',
+     'level',
+     'outcome',
+     'ticks',
+     'sim_time',
+     'wall_time',
+     'ticks_per_second',
+     'peak_entities'])
+
+# Groups counted for each kind of entity in LevelRun.peak_entities
+ENTITY_GROUPS = {'ships': [FRIENDLY_SHIPS, ENEMY_SHIPS],
+                 'projectiles': [FRIENDLY_PROJECTILES, ENEMY_PROJECTILES],
+                 'sprites': GROUPS}
+
+class HeadlessGameScreen(MainGameScreen):
+    """Game screen that plays a level as fast as possible, without a countdown or drawing.
+    """
+    mapped_action = None
+
+    def setup(self):
+        super().setup()
+        self.counting_down = False
+
+    def update_display(self, elapsed):
+        pass
+
+    def tick(self):
+        """Runs one fixed simulation step.
+        """
+        SIM_CLOCK.step()
+        self.simulate(SIM_CLOCK)
+
+    def outcome(self):
+        """Returns 'won' or 'lost' once the level is over, otherwise None.
+        """
+        if self.level.complete:
+            return 'won'
+        if not self.player_ship.alive():
+            return 'lost'
+        return None
+
+def run_level(campaign, level_i=0, max_sim_time=300.0, autofire=True, seed=None):
+    """Plays a level of a campaign headlessly until it is won, lost or runs out of time.
+
+    Configs must have been loaded and the display mode set beforehand.
+
+    Args:
+        campaign (Campaign): The campaign to play a level of, with its starting ship.
+        level_i (int): Index of the level within the campaign.
+        max_sim_time (float): Simulation seconds after which to give up on the level.
+        autofire (bool): Whether the player's ship fires constantly. It never moves.
+        seed (int): Seed for the random number generator, or None not to seed it.
+
+    Returns:
+        A LevelRun, with outcome 'won', 'lost' or 'timeout'.
+    """
+    if seed is not None:
+        random.seed(seed)
+    # Timers compare against the simulation time, so start every run from the same time
+    SIM_CLOCK.reset()
+    campaign.level_i = level_i
+    player = Player(campaign.starting_ship.copy())
+    player.campaign = campaign
+    set_active_player(player)
+
+    game = HeadlessGameScreen(astro.SCREEN)
+    game.setup()
+    if autofire:
+        game.player_ship.start_firing()
+
+    peak_entities = dict.fromkeys(ENTITY_GROUPS, 0)
+    max_ticks = int(max_sim_time / SIM_CLOCK.step_size)
+    ticks = 0
+    outcome = None
+    start = time.perf_counter()
+    while outcome is None and ticks < max_ticks:
+        game.tick()
+        ticks += 1
+        for kind, groups in ENTITY_GROUPS.items():
+            count = sum(len(group) for group in groups)
+            if kind == 'projectiles':
+                count += sum(map(len, projectile_batch.PROJECTILE_BATCHES.values()))
+            if count > peak_entities[kind]:
+                peak_entities[kind] = count
+        outcome = game.outcome()
+    wall_time = time.perf_counter() - start
+    game.teardown()
+
+    return LevelRun(campaign.key, game.level.key, outcome or 'timeout', ticks,
+                    ticks * SIM_CLOCK.step_size, wall_time,
+                    ticks / wall_time if wall_time else float('inf'), peak_entities)
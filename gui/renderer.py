@@ -0,0 +1,160 @@
+"""Renderers that draw the game's sprite groups onto a screen surface and present the frame.
+
+Both draw the groups in the order given, i.e. the z-order of GROUPS, and skip sprites that lie
+entirely outside the surface, such as formations waiting above the screen.
+
+Batches of objects that aren't sprites, such as astro.projectile_batch.ProjectileBatch, can be
+drawn right above a group. They provide a blit_sequence(surface_rect,
+interpolation) method returning the (image, position) pairs to draw.
+
+If given an interpolation proportion, sprites are drawn that proportion of the way between their
+positions before and after the last simulation step, see Movable.draw_offset.
+
+Only renderers that set track_rects record where each sprite was drawn. Others pass doreturn=False
+to Surface.blits, so that it doesn't create a Rect for every sprite drawn.
+"""
+
+import pygame
+
+from astro import GROUPS
+
+class Renderer:
+    """Redraws the whole screen each frame and flips the display.
+
+    Attributes:
+        surface (pygame.Surface): The surface to draw onto.
+        background (pygame.Surface): Surface of the same size drawn beneath the sprites.
+        groups (list of pygame.sprite.Group): Groups to draw, from bottom to top.
+        batches (dict): Mapping of a group to a list of batches to draw right above it.
+        batch_rects (list of pygame.Rect): Where the batches' images were drawn in the last
+            frame, if track_rects is set.
+        culled (int): Total number of sprite draws skipped because they were off the surface.
+        frame_culled (int): Number of sprite draws skipped in the last frame.
+        interpolation (float): Proportion of the way from the sprites' previous positions to their
+            current ones to draw them at, or None to draw them at their rects.
+    """
+    # Whether to record where sprites and batches were drawn
+    track_rects = False
+
+    def __init__(self, surface, background, groups=GROUPS, batches=None):
+        self.surface = surface
+        self.surface_rect = surface.get_rect()
+        self.background = background
+        self.groups = groups
+        self.batches = batches if batches is not None else dict()
+        self.batch_rects = []
+        self.culled = 0
+        self.frame_culled = 0
+        self.interpolation = None
+
+    def invalidate(self):
+        """Marks the whole screen as changed, e.g. after something else was drawn over it.
+        """
+        pass
+
+    def draw(self):
+        self.surface.blit(self.background, (0, 0))
+        self.draw_groups()
+
+    def draw_groups(self):
+        self.frame_culled = 0
+        self.batch_rects = []
+        for group in self.groups:
+            self.draw_group(group)
+            for batch in self.batches.get(group, ()):
+                self.draw_batch(batch)
+        self.culled += self.frame_culled
+
+    def draw_group(self, group):
+        """Equivalent of group.draw(surface) that skips sprites outside the surface.
+
+        If track_rects is set, like group.draw, it records where each sprite was drawn in
+        group.spritedict, with 0 for sprites that weren't drawn, and resets group.lostsprites.
+        """
+        colliderect = self.surface_rect.colliderect
+        sprites = group.sprites()
+        visible = [sprite for sprite in sprites if colliderect(sprite.rect)]
+        self.frame_culled += len(sprites) - len(visible)
+        alpha = self.interpolation
+        if alpha is None:
+            sequence = [(sprite.image, sprite.rect) for sprite in visible]
+        else:
+            sequence = [(sprite.image, sprite.rect.move(sprite.draw_offset(alpha)))
+                        for sprite in visible]
+        if not self.track_rects:
+            self.surface.blits(sequence, doreturn=False)
+            return
+        spritedict = group.spritedict
+        if len(visible) < len(sprites):
+            for sprite in sprites:
+                spritedict[sprite] = 0
+        spritedict.update(zip(visible, self.surface.blits(sequence)))
+        group.lostsprites = []
+
+    def draw_batch(self, batch):
+        """Draws the objects of a batch that are on the surface, recording where in batch_rects if
+           track_rects is set.
+        """
+        sequence = batch.blit_sequence(self.surface_rect, self.interpolation)
+        self.frame_culled += len(batch) - len(sequence)
+        if self.track_rects:
+            self.batch_rects.extend(self.surface.blits(sequence))
+        else:
+            self.surface.blits(sequence, doreturn=False)
+
+    def present(self, extra_rects=()):
+        """Updates the display with the drawn frame.
+
+        Args:
+            extra_rects (list of pygame.Rect): Areas drawn over the sprites after draw(), such
+                as the HUD, which are cleared again before the next frame is drawn.
+        """
+        pygame.display.flip()
+
+class DirtyRectRenderer(Renderer):
+    """Only clears and redraws the areas covered by sprites in the previous and current frame,
+       and only updates those areas of the display.
+
+    The first frame and any frame after invalidate() are drawn in full.
+    """
+    track_rects = True
+
+    def __init__(self, surface, background, groups=GROUPS, batches=None):
+        super().__init__(surface, background, groups, batches)
+        self.full_redraw = True
+        self.dirty = list()
+        self.extra_rects = list()
+
+    def invalidate(self):
+        self.full_redraw = True
+
+    def draw(self):
+        surface = self.surface
+        if self.full_redraw:
+            surface.blit(self.background, (0, 0))
+            self.draw_groups()
+            return
+
+        # Clear where sprites were drawn last frame before drawing any group, so that clearing
+        # one group can't erase another group drawn above it
+        dirty = self.dirty = list(self.extra_rects) + self.batch_rects
+        for group in self.groups:
+            dirty.extend(group.lostsprites)
+            dirty.extend(rect for rect in group.spritedict.values() if rect)
+        background = self.background
+        for rect in dirty:
+            surface.blit(background, rect, rect)
+
+        self.draw_groups()
+        dirty.extend(self.batch_rects)
+        for group in self.groups:
+            dirty.extend(rect for rect in group.spritedict.values() if rect)
+
+    def present(self, extra_rects=()):
+        if self.full_redraw:
+            pygame.display.flip()
+            self.full_redraw = False
+        else:
+            self.dirty.extend(extra_rects)
+            pygame.display.update(self.dirty)
+        self.extra_rects = list(extra_rects)
@@ -0,0 +1,70 @@
+"""Plays campaign levels headlessly and reports how fast they were simulated and how they ended.
+
+Usage: python run_headless.py [campaign [level index]] [--runs N] [--max-time SECONDS] [--seed N]
+                              [--no-fire]
+
+Without a campaign, every level of every campaign is played.
+"""
+
+import os
+import argparse
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+
+import astro
+from astro import SCREEN_SIZE, load_all, FONTS
+from astro.campaign import Campaign
+import run_game # pylint:disable=unused-import
+from gui.headless import run_level
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Plays campaign levels headlessly.')
+    parser.add_argument('campaign', nargs='?', help='Key of the campaign to play')
+    parser.add_argument('level', nargs='?', type=int, help='Index of the level to play')
+    parser.add_argument('--runs', type=int, default=1, help='Number of times to play each level')
+    parser.add_argument('--max-time', type=float, default=300.0,
+                        help='Simulation seconds after which to stop a level')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed of the first run, incremented for each following run')
+    parser.add_argument('--no-fire', action='store_true',
+                        help="Don't have the player's ship fire constantly")
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    pygame.init()
+    FONTS.init()
+    astro.SCREEN = pygame.display.set_mode(SCREEN_SIZE)
+    load_all()
+
+    if args.campaign is None:
+        campaigns = [campaign for key, campaign in sorted(Campaign.all_instances())]
+    else:
+        campaigns = [Campaign.instance(args.campaign)]
+
+    total_ticks = total_wall_time = 0
+    for campaign in campaigns:
+        levels = range(len(campaign.levels)) if args.level is None else [args.level]
+        for level_i in levels:
+            for run in range(args.runs):
+                seed = None if args.seed is None else args.seed + run
+                result = run_level(campaign, level_i, args.max_time, not args.no_fire, seed)
+                total_ticks += result.ticks
+                total_wall_time += result.wall_time
+                peaks = ' '.join(f'{kind}: {count}' for kind, count in result.peak_entities.items())
+                print(f'{result.campaign}/{result.level} run {run + 1}: {result.outcome:<7} '
+                      f'ticks: {result.ticks:>6}  sim: {result.sim_time:7.1f} s  '
+                      f'wall: {result.wall_time:6.2f} s  ticks/s: {result.ticks_per_second:8.0f}  '
+                      f'peak {peaks}')
+
+    if total_wall_time:
+        print(f'total ticks: {total_ticks}  wall: {total_wall_time:.2f} s  '
+              f'ticks/s: {total_ticks / total_wall_time:.0f}')
+
+    pygame.quit()
+
+if __name__ == '__main__':
+    main()
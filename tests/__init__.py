@@ -11,6 +11,23 @@ from astro.projectile import Projectile
 pygame.init()
 screen = pygame.display.set_mode(SCREEN_SIZE)
 
+class ScreenTest:
+    """Minimal stand-in for gui.Screen providing what sprites need when placed.
+    """
+
+    screen_size = SCREEN_SIZE
+
+    def convert_prop_x(self, x):
+        return x if not isinstance(x, float) else round(x * self.screen_size[0])
+
+    def convert_prop_y(self, y):
+        return y if not isinstance(y, float) else round(y * self.screen_size[1])
+
+    def convert_proportional_coordinates(self, x, y):
+        return self.convert_prop_x(x), self.convert_prop_y(y)
+
+SCREEN = ScreenTest()
+
 class AstroSpriteTest(AstroSprite):
     """Simplified version of AstroSprite with quick-creation methods and default image.
     """
@@ -29,11 +46,11 @@ class AstroSpriteTest(AstroSprite):
         self.image = pygame.Surface(self.size)
         self.image.fill(pygame.Color(0, 0, 0))
         self.rect, self.mask, self.mask_rect, self.mask_rect_offsetx, \
-            self.mask_rect_offsety, self.mask_centroid = generate_rect_and_mask(self.image)
+            self.mask_rect_offsety = generate_rect_and_mask(self.image)
 
     def _load_image(self, *args, **kwargs):
         return self.image, self.rect, self.mask, self.mask_rect, self.mask_rect_offsetx, \
-            self.mask_rect_offsety, self.mask_centroid
+            self.mask_rect_offsety
 
     @classmethod
     def create(cls, size=None, startx=SCREEN_SIZE[0]/2, starty=SCREEN_SIZE[1]/2,
@@ -53,7 +70,7 @@ class AstroSpriteTest(AstroSprite):
         inst._setup(config)
         inst.size = size
         inst.initialize()
-        inst.place(**placekwargs)
+        inst.place(SCREEN, **placekwargs)
         return inst
 
 class ShipTest(AstroSpriteTest, Ship):
@@ -71,6 +88,9 @@ class EnemyShipTest(ShipTest, EnemyShip):
     default_size = (50, 50)
     engine_glow_imagepath = None
 
+    defaults = EnemyShip.defaults.copy()
+    defaults.update({'max_hp': 100})
+
 class ProjectileTest(AstroSpriteTest, Projectile):
     default_size = (10, 10)
 
@@ -0,0 +1,11 @@
+import pytest
+
+from astro.disk_cache import DISK_CACHE
+
+@pytest.fixture(autouse=True)
+def disk_cache_dir(tmp_path, monkeypatch):
+    """Keeps images processed by tests out of the user's own disk cache.
+    """
+    monkeypatch.setattr(DISK_CACHE, 'directory', str(tmp_path / 'disk_cache'))
+    monkeypatch.setattr(DISK_CACHE, '_index', None)
+    monkeypatch.setattr(DISK_CACHE, '_pruned', False)
@@ -0,0 +1,200 @@
+import math
+import random
+import itertools
+
+import pygame
+import pytest
+
+from astro import collidable
+from astro.spatial_hash import SpatialHash
+from astro.collidable import Collidable, collision_handler, find_time_of_impact, \
+    collision_impulse, check_collisions
+from astro.ship import Ship, PlayerShip, EnemyShip
+from astro.shield import Shield
+from astro.projectile import Projectile
+from tests import ShipTest, PlayerShipTest, EnemyShipTest, ProjectileTest
+
+def _random_group(n, rng, size_range=(1, 120)):
+    group = pygame.sprite.Group()
+    for i in range(n):
+        sprite = pygame.sprite.Sprite()
+        sprite.rect = pygame.Rect(rng.randint(-200, 1200), rng.randint(-200, 900),
+                                  rng.randint(*size_range), rng.randint(*size_range))
+        group.add(sprite)
+    return group
+
+def test_spatial_hash_matches_groupcollide():
+    rng = random.Random(1234)
+    group1 = _random_group(200, rng)
+    group2 = _random_group(300, rng, (0, 40))
+
+    for cell_size in (16, 64, 500):
+        broadphase = SpatialHash(cell_size)
+        broadphase.rebuild([group1, group2])
+        assert broadphase.groupcollide(group1, group2) == \
+            pygame.sprite.groupcollide(group1, group2, False, False)
+        assert broadphase.groupcollide(group1, group1) == \
+            pygame.sprite.groupcollide(group1, group1, False, False)
+
+def test_spatial_hash_skips_killed_sprites():
+    rng = random.Random(5678)
+    group1 = _random_group(50, rng)
+    group2 = _random_group(50, rng)
+    broadphase = SpatialHash()
+    broadphase.rebuild([group1, group2])
+
+    for sprite in group2.sprites()[::2]:
+        sprite.kill()
+    assert broadphase.groupcollide(group1, group2) == \
+        pygame.sprite.groupcollide(group1, group2, False, False)
+
+class Bumper(Collidable, pygame.sprite.Sprite):
+    """Sprite that bounces far away when it hits a wall.
+    """
+    def __init__(self, rect, *groups):
+        pygame.sprite.Sprite.__init__(self, *groups)
+        self.rect = pygame.Rect(rect)
+        self.hit = []
+
+    def collide_with_wall(self, wall):
+        self.rect.topleft = (500, 500)
+
+    def collide_with_target(self, target):
+        self.hit.append(target)
+
+class Wall(Collidable, pygame.sprite.Sprite):
+    def __init__(self, rect, *groups):
+        pygame.sprite.Sprite.__init__(self, *groups)
+        self.rect = pygame.Rect(rect)
+
+class Target(Wall):
+    pass
+
+def test_check_collisions_sees_sprites_moved_by_earlier_pairs(monkeypatch):
+    bumpers, walls, targets = (pygame.sprite.Group() for i in range(3))
+    monkeypatch.setattr(collidable, 'COLLIDABLE_PAIRS',
+                        [(walls, bumpers, False), (targets, bumpers, False)])
+    monkeypatch.setattr(collidable, 'COLLISION_BROADPHASE_MIN_SIZE', 0)
+    monkeypatch.setattr(collidable, 'colliding_pairs', dict())
+    monkeypatch.setattr(collidable, 'pairs_by_sprite', dict())
+    bumper = Bumper((0, 0, 10, 10), bumpers)
+    Wall((0, 0, 10, 10), walls)
+    target = Target((500, 500, 10, 10), targets)
+
+    # The bounce off the wall moves the bumper into the target's cell, where the target must find
+    # it later in the same frame
+    check_collisions()
+    assert bumper.hit == [target]
+
+class Popper(Bumper):
+    def collide_with_wall(self, wall):
+        # Like a pooled projectile, which is reset when it's destroyed
+        self.kill()
+        self.rect = pygame.Rect(500, 500, 10, 10)
+
+def test_check_collisions_ignores_destroyed_sprites_moving(monkeypatch):
+    poppers, walls = pygame.sprite.Group(), pygame.sprite.Group()
+    monkeypatch.setattr(collidable, 'COLLIDABLE_PAIRS', [(walls, poppers, False)] * 2)
+    monkeypatch.setattr(collidable, 'COLLISION_BROADPHASE_MIN_SIZE', 0)
+    monkeypatch.setattr(collidable, 'colliding_pairs', dict())
+    monkeypatch.setattr(collidable, 'pairs_by_sprite', dict())
+    clears = []
+    monkeypatch.setattr(collidable.broadphase, 'clear',
+                        lambda: clears.append(SpatialHash.clear(collidable.broadphase)))
+    Popper((0, 0, 10, 10), poppers)
+    Bumper((100, 0, 10, 10), poppers)
+    Wall((0, 0, 10, 10), walls)
+
+    check_collisions()
+    assert len(clears) == 1
+    assert poppers in collidable.broadphase.cells
+
+def test_check_collisions_only_hashes_large_groups(monkeypatch):
+    rng = random.Random(3)
+    ships, projectiles = pygame.sprite.Group(), pygame.sprite.Group()
+    for group, count in [(ships, 10), (projectiles, 500)]:
+        for i in range(count):
+            Wall((rng.randint(0, 800), rng.randint(0, 600), 10, 10), group)
+    monkeypatch.setattr(collidable.broadphase, 'cells', dict())
+    assert collidable.groupcollide(ships, projectiles) == \
+        pygame.sprite.groupcollide(ships, projectiles, False, False)
+    assert not collidable.broadphase.cells
+
+    more_ships = pygame.sprite.Group(Wall((rng.randint(0, 800), rng.randint(0, 600), 10, 10))
+                                     for i in range(490))
+    ships.add(more_ships)
+    assert collidable.groupcollide(ships, projectiles) == \
+        pygame.sprite.groupcollide(ships, projectiles, False, False)
+    assert list(collidable.broadphase.cells) == [projectiles]
+
+def _reference_handler(class1, class2, prefix):
+    """The original per-collision lookup by method name, for comparison.
+    """
+    for other_class in class2.collidable_superclasses:
+        name = f'{prefix}_{other_class.__name__.lower()}'
+        if hasattr(class1, name):
+            return getattr(class1, name), False
+    for this_class in class1.collidable_superclasses:
+        name = f'{prefix}_{this_class.__name__.lower()}'
+        if hasattr(class2, name):
+            return getattr(class2, name), True
+    return None
+
+def test_collision_handler_resolution_order():
+    classes = [Ship, PlayerShip, EnemyShip, Shield, Projectile,
+               ShipTest, PlayerShipTest, EnemyShipTest, ProjectileTest]
+    for class1, class2 in itertools.product(classes, repeat=2):
+        assert collision_handler(class1, class2) == \
+            _reference_handler(class1, class2, 'collide_with')
+        assert collision_handler(class1, class2, stop=True) == \
+            _reference_handler(class1, class2, 'stop_colliding_with')
+
+def test_collision_handler_directions():
+    assert collision_handler(Ship, EnemyShip) == (Ship.collide_with_ship, False)
+    assert collision_handler(Projectile, PlayerShip) == (Projectile.collide_with_ship, False)
+    assert collision_handler(PlayerShip, Projectile) == (Projectile.collide_with_ship, True)
+    assert collision_handler(Shield, Projectile) == (Shield.collide_with_projectile, False)
+    assert collision_handler(EnemyShip, Shield) == (Shield.collide_with_ship, True)
+    assert collision_handler(Shield, Shield) == (Shield.collide_with_shield, False)
+    assert collision_handler(ProjectileTest, ShipTest) == (Projectile.collide_with_ship, False)
+    assert collision_handler(Projectile, Projectile) is None
+
+    assert collision_handler(EnemyShip, Projectile, stop=True) == \
+        (Projectile.stop_colliding_with_ship, True)
+    assert collision_handler(Ship, Ship, stop=True) is None
+
+def test_find_time_of_impact():
+    step = 1 / 240
+    calls = list()
+    def overlaps_at(t):
+        calls.append(t)
+        return t > -0.37
+
+    clear, overlapping = find_time_of_impact(overlaps_at, step)
+    assert clear <= -0.37 < overlapping
+    assert overlapping - clear <= step
+    # Stepping back one step at a time would take 89 tests
+    assert len(calls) <= 16
+
+    assert find_time_of_impact(lambda t: False, step) == (0, 0)
+    assert find_time_of_impact(lambda t: True, step) is None
+
+@pytest.mark.parametrize('args, expected', [
+    # Impulses found by the previous doubling + binary search solver
+    ((2500, (300, 0), 2500, (-300, 0), -1, 0), 1499999.9987381448),
+    ((1800, (300, 100), 900, (0, 0), -math.cos(0.3), -math.sin(0.3)), 379383.56144205976),
+    ((1200, (50, -20), 4000, (-80, 10), -0.6, 0.8), 188307.6881098353),
+])
+def test_collision_impulse(args, expected):
+    f = collision_impulse(*args)
+    assert f == pytest.approx(expected, rel=1e-6)
+
+    # Kinetic energy is conserved
+    m1, (v1x, v1y), m2, (v2x, v2y), ax, ay = args
+    before = m1 * (v1x ** 2 + v1y ** 2) + m2 * (v2x ** 2 + v2y ** 2)
+    after = m1 * ((v1x + f * ax / m1) ** 2 + (v1y + f * ay / m1) ** 2) + \
+            m2 * ((v2x - f * ax / m2) ** 2 + (v2y - f * ay / m2) ** 2)
+    assert after == pytest.approx(before)
+
+def test_collision_impulse_separating():
+    assert collision_impulse(100, (-10, 0), 100, (10, 0), -1, 0) == 0
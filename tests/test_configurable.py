@@ -3,6 +3,7 @@ from unittest.mock import patch
 
 import pytest
 
+from astro import configurable
 from astro.configurable import Configurable, load_from_yaml
 
 class ShipTest(Configurable):
@@ -153,3 +154,46 @@ ShipTest[Fighter2]:
     assert fighter.weapons[0].rate_of_fire == 11.0
     assert len(fighter.weapons[0].projectiles) == 1
     assert fighter.weapons[0].projectiles[0].damage == 7
+
+def test_copy_plan():
+    data = """---
+WeaponTest[Launcher]:
+    name: Launcher
+    rate_of_fire: 2.0
+    offsets: [[1, 2], [3, 4]]
+    projectiles:
+        - ProjectileTest(Bullet)
+"""
+    launcher = load_from_yaml(StringIO(data))
+    copied = launcher.copy()
+    assert copied.name == 'Launcher'
+    assert copied.rate_of_fire == 2.0
+    assert copied.offsets == launcher.offsets
+    assert copied.offsets is not launcher.offsets
+    assert copied.projectiles[0] is not launcher.projectiles[0]
+    assert copied.projectiles[0].speed == launcher.projectiles[0].speed
+
+    # Instances that lack a field fall back to the base config
+    del copied.name
+    assert copied.copy().name == 'Launcher'
+
+def test_derived_instances():
+    first = WeaponTest.instance('Chaingun', copy=True, rate_of_fire=5.0)
+    second = WeaponTest.instance('Chaingun', copy=True, rate_of_fire=5.0)
+    assert first is not second
+    assert first.rate_of_fire == second.rate_of_fire == 5.0
+    assert first.projectiles[0] is not second.projectiles[0]
+    assert WeaponTest.instance('Chaingun', copy=True, rate_of_fire=6.0).rate_of_fire == 6.0
+
+def test_derived_instances_are_bounded(monkeypatch):
+    monkeypatch.setattr(configurable, 'DERIVED_CACHE_SIZE', 3)
+    WeaponTest._derived.clear()
+    for rate_of_fire in range(10):
+        assert WeaponTest.instance('Chaingun', copy=True,
+                                   rate_of_fire=float(rate_of_fire)).rate_of_fire == rate_of_fire
+    assert len(WeaponTest._derived) == 3
+    # The most recently used prototypes are kept
+    WeaponTest.instance('Chaingun', copy=True, rate_of_fire=7.0)
+    WeaponTest.instance('Chaingun', copy=True, rate_of_fire=10.0)
+    assert [prototype.rate_of_fire for prototype in WeaponTest._derived.values()] == \
+        [9.0, 7.0, 10.0]
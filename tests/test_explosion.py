@@ -0,0 +1,42 @@
+import pygame
+
+from astro import EXPLOSIONS
+from astro.image import IMAGE_CACHE
+from astro.explosion import Explosion, render_explosion_frame
+from tests import ShipTest, SCREEN
+
+def test_explosion_frames_are_shared_and_follow_age():
+    ship = ShipTest.create()
+    explosions = []
+    for i in range(2):
+        explosion = Explosion(ship)
+        explosion.place(SCREEN, ship.rect.centerx, ship.rect.centery)
+        explosions.append(explosion)
+    assert explosions[0].frames is explosions[1].frames
+    assert explosions[0].image is explosions[1].image
+
+    explosion = explosions[0]
+    frame_count = len(explosion.frames)
+    explosion.update_sprite(explosion.start_time + explosion.max_age / 2)
+    assert explosion.frame_index == frame_count // 2
+    expected = render_explosion_frame(explosion.radius, explosion.frame_index / frame_count)
+    assert pygame.image.tostring(explosion.image, 'RGBA') == \
+        pygame.image.tostring(expected, 'RGBA')
+
+    explosion.update_sprite(explosion.start_time + explosion.max_age * 1.01)
+    assert explosion not in EXPLOSIONS
+    explosions[1].destroy()
+
+def test_explosion_frames_are_kept_in_the_image_cache():
+    ship = ShipTest.create()
+    explosion = Explosion(ship)
+    explosion.place(SCREEN, ship.rect.centerx, ship.rect.centery)
+    key = ('explosion', explosion.radius, len(explosion.frames), 0)
+    assert IMAGE_CACHE.get(key).image is explosion.image
+
+    # Evicted frames are rendered again
+    IMAGE_CACHE.clear()
+    frame = explosion.frames[0]
+    assert IMAGE_CACHE.get(key).image is frame
+    assert pygame.image.tostring(frame, 'RGBA') == pygame.image.tostring(explosion.image, 'RGBA')
+    explosion.destroy()
@@ -0,0 +1,17 @@
+from astro import Fonts
+
+def test_fonts_registry_and_text_cache():
+    fonts = Fonts(text_cache_size=2)
+    assert fonts.get(None, 20) is fonts.get(None, 20)
+    assert fonts.get(None, 20) is not fonts.get(None, 24)
+
+    text = fonts.render(None, 20, '10/10', (255, 255, 255))
+    assert fonts.render(None, 20, '10/10', [255, 255, 255], 1) is text
+    assert fonts.render(None, 20, '10/10', (255, 255, 255), False) is not text
+    assert (fonts.hits, fonts.misses) == (1, 2)
+
+    # Rendering a third string evicts the least recently used one
+    fonts.render(None, 20, '10/10', (255, 255, 255))
+    fonts.render(None, 20, '9/10', (255, 255, 255))
+    assert fonts.render(None, 20, '10/10', (255, 255, 255)) is text
+    assert fonts.misses == 3
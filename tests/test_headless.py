@@ -0,0 +1,54 @@
+import pytest
+
+import astro
+from astro import FONTS, load_all, projectile_batch, kinematics
+from astro.campaign import Campaign
+from gui.headless import run_level
+import run_game # pylint:disable=unused-import
+from tests import screen
+
+@pytest.fixture(scope='module')
+def campaign():
+    if not Campaign._lookup:
+        FONTS.init()
+        load_all()
+    astro.SCREEN = screen
+    return Campaign.instance('test')
+
+def test_run_level(campaign):
+    run = run_level(campaign, max_sim_time=5.0, seed=1)
+    assert (run.campaign, run.level, run.outcome) == ('test', 'testlevel', 'timeout')
+    assert run.ticks == 600 and run.sim_time == pytest.approx(5.0)
+    assert run.ticks_per_second == pytest.approx(run.ticks / run.wall_time)
+    assert run.peak_entities == {'ships': 6, 'projectiles': 229, 'sprites': 237}
+
+def test_seeded_runs_are_reproducible(campaign):
+    # Playing the level changes nothing that a later run with the same seed depends on
+    first = run_level(campaign, max_sim_time=5.0, seed=2)
+    run_level(campaign, max_sim_time=5.0, seed=3)
+    second = run_level(campaign, max_sim_time=5.0, seed=2)
+    assert first.outcome == second.outcome and first.ticks == second.ticks
+    assert first.peak_entities == second.peak_entities
+
+def test_projectile_batches_play_like_sprites(campaign, monkeypatch):
+    pytest.importorskip('numpy')
+    # Both sides of the second test campaign fire projectiles that can be batched
+    both_sides = Campaign.instance('test2')
+    sprites = run_level(both_sides, max_sim_time=10.0, seed=1)
+    batches = projectile_batch.create_projectile_batches('numpy')
+    monkeypatch.setattr(projectile_batch, 'PROJECTILE_BATCHES', batches)
+    batched = run_level(both_sides, max_sim_time=10.0, seed=1)
+    assert all(batch.emitted for batch in batches.values())
+    assert (batched.outcome, batched.ticks) == (sprites.outcome, sprites.ticks)
+    for kind in ('ships', 'projectiles'):
+        assert batched.peak_entities[kind] == sprites.peak_entities[kind]
+
+def test_ship_kinematics_play_like_ships(campaign, monkeypatch):
+    pytest.importorskip('numpy')
+    ships = run_level(campaign, max_sim_time=10.0, seed=1)
+    ship_kinematics = kinematics.create_ship_kinematics('numpy')
+    monkeypatch.setattr(kinematics, 'SHIP_KINEMATICS', ship_kinematics)
+    arrays = run_level(campaign, max_sim_time=10.0, seed=1)
+    assert ship_kinematics.added and not len(ship_kinematics)
+    assert (arrays.outcome, arrays.ticks) == (ships.outcome, ships.ticks)
+    assert arrays.peak_entities == ships.peak_entities
@@ -0,0 +1,48 @@
+from astro import HEALTHBARS
+from astro.move_behavior import Idle
+from astro.fire_behavior import FireNever
+from tests import EnemyShipTest
+
+IDLE = Idle.define('healthbar_test_idle', {})
+FIRE_NEVER = FireNever.define('healthbar_test_fire_never', {})
+
+def _create_enemy(shield=None):
+    return EnemyShipTest.create(config={'acceleration': 1, 'max_speed': 1, 'weapons': [],
+                                        'shield': shield,
+                                        'move_behavior': IDLE, 'fire_behavior': FIRE_NEVER})
+
+def test_healthbar_created_on_first_damage():
+    ship = _create_enemy()
+    assert ship.healthbar is None
+
+    ship.damage(0)
+    assert ship.healthbar is None
+
+    ship.damage(25)
+    healthbar = ship.healthbar
+    assert healthbar in HEALTHBARS
+    assert healthbar.state == (0.75, None)
+    assert healthbar.rect.midtop == ship.rect.midbottom
+
+    ship.damage(25)
+    assert ship.healthbar is healthbar
+
+    ship.destroy()
+    assert ship.healthbar is None
+    assert healthbar not in HEALTHBARS
+
+def test_healthbar_redrawn_only_on_change(monkeypatch):
+    ship = _create_enemy()
+    ship.damage(50)
+    healthbar = ship.healthbar
+
+    draws = []
+    monkeypatch.setattr('astro.healthbar.draw_healthbar', lambda *args: draws.append(args[2:]))
+    healthbar.update_image()
+    healthbar.update_image()
+    assert draws == []
+
+    ship.damage(25)
+    healthbar.update_image()
+    assert draws == [(0.25, None)]
+    ship.destroy()
@@ -0,0 +1,213 @@
+import os
+import math
+import random
+
+import pygame
+import pytest
+
+from astro import image as image_module
+from astro.image import DirectionTable, ImageCache, IMAGE_CACHE, CachedImage, \
+    generate_rect_and_mask, cached_image_bytes, image_mask, convert_for_display, CONVERSIONS, \
+    load_direction_table
+from astro.disk_cache import DiskCache, FORMAT_VERSION
+from astro.util import frange, angle_distance
+
+def _closest_angle_index(speedx, speedy, directions):
+    """The closest-angle search previously done by Projectile.update_facing_direction.
+    """
+    direction = (90 - math.degrees(math.atan2(speedy, speedx))) % 360
+    angles = list(frange(0, 360, 360 / directions))
+    return min(range(directions), key=lambda i: angle_distance(direction, angles[i]))
+
+@pytest.mark.parametrize('directions', [4, 8, 16, 32, 64])
+def test_direction_table_index(directions):
+    table = DirectionTable(pygame.Surface((10, 20)), directions)
+    rng = random.Random(directions)
+    for i in range(500):
+        speedx, speedy = rng.uniform(-500, 500), rng.uniform(-500, 500)
+        assert table.index(speedx, speedy) == _closest_angle_index(speedx, speedy, directions)
+
+    assert table.index(0, 1) == 0
+    assert table.index(1, 0) == directions // 4
+    assert table.index(0, -1) == directions // 2
+
+def test_direction_table_variants_are_lazy():
+    table = DirectionTable(pygame.Surface((10, 20)), 16)
+    assert not any((table.key, i) in IMAGE_CACHE for i in range(16))
+
+    variant = table.variant(4)
+    assert variant.image.get_size() == (20, 10)
+    assert table.variant(4) is variant
+    assert [i for i in range(16) if (table.key, i) in IMAGE_CACHE] == [4]
+
+def test_direction_table_rotates_from_the_image_cache():
+    table = load_direction_table('projectiles/blue_blast.png', 8)
+    assert table.image is None
+    base_key = 'projectiles/blue_blast.png'
+    assert base_key in IMAGE_CACHE
+
+    # Evicted images are loaded again when a variant is needed
+    IMAGE_CACHE.clear()
+    variant = table.variant(2)
+    assert base_key in IMAGE_CACHE
+    base = IMAGE_CACHE[base_key].image
+    assert variant.image.get_size() == base.get_size()[::-1]
+
+def _cached(size):
+    image = pygame.Surface(size, flags=pygame.SRCALPHA)
+    return CachedImage(image, *generate_rect_and_mask(image))
+
+def test_image_cache_lru_eviction():
+    entry_size = cached_image_bytes(_cached((10, 10)))
+    cache = ImageCache(budget=entry_size * 3)
+    for key in 'abc':
+        cache[key] = _cached((10, 10))
+    assert cache.resident_bytes == entry_size * 3
+
+    # Using a makes b the least recently used entry
+    assert cache.get('a') is not None
+    cache['d'] = _cached((10, 10))
+    assert 'b' not in cache
+    assert all(key in cache for key in 'acd')
+    assert cache.resident_bytes == entry_size * 3
+    assert cache.get('b') is None
+    assert (cache.hits, cache.misses, cache.evictions) == (1, 1, 1)
+
+def test_image_cache_pinning():
+    entry_size = cached_image_bytes(_cached((10, 10)))
+    cache = ImageCache(budget=entry_size * 2)
+    with cache.pinning():
+        cache['a'] = _cached((10, 10))
+        cache['b'] = _cached((10, 10))
+    cache['c'] = _cached((10, 10))
+    cache['d'] = _cached((10, 10))
+    # Pinned entries are kept even if that exceeds the budget
+    assert all(key in cache for key in 'abd')
+    assert 'c' not in cache
+
+    cache.unpin_all()
+    assert cache.resident_bytes <= cache.budget
+    assert 'd' in cache
+
+def test_disk_cache_round_trip(tmp_path):
+    source = tmp_path / 'image.png'
+    image = pygame.Surface((12, 8), flags=pygame.SRCALPHA)
+    pygame.draw.circle(image, (200, 100, 50, 255), (4, 4), 3)
+    pygame.image.save(image, str(source))
+    cached = CachedImage(image, *generate_rect_and_mask(image))
+
+    cache = DiskCache(str(tmp_path / 'cache'))
+    assert cache.load(str(source), 'base') is None
+    cache.store(str(source), 'base', cached)
+
+    loaded, conversion = DiskCache(str(tmp_path / 'cache')).load(str(source), 'base')
+    assert conversion is None
+    loaded = CachedImage(*loaded)
+    assert pygame.image.tostring(loaded.image, 'RGBA') == pygame.image.tostring(image, 'RGBA')
+    assert loaded.rect == cached.rect
+    assert loaded.mask_rect == cached.mask_rect
+    assert (loaded.mask_rect_offsetx, loaded.mask_rect_offsety) == \
+        (cached.mask_rect_offsetx, cached.mask_rect_offsety)
+    assert cache.load(str(source), 'flipped') is None
+
+def test_disk_cache_invalidated_by_source_changes(tmp_path):
+    source = tmp_path / 'image.png'
+    image = pygame.Surface((4, 4), flags=pygame.SRCALPHA)
+    pygame.image.save(image, str(source))
+    cache = DiskCache(str(tmp_path / 'cache'))
+    cache.store(str(source), 'base', CachedImage(image, *generate_rect_and_mask(image)))
+    assert cache.load(str(source), 'base') is not None
+
+    image.fill((255, 0, 0, 255))
+    pygame.image.save(image, str(source))
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    assert cache.load(str(source), 'base') is None
+
+def test_disk_cache_prunes_other_format_versions(tmp_path):
+    source = tmp_path / 'image.png'
+    image = pygame.Surface((4, 4), flags=pygame.SRCALPHA)
+    pygame.image.save(image, str(source))
+    cache_dir = tmp_path / 'cache'
+    cache_dir.mkdir()
+    stale = cache_dir / f'abc-base-v{FORMAT_VERSION - 1}.bin'
+    stale.write_bytes(b'')
+
+    cache = DiskCache(str(cache_dir))
+    cache.store(str(source), 'base', CachedImage(image, *generate_rect_and_mask(image)))
+    assert not stale.exists()
+    assert cache.load(str(source), 'base') is not None
+
+def test_masks_are_built_lazily():
+    image = pygame.Surface((20, 10), flags=pygame.SRCALPHA)
+    image.fill((255, 255, 255, 128), pygame.Rect(2, 3, 5, 4))
+    image.fill((255, 255, 255, 127), pygame.Rect(12, 3, 5, 4))
+    rect, mask, mask_rect, mask_rect_offsetx, mask_rect_offsety = generate_rect_and_mask(image)
+    assert mask is None
+
+    mask = image_mask(image)
+    assert image_mask(image) is mask
+    assert mask.get_bounding_rects() == [mask_rect] == [pygame.Rect(2, 3, 5, 4)]
+    assert (mask_rect_offsetx, mask_rect_offsety) == (-6, 0)
+
+def test_convert_for_display_paths():
+    opaque = pygame.Surface((20, 20), flags=pygame.SRCALPHA)
+    opaque.fill((10, 20, 30, 255))
+    binary = pygame.Surface((20, 20), flags=pygame.SRCALPHA)
+    binary.fill((255, 0, 255, 255), pygame.Rect(0, 0, 10, 20))
+    partial = binary.copy()
+    partial.fill((10, 20, 30, 100), pygame.Rect(10, 0, 10, 20))
+    small = pygame.Surface((4, 4), flags=pygame.SRCALPHA)
+    small.fill((10, 20, 30, 100))
+
+    conversions = dict()
+    for name, image in [('opaque', opaque), ('binary', binary), ('partial', partial),
+                        ('small', small)]:
+        converted = conversions[name] = convert_for_display(image, ('test', name))
+        # Blitting the converted image gives the same pixels as blitting the original
+        for background in [(0, 0, 0), (90, 120, 200)]:
+            expected = pygame.Surface(image.get_size())
+            expected.fill(background)
+            expected.blit(image, (0, 0))
+            actual = pygame.Surface(image.get_size())
+            actual.fill(background)
+            actual.blit(converted, (0, 0))
+            assert all(abs(a - b) <= 1 for a, b in zip(pygame.image.tostring(expected, 'RGB'),
+                                                        pygame.image.tostring(actual, 'RGB')))
+
+    assert CONVERSIONS['test', 'opaque'] == 'opaque'
+    # Magenta is used by the image itself, so another colorkey has to be picked
+    assert CONVERSIONS['test', 'binary'] == 'colorkey'
+    assert conversions['binary'].get_colorkey()[:3] != (255, 0, 255)
+    assert CONVERSIONS['test', 'partial'] == 'alpha-rle'
+    assert CONVERSIONS['test', 'small'] == 'alpha'
+
+@pytest.mark.parametrize('alpha, path', [(255, 'opaque'), (0, 'colorkey'), (100, 'alpha-rle')])
+def test_disk_cache_restores_display_conversion(tmp_path, monkeypatch, alpha, path):
+    source = tmp_path / 'image.png'
+    image = pygame.Surface((20, 20), flags=pygame.SRCALPHA)
+    image.fill((200, 100, 50, 255))
+    image.fill((10, 20, 30, alpha), pygame.Rect(10, 0, 10, 20))
+    pygame.image.save(image, str(source))
+    monkeypatch.setattr(image_module, 'DISK_CACHE', DiskCache(str(tmp_path / 'cache')))
+    load = lambda: pygame.image.load(str(source)).convert_alpha()
+    cold = image_module._cache_processed(('cold', path), str(source), 'base', load)
+
+    # Images read back from the disk cache are converted without inspecting their pixels
+    def from_surface(*args):
+        raise AssertionError('Mask built while converting a cached image')
+    monkeypatch.setattr(pygame.mask, 'from_surface', from_surface)
+    monkeypatch.setattr(pygame.mask, 'from_threshold', from_surface)
+    warm = image_module._cache_processed(('warm', path), str(source), 'base', load)
+    assert image_module.DISK_CACHE.hits == 1
+    assert CONVERSIONS['warm', path] == CONVERSIONS['cold', path] == path
+    assert warm.image.get_colorkey() == cold.image.get_colorkey()
+    assert warm.image.get_flags() & pygame.SRCALPHA == cold.image.get_flags() & pygame.SRCALPHA
+    for background in [(0, 0, 0), (90, 120, 200)]:
+        blitted = []
+        for cached in (cold, warm):
+            surface = pygame.Surface((20, 20))
+            surface.fill(background)
+            surface.blit(cached.image, (0, 0))
+            blitted.append(pygame.image.tostring(surface, 'RGB'))
+        assert blitted[0] == blitted[1]
@@ -0,0 +1,79 @@
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from astro import clear_all_groups, kinematics
+from astro.fire_behavior import FireNever
+from astro.kinematics import ShipKinematics
+from astro.move_behavior import Idle, RandomPatrol
+from astro.sim_clock import SimClock
+from tests import ShipTest, PlayerShipTest, EnemyShipTest
+
+FIRE_NEVER = FireNever.define('kinematics_test_fire_never', {})
+ENTER_AND_IDLE = Idle.define('kinematics_test_idle', {'initial_dest': (0.5, 0.25)})
+PATROL = RandomPatrol.define('kinematics_test_patrol', {'width': 0.5, 'height': 0.5,
+                                                        'pause_time': 0.5})
+SHIP_CONFIG = {'acceleration': 400, 'max_speed': 250, 'weapons': []}
+
+@pytest.fixture(autouse=True)
+def empty_groups():
+    yield
+    clear_all_groups()
+
+@pytest.fixture
+def ship_kinematics(monkeypatch):
+    ship_kinematics = ShipKinematics(capacity=2)
+    monkeypatch.setattr(kinematics, 'SHIP_KINEMATICS', ship_kinematics)
+    return ship_kinematics
+
+def test_ship_attributes_are_views_into_the_arrays(ship_kinematics):
+    ships = [ShipTest.create(startx=100 * i, starty=200, speedx=i, config=SHIP_CONFIG)
+             for i in range(3)]
+    assert len(ship_kinematics) == 3
+    ship = ships[2]
+    assert ship.kinematics is ship_kinematics
+    assert ship_kinematics.x[ship.kinematics_slot] == 200
+    assert ship_kinematics.speedx[ship.kinematics_slot] == 2
+
+    ship.speedy = -5
+    assert ship_kinematics.speedy[ship.kinematics_slot] == -5
+    ship_kinematics.y[ship.kinematics_slot] = 250
+    assert ship.y == 250
+
+    # Killed ships take their values back and free their slot
+    ship.kill()
+    assert ship.kinematics is None and len(ship_kinematics) == 2
+    assert (ship.x, ship.y, ship.speedx, ship.speedy) == (200, 250, 2, -5)
+    slot = ships[0].kinematics_slot
+    ships[0].kill()
+    assert ShipTest.create(config=SHIP_CONFIG).kinematics_slot == slot
+
+def _fly(ship_kinematics, seconds=8.0):
+    random.seed(1)
+    ships = [PlayerShipTest.create(startx=300, starty=600, config=SHIP_CONFIG)]
+    for move_behavior in (ENTER_AND_IDLE, PATROL):
+        ships.append(EnemyShipTest.create(startx=600, starty=-40, speedy=100, config=dict(
+            SHIP_CONFIG, move_behavior=move_behavior, fire_behavior=FIRE_NEVER)))
+    ships[0].dirx, ships[0].diry = 1, -1
+    ships[0].static_image = ships[0].moving_image = ships[0].image
+
+    clock = SimClock()
+    path = []
+    for i in range(round(seconds * 120)):
+        clock.advance(1 / 120)
+        if ship_kinematics is not None:
+            ship_kinematics.update(clock)
+        for ship in ships:
+            ship.update(clock)
+        path.append([(ship.x, ship.y, ship.speedx, ship.speedy, ship.rect.center)
+                     for ship in ships])
+    return path
+
+def test_ships_move_like_they_do_themselves(ship_kinematics):
+    moved = _fly(ship_kinematics)
+    ship_kinematics.clear()
+    clear_all_groups()
+    kinematics.SHIP_KINEMATICS = None
+    assert moved == _fly(None)
@@ -1,6 +1,9 @@
+import gc
 import math
 
-from tests import ProjectileTest as Projectile, PlayerShipTest as PlayerShip
+from astro import collidable
+from astro.projectile import ProjectilePool
+from tests import ProjectileTest as Projectile, PlayerShipTest as PlayerShip, ShipTest, SCREEN
 
 def test_that_slow_projectiles_still_move():
 
@@ -47,3 +50,47 @@ def test_collision_between_projectile_and_ship():
                                          'damage': 1})
         target_ship.collide_with(proj)
     assert not target_ship.alive()
+
+def test_projectile_pool():
+    firer = PlayerShip.create(startx=500, starty=400)
+    prototype = Projectile.define('pooled', {'speed': 500, 'damage': 1, 'piercing': 2,
+                                             'size': (10, 10)})
+    pool = ProjectilePool()
+
+    proj = pool.acquire(prototype)
+    assert (pool.hits, pool.misses) == (0, 1)
+    proj.place(SCREEN, firer, True)
+    target_ship = ShipTest.create(startx=500, starty=300, config={'max_hp': 10})
+    proj.collide_with(target_ship)
+    assert proj.piercing == 1
+    assert proj.colliding_with is target_ship
+
+    pool.release(proj)
+    assert proj.piercing == 2
+    assert proj.colliding_with is None
+    # Releasing twice must not put the same projectile in the pool twice
+    pool.release(proj)
+
+    assert pool.acquire(prototype) is proj
+    assert pool.acquire(prototype) is not proj
+    assert (pool.hits, pool.misses) == (1, 2)
+
+def test_projectile_pool_is_collected_with_prototype():
+    firer = PlayerShip.create(startx=500, starty=400)
+    # Weapons own copies of the prototypes defined in configs
+    prototype = Projectile.define('collected', {'speed': 500, 'damage': 1,
+                                                'size': (10, 10)}).copy()
+    pool = ProjectilePool()
+    proj = pool.acquire(prototype)
+    proj.place(SCREEN, firer, True)
+    target_ship = ShipTest.create(startx=500, starty=300, config={'max_hp': 10})
+    collidable.track_collision((target_ship, proj))
+
+    pool.release(proj)
+    assert (target_ship, proj) not in collidable.colliding_pairs
+    assert proj not in collidable.pairs_by_sprite
+    assert len(pool._idle) == 1
+
+    del prototype, proj
+    gc.collect()
+    assert len(pool._idle) == 0
@@ -0,0 +1,160 @@
+import pygame
+import pytest
+
+pytest.importorskip('numpy')
+
+from astro import FRIENDLY_PROJECTILES, clear_all_groups, projectile_batch
+from astro.move_behavior import Homing
+from astro.projectile_batch import ProjectileBatch
+from astro.shield import Shield
+from gui.renderer import Renderer, DirtyRectRenderer
+from tests import ProjectileTest as Projectile, PlayerShipTest as PlayerShip, ShipTest, SCREEN
+
+@pytest.fixture(autouse=True)
+def empty_groups():
+    yield
+    clear_all_groups()
+
+def test_projectile_batch_moves_like_sprites():
+    firer = ShipTest.create(startx=500, starty=400, speedx=30, speedy=-20)
+    prototype = Projectile.define('batched', {'speed': 500, 'damage': 1, 'angle': 30,
+                                              'size': (10, 10)})
+    batch = ProjectileBatch(True)
+    batch.emit(prototype, SCREEN, firer)
+    sprite = prototype.acquire()
+    sprite.place(SCREEN, firer, True)
+
+    for i in range(30):
+        sprite.tick(0, 1 / 120)
+        batch.step(1 / 120)
+    assert (batch.x[0], batch.y[0]) == pytest.approx((sprite.x, sprite.y))
+    assert (batch.x_prev[0], batch.y_prev[0]) == pytest.approx((sprite.x_prev, sprite.y_prev))
+
+    # Projectiles too far off screen are dropped
+    for i in range(300):
+        batch.step(1 / 120)
+    assert len(batch) == 0 and batch.culled == 1
+
+def test_projectile_batch_collisions():
+    target = PlayerShip.create(startx=500, starty=300, config={'max_hp': 10})
+    firer = ShipTest.create(startx=500, starty=300)
+    piercing = Projectile.define('piercing', {'speed': 0, 'damage': 1, 'piercing': 2,
+                                              'size': (10, 10)})
+    batch = ProjectileBatch(False)
+    batch.emit(piercing, SCREEN, firer)
+
+    # A piercing projectile damages the ship once while passing through it
+    batch.collide()
+    batch.collide()
+    assert target.hp == 9
+    assert len(batch) == 1 and batch.piercing[0] == 1 and batch.colliding_with[0] is target
+
+    # Once it no longer overlaps the ship, it may hit it again and is destroyed
+    batch.x[0] = 100
+    batch.collide()
+    assert batch.colliding_with[0] is None
+    batch.x[0] = 500
+    batch.collide()
+    assert target.hp == 8 and len(batch) == 0
+
+    # Projectiles don't hit ships on their own side
+    friendly_batch = ProjectileBatch(True)
+    friendly_batch.emit(piercing, SCREEN, firer)
+    friendly_batch.collide()
+    assert target.hp == 8 and len(friendly_batch) == 1
+
+def test_projectile_batch_hits_shields():
+    ship = PlayerShip.create(startx=500, starty=300, config={'max_hp': 10})
+    shield = Shield.define('batch_test_shield', {'name': 'Test shield', 'cost': 0,
+                                                 'capacity': 4, 'recharge_rate': 0,
+                                                 'recharge_delay': 1}).copy()
+    shield.place(SCREEN, ship)
+    firer = ShipTest.create(startx=500, starty=300)
+    prototype = Projectile.define('shielded', {'speed': 0, 'damage': 3, 'size': (10, 10)})
+    batch = ProjectileBatch(False)
+
+    # The shield absorbs the damage and destroys the projectile before it reaches the ship
+    batch.emit(prototype, SCREEN, firer)
+    batch.collide()
+    assert shield.integrity == 1 and ship.hp == 10 and len(batch) == 0
+
+    # A depleted shield lets projectiles through
+    batch.emit(prototype, SCREEN, firer)
+    batch.collide()
+    assert shield.integrity == 0 and ship.hp == 10 and len(batch) == 0
+    batch.emit(prototype, SCREEN, firer)
+    batch.collide()
+    assert ship.hp == 7 and len(batch) == 0
+
+def test_projectiles_fire_into_batch(monkeypatch):
+    batch = ProjectileBatch(True)
+    monkeypatch.setitem(projectile_batch.PROJECTILE_BATCHES, FRIENDLY_PROJECTILES, batch)
+    firer = ShipTest.create(startx=500, starty=400)
+    prototype = Projectile.define('fired', {'speed': 500, 'damage': 1, 'size': (10, 10)})
+
+    prototype.fire(SCREEN, firer, True)
+    assert len(batch) == 1 and batch.emitted == 1
+
+    # Enemy projectiles go to the enemy side's batch, of which there is none here
+    prototype.fire(SCREEN, firer, False)
+    assert len(batch) == 1 and len(FRIENDLY_PROJECTILES) == 0
+
+    # Projectiles with move behaviors are still sprites
+    homing = Projectile.define('fired_homing', {'speed': 500, 'damage': 1, 'size': (10, 10),
+                                                'acceleration': 500, 'max_speed': 500,
+                                                'move_behavior': Homing.define('batch_test', {})})
+    homing.fire(SCREEN, firer, True)
+    assert len(batch) == 1 and batch.emitted == 1
+    sprite, = FRIENDLY_PROJECTILES.sprites()
+    assert isinstance(sprite.move_behavior, Homing) and sprite.move_behavior.ship is sprite
+
+def test_renderer_draws_projectile_batch():
+    firer = ShipTest.create(startx=50, starty=50)
+    prototype = Projectile.define('drawn', {'speed': 0, 'damage': 1, 'size': (10, 10)})
+    batch = ProjectileBatch(True)
+    batch.emit(prototype, SCREEN, firer)
+    batch.emit(prototype, SCREEN, firer, offset=(500, 0))
+
+    surface = pygame.Surface((100, 100))
+    background = pygame.Surface((100, 100))
+    background.fill((255, 255, 255))
+    group = pygame.sprite.RenderPlain()
+    renderer = Renderer(surface, background, [group], {group: [batch]})
+    renderer.draw()
+
+    # The projectile on the surface is drawn at its rect, the other one is culled
+    assert renderer.frame_culled == 1
+    assert surface.get_at((50, 50)) == (0, 0, 0)
+    assert surface.get_at((44, 50)) == (255, 255, 255)
+
+def test_dirty_rect_renderer_clears_projectile_batch(monkeypatch):
+    updated = []
+    monkeypatch.setattr(pygame.display, 'flip', lambda: None)
+    monkeypatch.setattr(pygame.display, 'update', updated.extend)
+    firer = ShipTest.create(startx=50, starty=50)
+    prototype = Projectile.define('redrawn', {'speed': 0, 'damage': 1, 'size': (10, 10)})
+    batch = ProjectileBatch(True)
+    batch.emit(prototype, SCREEN, firer)
+
+    surface = pygame.Surface((100, 100))
+    background = pygame.Surface((100, 100))
+    background.fill((255, 255, 255))
+    group = pygame.sprite.RenderPlain()
+    renderer = DirtyRectRenderer(surface, background, [group], {group: [batch]})
+    renderer.draw()
+    renderer.present()
+    assert renderer.batch_rects == [pygame.Rect(45, 45, 10, 10)]
+
+    # Where the projectile was is cleared, and both areas are updated on the display
+    batch.x[0] = 20
+    renderer.draw()
+    renderer.present()
+    assert surface.get_at((50, 50)) == (255, 255, 255)
+    assert surface.get_at((20, 50)) == (0, 0, 0)
+    assert pygame.Rect(45, 45, 10, 10) in updated and pygame.Rect(15, 45, 10, 10) in updated
+
+    # Once the projectile is gone, its last position is cleared too
+    batch.clear()
+    renderer.draw()
+    assert surface.get_at((20, 50)) == (255, 255, 255)
+    assert renderer.batch_rects == []
@@ -0,0 +1,84 @@
+import random
+
+import pygame
+import pytest
+
+from gui.renderer import Renderer, DirtyRectRenderer
+
+def _render_frames(renderer_class, frames=30):
+    rng = random.Random(0)
+    surface = pygame.Surface((200, 150))
+    background = pygame.Surface((200, 150))
+    background.fill((10, 20, 30))
+    pygame.draw.line(background, (200, 0, 0), (0, 0), (200, 150), 5)
+    groups = [pygame.sprite.RenderPlain() for i in range(3)]
+    renderer = renderer_class(surface, background, groups)
+
+    results = []
+    for frame in range(frames):
+        for i, group in enumerate(groups):
+            if rng.random() < 0.5:
+                sprite = pygame.sprite.Sprite(group)
+                sprite.image = pygame.Surface((rng.randint(5, 40), rng.randint(5, 40)))
+                sprite.image.fill((80 * i, 255 - 80 * i, rng.randint(0, 255)))
+                sprite.rect = sprite.image.get_rect(center=(rng.randint(-20, 220),
+                                                            rng.randint(-20, 170)))
+            for sprite in group.sprites():
+                if rng.random() < 0.1:
+                    sprite.kill()
+                else:
+                    sprite.rect.move_ip(rng.randint(-8, 8), rng.randint(-8, 8))
+        renderer.draw()
+        results.append(pygame.image.tostring(surface, 'RGB'))
+        renderer.present()
+    return results
+
+def test_dirty_rect_renderer_matches_full_redraw(monkeypatch):
+    # Rendering happens offscreen, so there's no need to update the display
+    monkeypatch.setattr(pygame.display, 'flip', lambda: None)
+    monkeypatch.setattr(pygame.display, 'update', lambda rects: None)
+    assert _render_frames(DirtyRectRenderer) == _render_frames(Renderer)
+
+@pytest.mark.parametrize('renderer_class', [Renderer, DirtyRectRenderer])
+def test_renderer_culls_off_screen_sprites(renderer_class):
+    surface = pygame.Surface((100, 100))
+    group = pygame.sprite.RenderPlain()
+    positions = [(50, 50), (50, -30), (-30, 50), (50, -5), (130, 130)]
+    for center in positions:
+        sprite = pygame.sprite.Sprite(group)
+        sprite.image = pygame.Surface((20, 20))
+        sprite.image.fill((255, 255, 255))
+        sprite.rect = sprite.image.get_rect(center=center)
+    renderer = renderer_class(surface, pygame.Surface((100, 100)), [group])
+
+    renderer.draw()
+    assert renderer.frame_culled == 3
+    renderer.draw()
+    assert (renderer.frame_culled, renderer.culled) == (3, 6)
+    drawn = [sprite for sprite, rect in group.spritedict.items() if rect]
+    if renderer.track_rects:
+        assert [sprite.rect.center for sprite in drawn] == [(50, 50), (50, -5)]
+    else:
+        assert not drawn
+    assert surface.get_at((50, 2)) == (255, 255, 255)
+    assert surface.get_at((50, 50)) == (255, 255, 255)
+
+def test_renderer_interpolates_positions():
+    class Moving(pygame.sprite.Sprite):
+        def draw_offset(self, alpha):
+            # Moved 10 pixels right during the last step
+            return round(-10 * (1 - alpha)), 0
+
+    surface = pygame.Surface((100, 100))
+    group = pygame.sprite.RenderPlain()
+    sprite = Moving(group)
+    sprite.image = pygame.Surface((10, 10))
+    sprite.image.fill((255, 255, 255))
+    sprite.rect = sprite.image.get_rect(topleft=(50, 50))
+    renderer = Renderer(surface, pygame.Surface((100, 100)), [group])
+
+    renderer.interpolation = 0.25
+    renderer.draw()
+    drawn = pygame.mask.from_threshold(surface, (255, 255, 255), (1, 1, 1, 255))
+    assert drawn.get_bounding_rects() == [pygame.Rect(42, 50, 10, 10)]
+    assert sprite.rect.topleft == (50, 50)
@@ -0,0 +1,36 @@
+from astro import SHIELD_ALPHA_LEVELS
+from astro.shield import Shield
+from tests import PlayerShipTest, SCREEN
+
+SHIELD = Shield.define('alpha_test_shield', {'name': 'Test shield', 'cost': 0, 'capacity': 100,
+                                             'recharge_rate': 0, 'recharge_delay': 1})
+
+def _place_shield():
+    ship = PlayerShipTest.create()
+    shield = SHIELD.copy()
+    shield.initialize()
+    shield.place(SCREEN, ship)
+    return ship, shield
+
+def test_shield_images_are_shared_and_alpha_quantized():
+    ship1, shield1 = _place_shield()
+    ship2, shield2 = _place_shield()
+    assert shield1.mask is shield2.mask
+    assert shield1.image is shield2.image is shield1.alpha_frames[SHIELD_ALPHA_LEVELS]
+    assert shield1.image.get_alpha() == 255
+
+    shield1.damage(50)
+    shield1.update_alpha()
+    assert shield1.image is shield1.alpha_frames[SHIELD_ALPHA_LEVELS // 2]
+    assert shield1.image.get_alpha() == 128
+    # The other shield's image is unaffected
+    assert shield2.image.get_alpha() == 255
+
+    # Changes within a level don't change the image
+    image = shield1.image
+    shield1.damage(0.1)
+    shield1.update_alpha()
+    assert shield1.image is image
+
+    for ship in (ship1, ship2):
+        ship.destroy()
@@ -1,6 +1,6 @@
-from unittest.mock import patch
-
 from astro.timekeeper import Timekeeper
+from astro.sim_clock import SimClock
+from astro.level import Level
 
 def test_tick():
     times = list()
@@ -10,10 +10,66 @@ def test_tick():
             times.append((now, elapsed))
 
     tk = TestTimekeeper()
-    with patch('time.time', side_effect=[0.0, 0.5, 0.75, 1.5]):
-        tk._tick()
-        tk._tick()
-        tk._tick()
-        tk._tick()
+    clock = SimClock()
+    for real_elapsed in [0.0, 0.5, 0.25, 0.75]:
+        clock.advance(real_elapsed)
+        tk.update(clock)
 
     assert times == [(0.5, 0.5), (0.75, 0.25), (1.5, 0.75)]
+
+def test_sim_clock_pause_and_time_scale():
+    clock = SimClock(start=10.0, time_scale=2.0)
+    assert clock.advance(0.25) == 0.5
+    assert clock.now == 10.5
+
+    clock.pause()
+    assert clock.advance(0.25) == 0.0
+    assert clock.now == 10.5
+    assert clock.frame == 1
+
+    clock.resume()
+    clock.time_scale = 0.5
+    assert clock.advance(0.25) == 0.125
+    assert clock.now == 10.625
+    assert clock.frame == 2
+
+def test_sim_clock_fixed_steps():
+    clock = SimClock(step_size=0.01, max_steps=4)
+    assert clock.accumulate(0.025) == 2
+    clock.step()
+    clock.step()
+    assert round(clock.now, 9) == 0.02
+    assert round(clock.interpolation, 9) == 0.5
+
+    # A long frame only runs max_steps steps, dropping the rest of the time
+    assert clock.accumulate(0.1) == 4
+    for i in range(4):
+        clock.step()
+    assert round(clock.now, 9) == 0.06
+    assert round(clock.dropped, 9) == 0.065
+    assert clock.interpolation == 0.0
+
+    clock.pause()
+    assert clock.accumulate(0.1) == 0
+
+def test_level_updates_formations_with_its_clock():
+    clocks = list()
+
+    class TestFormation:
+        ships_remaining = 1
+
+        def update(self, clock):
+            clocks.append(clock)
+
+    level = Level('clock_test')
+    level.waves = []
+    level.reset()
+    level.num_waves = 0
+    level.current_formations.append(TestFormation())
+    clock = SimClock(start=5.0)
+    for i in range(2):
+        clock.advance(0.1)
+        level.update(clock)
+
+    # The first update only starts the level's own timekeeping
+    assert clocks == [clock]
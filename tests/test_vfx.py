@@ -0,0 +1,21 @@
+from astro import FRONT_VFX
+from astro.vfx import CircleVFX
+from tests import PlayerShipTest
+
+CIRCLE = CircleVFX.define('follow_test_circle', {'above': True, 'size_delta': 10})
+
+def test_vfx_follows_owner_and_is_destroyed_with_it():
+    ship = PlayerShipTest.create()
+    vfx = CIRCLE.copy()
+    vfx.place(ship.screen, ship)
+    assert vfx in FRONT_VFX
+    assert vfx.rect.size == (ship.rect.width + 10, ship.rect.height + 10)
+    assert vfx.rect.center == ship.rect.center
+
+    ship.rect.move_ip(30, -20)
+    vfx.tick(0, 0)
+    assert vfx.rect.center == ship.rect.center
+
+    ship.destroy()
+    assert vfx not in FRONT_VFX
+    assert vfx.owner is None and not ship.follow_sprites